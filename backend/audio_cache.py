@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import json
+import re
+from typing import Dict, Optional
+
+from content_store import ContentStore
+from llm_cache import normalize_text
+
+DEFAULT_VOICE = "Atlas-PlayAI"
+TTS_MODEL = "playai-tts"
+
+AUDIO_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+    "ogg": "audio/ogg",
+    "mulaw": "audio/basic",
+}
+
+AUDIO_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}\.(' + '|'.join(AUDIO_MEDIA_TYPES) + r')$')
+
+
+class TTSAudioCache:
+    """
+    Disk cache for synthesized speech, served by /api/audio/{key}.
+    Audio lives in the shared ContentStore under a key derived from (text hash, voice, format),
+    e.g. "3fa9…c1.mp3", so a repeat request finds it without synthesizing or an index lookup.
+    Concurrent requests for the same audio share one TTS call.
+    """
+
+    def __init__(self, store: ContentStore, evaluator):
+        self.store = store
+        self.evaluator = evaluator
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def key_for(text: str, voice: str = DEFAULT_VOICE, audio_format: str = "mp3") -> str:
+        text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        digest = hashlib.sha256(json.dumps([text_hash, voice, audio_format, TTS_MODEL]).encode("utf-8")).hexdigest()
+        return f"{digest}.{audio_format}"
+
+    @staticmethod
+    def is_valid_key(key: str) -> bool:
+        return bool(AUDIO_KEY_PATTERN.match(key or ''))
+
+    @staticmethod
+    def media_type(key: str) -> str:
+        return AUDIO_MEDIA_TYPES.get(key.rsplit(".", 1)[-1], "application/octet-stream")
+
+    @staticmethod
+    def url_for(key: str) -> str:
+        return f"/api/audio/{key}"
+
+    def path(self, key: str) -> Optional[str]:
+        """File path of cached audio, or None if it isn't cached."""
+        return self.store.path_for(key) if self.store.exists(key) else None
+
+    async def get_or_create(self, text: str, voice: str = DEFAULT_VOICE, audio_format: str = "mp3",
+                            task: str = "tts") -> str:
+        """Key of the audio for text, synthesizing (as gateway task `task`) and storing it on a miss."""
+        if audio_format not in AUDIO_MEDIA_TYPES:
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        key = self.key_for(text, voice, audio_format)
+        if self.store.exists(key):
+            print(f"🔊 TTS cache hit: {key[:12]}")
+            return key
+
+        pending = self._in_flight.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            audio_bytes = await self.evaluator.text_to_speech(
+                text=text, voice=voice, audio_format=audio_format, task=task
+            )
+            await asyncio.to_thread(self.store.put, audio_bytes, key)
+            print(f"🔊 TTS cached: {key[:12]} ({len(audio_bytes)} bytes)")
+            future.set_result(key)
+            return key
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
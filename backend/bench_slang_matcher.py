@@ -0,0 +1,83 @@
+"""
+Throughput benchmark: SlangMatcher vs the per-term regex loop from src/fetching.py.
+
+Usage:
+    python bench_slang_matcher.py [--comments 20000] [--extra-terms 500]
+
+--extra-terms pads the dictionary with synthetic terms to show how both
+approaches scale with dictionary size.
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from slang_matcher import SlangMatcher, load_slang_database
+
+SAMPLE_COMMENTS = [
+    "Bruh called us poor in 999987654322456 languages 😅😅😅",
+    "ngl this is bussin fr, no cap",
+    "The camera falling got me dying LOL",
+    "this building is on fire, call the fire department",
+    "lowkey the goat of this game, y'all sleeping",
+    "rolling on the floor laughing at this 💀",
+    "welcome to the channel, that's a W",
+    "she ate and left no crumbs, slay",
+    "Nice video! I really liked the part at the end.",
+    "what did I just watch",
+]
+
+
+def legacy_detect(slang_terms: List[str], text: str) -> List[str]:
+    """Copy of YouTubeShortsSlangFetcher.detect_slang_in_text (src/fetching.py)."""
+    text_lower = text.lower()
+    found = []
+    for slang in slang_terms:
+        pattern = r'\b' + re.escape(slang) + r'\b'
+        if re.search(pattern, text_lower):
+            if slang == 'l' and re.search(r'welcome|jelly', text_lower):
+                continue
+            if slang == 'w' and re.search(r'what|why|ow|sw', text_lower):
+                continue
+            if slang == 'fire' and re.search(r'fire alarm|on fire|building fire', text_lower):
+                continue
+            found.append(slang)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark slang detection")
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--extra-terms', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    terms = [t.lower() for t in load_slang_database().keys()]
+    terms += [f"zz{rng.randint(0, 10**9):x}" for _ in range(args.extra_terms)]
+    comments = [rng.choice(SAMPLE_COMMENTS) for _ in range(args.comments)]
+
+    start = time.perf_counter()
+    legacy_results = [legacy_detect(terms, c) for c in comments]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = SlangMatcher(terms)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher_results = [matcher.find(c) for c in comments]
+    matcher_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy_results, matcher_results) if set(a) != set(b))
+
+    print(f"📊 {len(comments)} comments x {len(terms)} terms")
+    print(f"   per-term regex : {legacy_time:.3f}s ({len(comments) / legacy_time:,.0f} comments/s)")
+    print(f"   SlangMatcher   : {matcher_time:.3f}s ({len(comments) / matcher_time:,.0f} comments/s), build {build_time * 1000:.1f}ms")
+    print(f"   speedup        : {legacy_time / matcher_time:.1f}x")
+    print(f"   mismatches     : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
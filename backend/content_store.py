@@ -0,0 +1,57 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+
+class ContentStore:
+    """
+    Content-addressed blob store on local disk.
+    Blobs are written once under their SHA-256 (or a caller-supplied key)
+    and sharded into two-character subdirectories.
+    """
+
+    def __init__(self, root_dir: str = "media_cache"):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """SHA-256 hex digest used as the content address."""
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """Absolute path of the blob stored under key."""
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def put(self, data: bytes, key: Optional[str] = None) -> str:
+        """
+        Store data and return its key.
+        Writes go through a temp file + rename so readers never see partial blobs.
+        """
+        key = key or self.hash_bytes(data)
+        path = self.path_for(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
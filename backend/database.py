@@ -1,8 +1,22 @@
 import sqlite3
 import json
 import os
+import gzip
+import io
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
+
+from slang_dictionary import normalize_key
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SNAPSHOT_VERSION = 1
+# PRAGMA user_version of the schema; 1: slang index keyed by slang_dictionary.normalize_key
+SCHEMA_VERSION = 1
 
 class VideoDatabase:
     """
@@ -16,6 +30,7 @@ class VideoDatabase:
     def init_database(self):
         """Initialize database tables"""
         conn = sqlite3.connect(self.db_path)
+        conn.create_function("normalize_key", 1, normalize_key, deterministic=True)
         cursor = conn.cursor()
         
         # Videos table
@@ -66,9 +81,162 @@ class VideoDatabase:
                 expires_at TIMESTAMP
             )
         ''')
+
+        # Thumbnail index: (video, size variant) -> content hash in the media store
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                video_id TEXT,
+                size TEXT,
+                content_hash TEXT,
+                source_url TEXT,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (video_id, size)
+            )
+        ''')
+
+        # Transcript cache: segments JSON, or NULL for "no transcript" (negative entry, expires)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transcripts (
+                video_id TEXT PRIMARY KEY,
+                segments TEXT,
+                is_generated INTEGER,
+                fetched_at REAL,
+                expires_at REAL
+            )
+        ''')
+
+        # Translate requests per (video, language), ranking what the pre-translation worker does next
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS translation_requests (
+                video_id TEXT,
+                target_language TEXT,
+                request_count INTEGER DEFAULT 0,
+                last_requested_at REAL,
+                PRIMARY KEY (video_id, target_language)
+            )
+        ''')
+
+        # Finished translations: original transcript + translated chunks (with audio URLs) as JSON
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                video_id TEXT,
+                target_language TEXT,
+                original_transcript TEXT,
+                chunks TEXT,
+                created_at REAL,
+                PRIMARY KEY (video_id, target_language)
+            )
+        ''')
+
+        # Inverted slang index: term -> comments using it, ordered by likes for example lookups.
+        # Terms are keyed by slang_dictionary.normalize_key, like the dictionary itself
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'slang_occurrences'")
+        needs_backfill = cursor.fetchone() is None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS slang_occurrences (
+                term TEXT,
+                comment_id TEXT,
+                video_id TEXT,
+                like_count INTEGER,
+                PRIMARY KEY (term, comment_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_slang_occurrences_term_likes
+            ON slang_occurrences (term, like_count DESC)
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_slang_occurrences_comment ON slang_occurrences (comment_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_video ON comments (video_id)')
+        # Evicting a comment drops its index rows
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_comments_delete_slang
+            AFTER DELETE ON comments
+            BEGIN
+                DELETE FROM slang_occurrences WHERE comment_id = OLD.comment_id;
+            END
+        ''')
+        if needs_backfill:
+            cursor.execute('''
+                INSERT OR IGNORE INTO slang_occurrences (term, comment_id, video_id, like_count)
+                SELECT normalize_key(j.value), c.comment_id, c.video_id, c.like_count
+                FROM comments c, json_each(c.detected_slang) j
+                WHERE c.detected_slang IS NOT NULL AND json_valid(c.detected_slang)
+            ''')
+
+        # Slang co-occurrence: comments using both terms (term = other holds the term's own comment
+        # count), kept in sync with slang_occurrences by the triggers below
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'slang_cooccurrence'")
+        needs_pair_backfill = cursor.fetchone() is None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS slang_cooccurrence (
+                term TEXT,
+                other TEXT,
+                comment_count INTEGER,
+                PRIMARY KEY (term, other)
+            ) WITHOUT ROWID
+        ''')
+        if needs_pair_backfill:
+            cursor.execute('''
+                INSERT INTO slang_cooccurrence (term, other, comment_count)
+                SELECT a.term, b.term, COUNT(*)
+                FROM slang_occurrences a
+                JOIN slang_occurrences b ON b.comment_id = a.comment_id
+                GROUP BY a.term, b.term
+            ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_slang_occurrences_insert_pairs
+            AFTER INSERT ON slang_occurrences
+            BEGIN
+                INSERT INTO slang_cooccurrence (term, other, comment_count)
+                SELECT NEW.term, o.term, 1 FROM slang_occurrences o WHERE o.comment_id = NEW.comment_id
+                ON CONFLICT (term, other) DO UPDATE SET comment_count = comment_count + 1;
+                INSERT INTO slang_cooccurrence (term, other, comment_count)
+                SELECT o.term, NEW.term, 1 FROM slang_occurrences o
+                WHERE o.comment_id = NEW.comment_id AND o.term != NEW.term
+                ON CONFLICT (term, other) DO UPDATE SET comment_count = comment_count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_slang_occurrences_delete_pairs
+            AFTER DELETE ON slang_occurrences
+            BEGIN
+                UPDATE slang_cooccurrence SET comment_count = comment_count - 1
+                WHERE (term = OLD.term AND (other = OLD.term OR other IN (
+                           SELECT term FROM slang_occurrences WHERE comment_id = OLD.comment_id)))
+                   OR (other = OLD.term AND term IN (
+                           SELECT term FROM slang_occurrences WHERE comment_id = OLD.comment_id));
+                DELETE FROM slang_cooccurrence
+                WHERE comment_count <= 0 AND (term = OLD.term OR other = OLD.term);
+            END
+        ''')
+        # One-time migration: re-key rows indexed under plain lower() (insert, then delete, so
+        # the triggers keep pairs in sync). A freshly backfilled index is already normalized.
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < SCHEMA_VERSION:
+            if not needs_backfill:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO slang_occurrences (term, comment_id, video_id, like_count)
+                    SELECT normalize_key(term), comment_id, video_id, like_count
+                    FROM slang_occurrences WHERE term != normalize_key(term) AND normalize_key(term) != ''
+                ''')
+                cursor.execute("DELETE FROM slang_occurrences WHERE term != normalize_key(term)")
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        # Precomputed comment explanations (JSON), filled by a background job after caching
+        self._add_column_if_missing(cursor, 'comments', 'explanation', 'TEXT')
+        # Failed pre-translation attempts, and when the pair may be tried again
+        self._add_column_if_missing(cursor, 'translation_requests', 'failed_attempts', 'INTEGER DEFAULT 0')
+        self._add_column_if_missing(cursor, 'translation_requests', 'retry_after', 'REAL')
         
         conn.commit()
         conn.close()
+
+    @staticmethod
+    def _add_column_if_missing(cursor, table: str, column: str, definition: str):
+        """Add a column to an existing table (CREATE TABLE IF NOT EXISTS won't alter old databases)."""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
     
     # --- Consolidated and Corrected Reading Logic ---
     def get_cached_videos(self, topics: List[str], custom_slang: List[str], 
@@ -134,7 +302,7 @@ class VideoDatabase:
             }
 
             # Fetch ALL comments for this video
-            cursor.execute('SELECT comment_id, text, author, like_count, author_channel_url, published_at, reply_count FROM comments WHERE video_id = ?', (video[0],))
+            cursor.execute('SELECT comment_id, text, author, like_count, author_channel_url, published_at, reply_count, detected_slang FROM comments WHERE video_id = ?', (video[0],))
             comments = cursor.fetchall()
 
             top_comments = []
@@ -146,10 +314,14 @@ class VideoDatabase:
                     'like_count': c[3],
                     'author_channel_url': c[4],
                     'published_at': c[5],
-                    'reply_count': c[6]
+                    'reply_count': c[6],
+                    'detected_slang': json.loads(c[7] or '[]')
                 })
 
             video_data['top_comments'] = top_comments
+            slang_comments = [c for c in top_comments if c['detected_slang']]
+            video_data['slang_comment_count'] = len(slang_comments)
+            video_data['unique_slang_terms'] = sorted({t for c in slang_comments for t in c['detected_slang']})
 
             result.append(video_data)
 
@@ -166,7 +338,35 @@ class VideoDatabase:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Clear old cache for these exact parameters
+        self._write_cache_entry(cursor, topics, custom_slang, shorts_per_topic, comments_per_short, cache_hours)
+        self._write_videos(cursor, videos)
+        
+        conn.commit()
+        conn.close()
+
+    def save_videos(self, videos: List[Dict]):
+        """
+        Upsert a batch of videos and their comments without touching cache metadata.
+        Used by batch ingestion, which records metadata once a topic is complete.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        self._write_videos(cursor, videos)
+        conn.commit()
+        conn.close()
+
+    def record_cache_entry(self, topics: List[str], custom_slang: List[str],
+                           shorts_per_topic: int, comments_per_short: int, cache_hours: int = 24):
+        """Register a cache_metadata entry for videos that were saved separately."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        self._write_cache_entry(cursor, topics, custom_slang, shorts_per_topic, comments_per_short, cache_hours)
+        conn.commit()
+        conn.close()
+
+    def _write_cache_entry(self, cursor, topics: List[str], custom_slang: List[str],
+                           shorts_per_topic: int, comments_per_short: int, cache_hours: int):
+        """Replace the cache_metadata row for these exact parameters."""
         topics_json = json.dumps(topics)
         custom_slang_json = json.dumps(custom_slang)
         
@@ -183,7 +383,9 @@ class VideoDatabase:
             (topics, custom_slang, shorts_per_topic, comments_per_short, expires_at)
             VALUES (?, ?, ?, ?, ?)
         ''', (topics_json, custom_slang_json, shorts_per_topic, comments_per_short, expires_at.strftime('%Y-%m-%d %H:%M:%S')))
-        
+
+    def _write_videos(self, cursor, videos: List[Dict]):
+        """Insert or replace video rows and their top_comments."""
         # Insert videos and comments
         for video in videos:
             video_id = video.get('video_id', '')
@@ -208,13 +410,30 @@ class VideoDatabase:
                 video.get('url', '')
             ))
             
-            # 2. Insert comments (from top_comments field)
+            # 2. Upsert comments (from top_comments field); a stored explanation survives
+            #    re-caching as long as the comment text is unchanged
             for comment in video.get('top_comments', []):
+                explanation = comment.get('explanation')
+                if isinstance(explanation, dict):
+                    explanation = json.dumps(explanation, ensure_ascii=False)
                 cursor.execute('''
-                    INSERT OR REPLACE INTO comments
+                    INSERT INTO comments
                     (comment_id, video_id, text, author, author_channel_url,
-                     like_count, published_at, reply_count, detected_slang)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     like_count, published_at, reply_count, detected_slang, explanation)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(comment_id) DO UPDATE SET
+                        video_id = excluded.video_id,
+                        text = excluded.text,
+                        author = excluded.author,
+                        author_channel_url = excluded.author_channel_url,
+                        like_count = excluded.like_count,
+                        published_at = excluded.published_at,
+                        reply_count = excluded.reply_count,
+                        detected_slang = excluded.detected_slang,
+                        explanation = COALESCE(
+                            excluded.explanation,
+                            CASE WHEN comments.text = excluded.text THEN comments.explanation END
+                        )
                 ''', (
                     comment.get('comment_id', ''),
                     video_id,
@@ -224,11 +443,19 @@ class VideoDatabase:
                     comment.get('like_count', 0),
                     comment.get('published_at', ''),
                     comment.get('reply_count', 0),
-                    json.dumps([])  # Empty array - slang detection deprecated
+                    json.dumps(comment.get('detected_slang', [])),
+                    explanation
                 ))
-        
-        conn.commit()
-        conn.close()
+
+                # 3. Keep the inverted slang index in sync with this comment
+                cursor.execute('DELETE FROM slang_occurrences WHERE comment_id = ?', (comment.get('comment_id', ''),))
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO slang_occurrences (term, comment_id, video_id, like_count)
+                    VALUES (?, ?, ?, ?)
+                ''', [
+                    (normalize_key(term), comment.get('comment_id', ''), video_id, comment.get('like_count', 0))
+                    for term in comment.get('detected_slang', []) if normalize_key(term)
+                ])
 
     def get_any_cached_videos(self, limit: int = 20) -> Optional[List[Dict]]:
         """
@@ -273,7 +500,7 @@ class VideoDatabase:
             }
 
             # Fetch ALL comments for this video
-            cursor.execute('SELECT comment_id, text, author, like_count, author_channel_url, published_at, reply_count FROM comments WHERE video_id = ?', (video[0],))
+            cursor.execute('SELECT comment_id, text, author, like_count, author_channel_url, published_at, reply_count, detected_slang FROM comments WHERE video_id = ?', (video[0],))
             comments = cursor.fetchall()
 
             top_comments = []
@@ -285,10 +512,14 @@ class VideoDatabase:
                     'like_count': c[3],
                     'author_channel_url': c[4],
                     'published_at': c[5],
-                    'reply_count': c[6]
+                    'reply_count': c[6],
+                    'detected_slang': json.loads(c[7] or '[]')
                 })
 
             video_data['top_comments'] = top_comments
+            slang_comments = [c for c in top_comments if c['detected_slang']]
+            video_data['slang_comment_count'] = len(slang_comments)
+            video_data['unique_slang_terms'] = sorted({t for c in slang_comments for t in c['detected_slang']})
 
             result.append(video_data)
 
@@ -317,5 +548,422 @@ class VideoDatabase:
             )
         ''')
 
+        # Drop comments whose video is gone (the delete trigger also clears their slang index rows)
+        cursor.execute('''
+            DELETE FROM comments WHERE video_id NOT IN (SELECT video_id FROM videos)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    # --- Slang Index Lookups ---
+    def get_slang_examples(self, term: str, limit: int = 5) -> List[Dict]:
+        """Most-liked cached comments that use a slang term (served from the inverted index)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.comment_id, c.text, c.author, c.like_count, c.video_id, v.title
+            FROM slang_occurrences o
+            JOIN comments c ON c.comment_id = o.comment_id
+            LEFT JOIN videos v ON v.video_id = o.video_id
+            WHERE o.term = ?
+            ORDER BY o.like_count DESC
+            LIMIT ?
+        ''', (normalize_key(term), limit))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [{
+            'comment_id': r[0],
+            'text': r[1],
+            'author': r[2],
+            'like_count': r[3],
+            'video_id': r[4],
+            'video_title': r[5]
+        } for r in rows]
+
+    def get_slang_cooccurrences(self, terms: List[str]) -> Dict[str, Dict[str, int]]:
+        """For each term (by normalize_key): {other term: comments using both}, including the term itself."""
+        terms = [key for key in dict.fromkeys(normalize_key(t) for t in terms) if key]
+        if not terms:
+            return {}
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(terms))
+        cursor.execute(f'''
+            SELECT term, other, comment_count FROM slang_cooccurrence WHERE term IN ({placeholders})
+        ''', terms)
+        rows = cursor.fetchall()
+        conn.close()
+
+        pairs: Dict[str, Dict[str, int]] = {}
+        for term, other, count in rows:
+            pairs.setdefault(term, {})[other] = count
+        return pairs
+
+    def get_slang_term_counts(self) -> Dict[str, int]:
+        """Number of cached comments using each slang term."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT term, comment_count FROM slang_cooccurrence WHERE term = other')
+        rows = cursor.fetchall()
+        conn.close()
+        return dict(rows)
+
+    # --- Comment Explanations ---
+    def get_comment_explanation(self, comment_id: str) -> Optional[Dict]:
+        """Precomputed explanation for a cached comment, if the background job has produced one."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT explanation FROM comments WHERE comment_id = ?', (comment_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def get_comments_needing_explanation(self, video_ids: List[str]) -> List[Dict]:
+        """Comments of the given videos that have no stored explanation yet, with their video context."""
+        if not video_ids:
+            return []
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(video_ids))
+        cursor.execute(f'''
+            SELECT c.comment_id, c.video_id, c.text, c.detected_slang, v.title, v.description
+            FROM comments c
+            JOIN videos v ON v.video_id = c.video_id
+            WHERE c.video_id IN ({placeholders}) AND c.explanation IS NULL
+            ORDER BY c.video_id, c.like_count DESC
+        ''', list(video_ids))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [{
+            'comment_id': r[0],
+            'video_id': r[1],
+            'text': r[2],
+            'detected_slang': json.loads(r[3]) if r[3] else [],
+            'video_title': r[4] or '',
+            'video_description': r[5] or ''
+        } for r in rows]
+
+    def save_comment_explanations(self, explanations: Dict[str, Dict]):
+        """Store explanations keyed by comment_id."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.executemany('UPDATE comments SET explanation = ? WHERE comment_id = ?', [
+            (json.dumps(explanation, ensure_ascii=False), comment_id)
+            for comment_id, explanation in explanations.items()
+        ])
+        conn.commit()
+        conn.close()
+
+    # --- Transcript Cache ---
+    def get_transcript_entry(self, video_id: str) -> Optional[Dict]:
+        """
+        Cached transcript for a video: {"segments": [...] or None, "is_generated"}.
+        Returns None if nothing is cached or a negative entry has expired.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT segments, is_generated FROM transcripts
+            WHERE video_id = ? AND (expires_at IS NULL OR expires_at > ?)
+        ''', (video_id, time.time()))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {'segments': json.loads(row[0]) if row[0] is not None else None, 'is_generated': bool(row[1])}
+
+    def save_transcript(self, video_id: str, segments: Optional[List[Dict]],
+                        is_generated: bool = False, expires_at: Optional[float] = None):
+        """Store a transcript, or segments=None with an expiry for "no transcript available"."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO transcripts (video_id, segments, is_generated, fetched_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (video_id, json.dumps(segments, ensure_ascii=False) if segments is not None else None,
+              int(is_generated), time.time(), expires_at))
+        conn.commit()
+        conn.close()
+
+    def get_transcript_availability(self, video_ids: List[str]) -> Dict[str, bool]:
+        """video_id -> whether it has a transcript, for videos with a live cache entry."""
+        if not video_ids:
+            return {}
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(video_ids))
+        cursor.execute(f'''
+            SELECT video_id, segments IS NOT NULL FROM transcripts
+            WHERE video_id IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)
+        ''', [*video_ids, time.time()])
+        rows = cursor.fetchall()
+        conn.close()
+        return {row[0]: bool(row[1]) for row in rows}
+
+    # --- Stored Translations ---
+    def record_translation_request(self, video_id: str, target_language: str):
+        """Count one translate request for a video and language."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO translation_requests (video_id, target_language, request_count, last_requested_at)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT (video_id, target_language)
+            DO UPDATE SET request_count = request_count + 1, last_requested_at = excluded.last_requested_at
+        ''', (video_id, target_language, time.time()))
+        conn.commit()
+        conn.close()
+
+    def record_pretranslation_failure(self, video_id: str, target_language: str, cooldown_seconds: float):
+        """Put a pair on cooldown after a failed pre-translation; the cooldown doubles per failure (up to 64x)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE translation_requests
+            SET failed_attempts = COALESCE(failed_attempts, 0) + 1,
+                retry_after = ? + ? * (1 << MIN(COALESCE(failed_attempts, 0), 6))
+            WHERE video_id = ? AND target_language = ?
+        ''', (time.time(), cooldown_seconds, video_id, target_language))
+        conn.commit()
+        conn.close()
+
+    def get_translation(self, video_id: str, target_language: str) -> Optional[Dict]:
+        """Stored translation: {"original_transcript": [...], "chunks": [...]}, if any."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT original_transcript, chunks FROM translations WHERE video_id = ? AND target_language = ?
+        ''', (video_id, target_language))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {'original_transcript': json.loads(row[0]), 'chunks': json.loads(row[1])}
+
+    def save_translation(self, video_id: str, target_language: str,
+                         original_transcript: List[Dict], chunks: List[Dict]):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO translations (video_id, target_language, original_transcript, chunks, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (video_id, target_language, json.dumps(original_transcript, ensure_ascii=False),
+              json.dumps(chunks, ensure_ascii=False), time.time()))
+        conn.commit()
+        conn.close()
+
+    def delete_translation(self, video_id: str, target_language: str):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM translations WHERE video_id = ? AND target_language = ?', (video_id, target_language))
         conn.commit()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    def get_pretranslation_candidates(self, top_k: int, min_requests: int = 1) -> List[Dict]:
+        """
+        The top_k most requested (video, language) pairs among still-cached videos not known
+        to lack a transcript and not on a failure cooldown, minus those already translated;
+        busiest first.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT top.video_id, top.target_language, top.request_count
+            FROM (
+                SELECT r.video_id, r.target_language, r.request_count, r.last_requested_at
+                FROM translation_requests r
+                JOIN videos v ON v.video_id = r.video_id
+                LEFT JOIN transcripts tr ON tr.video_id = r.video_id
+                WHERE r.request_count >= ?
+                  AND (tr.video_id IS NULL OR tr.segments IS NOT NULL OR tr.expires_at <= ?)
+                  AND (r.retry_after IS NULL OR r.retry_after <= ?)
+                ORDER BY r.request_count DESC, r.last_requested_at DESC
+                LIMIT ?
+            ) top
+            LEFT JOIN translations t ON t.video_id = top.video_id AND t.target_language = top.target_language
+            WHERE t.video_id IS NULL
+            ORDER BY top.request_count DESC, top.last_requested_at DESC
+        ''', (min_requests, time.time(), time.time(), top_k))
+        rows = cursor.fetchall()
+        conn.close()
+        return [{'video_id': r[0], 'target_language': r[1], 'request_count': r[2]} for r in rows]
+
+    # --- Thumbnail Index ---
+    def get_thumbnail_hash(self, video_id: str, size: str) -> Optional[str]:
+        """Return the content hash of a cached thumbnail variant, if any."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT content_hash FROM thumbnails WHERE video_id = ? AND size = ?', (video_id, size))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def save_thumbnail_hash(self, video_id: str, size: str, content_hash: str, source_url: str):
+        """Record which stored blob serves a thumbnail variant."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO thumbnails (video_id, size, content_hash, source_url)
+            VALUES (?, ?, ?, ?)
+        ''', (video_id, size, content_hash, source_url))
+        conn.commit()
+        conn.close()
+
+    def get_video_thumbnail_url(self, video_id: str) -> Optional[str]:
+        """Thumbnail URL reported by the YouTube API for a cached video."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT thumbnail FROM videos WHERE video_id = ?', (video_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row and row[0] else None
+
+    # --- Snapshot Export / Import ---
+    def is_empty(self) -> bool:
+        """True if no videos are cached yet (fresh node)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1 FROM videos LIMIT 1')
+        row = cursor.fetchone()
+        conn.close()
+        return row is None
+
+    def export_snapshot(self, path: str) -> int:
+        """
+        Export the cache to a snapshot file. Returns the number of videos written.
+
+        - *.db / *.sqlite: consistent SQLite copy via the online backup API
+        - *.ndjson.zst / *.ndjson.gz / *.ndjson: one JSON record per line,
+          videos streamed with their comments, plus cache_metadata rows
+        """
+        if self._is_sqlite_snapshot(path):
+            src = sqlite3.connect(self.db_path)
+            dest = sqlite3.connect(path)
+            src.backup(dest)
+            dest.close()
+            cursor = src.execute('SELECT COUNT(*) FROM videos')
+            count = cursor.fetchone()[0]
+            src.close()
+            return count
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        count = 0
+        with _open_snapshot(path, 'w') as f:
+            f.write(json.dumps({'snapshot_version': SNAPSHOT_VERSION,
+                                'exported_at': datetime.now().isoformat()}) + "\n")
+
+            for row in conn.execute('SELECT topics, custom_slang, shorts_per_topic, comments_per_short, created_at, expires_at FROM cache_metadata'):
+                f.write(json.dumps({'cache_metadata': dict(row)}, ensure_ascii=False) + "\n")
+
+            for video in conn.execute('SELECT * FROM videos'):
+                record = dict(video)
+                record['top_comments'] = [
+                    dict(c) for c in conn.execute('SELECT * FROM comments WHERE video_id = ?', (video['video_id'],))
+                ]
+                for comment in record['top_comments']:
+                    comment['detected_slang'] = json.loads(comment.get('detected_slang') or '[]')
+                f.write(json.dumps({'video': record}, ensure_ascii=False) + "\n")
+                count += 1
+
+        conn.close()
+        return count
+
+    def import_snapshot(self, path: str, batch_size: int = 500) -> int:
+        """
+        Load a snapshot produced by export_snapshot. Returns the number of videos imported.
+        A SQLite snapshot replaces the database wholesale; NDJSON snapshots are upserted in batches.
+        """
+        if self._is_sqlite_snapshot(path):
+            src = sqlite3.connect(path)
+            dest = sqlite3.connect(self.db_path)
+            src.backup(dest)
+            src.close()
+            dest.close()
+            self.init_database()  # Snapshot may predate newer tables
+            conn = sqlite3.connect(self.db_path)
+            count = conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+            conn.close()
+            return count
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        count = 0
+        batch = []
+        for record in self._iter_snapshot_records(path):
+            if 'cache_metadata' in record:
+                meta = record['cache_metadata']
+                cursor.execute('''
+                    INSERT INTO cache_metadata
+                    (topics, custom_slang, shorts_per_topic, comments_per_short, created_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (meta['topics'], meta['custom_slang'], meta['shorts_per_topic'],
+                      meta['comments_per_short'], meta['created_at'], meta['expires_at']))
+            elif 'video' in record:
+                batch.append(record['video'])
+                if len(batch) >= batch_size:
+                    self._write_videos(cursor, batch)
+                    conn.commit()
+                    count += len(batch)
+                    batch = []
+
+        if batch:
+            self._write_videos(cursor, batch)
+            count += len(batch)
+        conn.commit()
+        conn.close()
+        return count
+
+    def import_legacy_json(self, path: str) -> int:
+        """
+        Seed from the older JSON dumps (youtube_shorts_slang_data.json / cached_shorts.json).
+        Those files list slang comments under comments_with_slang instead of top_comments.
+        No cache_metadata is written, so the videos serve the quota-exhausted fallback.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            videos = json.load(f)
+
+        normalized = []
+        for video in videos:
+            if not video.get('video_id'):
+                continue
+            video = dict(video)
+            if not video.get('top_comments'):
+                video['top_comments'] = video.get('comments_with_slang', [])
+            normalized.append(video)
+
+        if normalized:
+            self.save_videos(normalized)
+        return len(normalized)
+
+    def _iter_snapshot_records(self, path: str) -> Iterator[Dict]:
+        with _open_snapshot(path, 'r') as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('snapshot_version', 0) > SNAPSHOT_VERSION:
+                raise ValueError(f"Snapshot version {header.get('snapshot_version')} is newer than supported ({SNAPSHOT_VERSION})")
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def _is_sqlite_snapshot(path: str) -> bool:
+        return path.endswith(('.db', '.sqlite', '.sqlite3'))
+
+
+def _open_snapshot(path: str, mode: str):
+    """Open an NDJSON snapshot as text, compressed according to its extension."""
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed - use a .ndjson.gz snapshot or `pip install zstandard`")
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
@@ -3,8 +3,134 @@
 import os
 import json
 import random
-from typing import Dict, List, Optional
-from groq import Groq
+import re
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from groq import AsyncGroq, BadRequestError
+from pydantic import ValidationError
+from llm_cache import LLMResponseCache, normalize_text, fingerprint
+from near_duplicate import NearDuplicateIndex
+from prescreen import CommentPrescreener, BUCKET_SCORES, score_bucket
+from slang_dictionary import SlangDictionary, normalize_key
+from model_router import ModelRouter
+from llm_gateway import LLMGateway, LLMUnavailableError
+from hedging import HedgingPolicy
+from llm_usage import LLMUsageTracker, compact_description, estimate_tokens
+from llm_schemas import (
+    LLMOutputError, parse_llm_json, EvaluationOutput, RepliesOutput, ExplanationOutput,
+    ExplanationsOutput, DefinitionItem, DefinitionsOutput, SuggestionReasonsOutput,
+    SegmentTranslationsOutput
+)
+
+# Bump whenever _build_evaluation_prompt changes meaningfully, so cached evaluations are not reused
+EVALUATION_PROMPT_VERSION = "eval-v1"
+# Same idea for cached word definitions
+DEFINITION_PROMPT_VERSION = "define-v1"
+
+# Seconds the evaluation gets to finish on its own (pre-screen, caches) before replies are
+# started speculatively in parallel
+SPECULATION_HEAD_START = 0.05
+
+# Shared reply style guide, used by both the single-reply and batched reply prompts
+RESPONSE_STYLE_GUIDE = """RESPONSE STYLE EXAMPLES (pick ONE style randomly):
+
+STYLE 1 - Short & Sweet:
+"haha love the energy! 😊"
+"this! 💯"
+"relatable lol"
+"felt that 🔥"
+"same here!"
+
+STYLE 2 - Enthusiastic:
+"YESS!! Your excitement is contagious! 🔥"
+"Love this comment!! You get it! 💯"
+"THIS is it!! 😍"
+"Exactly what I was thinking! 🙌"
+
+STYLE 3 - Chill & Casual:
+"haha yeah totally"
+"for real though"
+"ngl this is a mood"
+"honestly same"
+"I feel you on this"
+
+STYLE 4 - Supportive (Teacher-ish but human):
+"Love the enthusiasm! Quick tip: try 'want to' instead of 'wanna' for formal writing 💡"
+"Great energy! Btw, 'helpful' has one L at the end 😊"
+"You're getting there! Maybe add a bit more detail next time?"
+"Nice! Just a heads up - consider adding what you liked specifically"
+
+STYLE 5 - Just Vibing:
+"the :)) made me smile 😊"
+"your energy >>> 🔥"
+"this comment has good vibes"
+"love the simplicity"
+"straight to the point, respect"
+
+STYLE 6 - Relatable:
+"omg same though"
+"literally me"
+"why is this so true 💀"
+"facts"
+"big mood"
+
+STYLE 7 - Questioning/Engaging:
+"wait did you try it??"
+"right?? so good!"
+"are you gonna make this?"
+"same! did you see the part where...?"
+
+YOUR RESPONSE GUIDELINES:
+1. Pick a random style that fits the score
+2. Keep it natural - how YOU would actually comment
+3. DIVERSE EMOJI - don't repeat! Pick from: 😊🔥💯💡👍😅💪🌟✨👌😂💀🙌
+4. Vary sentence length (3-20 words usually)
+5. Match their energy level
+6. If tips needed, weave them in naturally
+7. DON'T use the same structure as other AIs
+8. Sound like a real person scrolling and reacting
+9. Be genuine - not fake enthusiastic
+
+Score Guidelines:
+- 80+: Be excited! Short or enthusiastic works
+- 60-79: Supportive, maybe gentle tip
+- 40-59: Encouraging but mention they can improve
+- 20-39: BE HONEST - it's meaningless, guide them to add context
+  * Don't be overly encouraging for "hihi" or "lol" alone
+  * Be friendly but direct: "add what you thought!"
+  * Don't give them high praise for random noise
+
+CRITICAL FOR LOW SCORES (20-39):
+These are meaningless comments like "hihi", "lol", "hehe" with NO context.
+- DON'T say "love this!" or "great!" - it's not great, it's random
+- DO be honest: "try adding what you liked", "what did you think?"
+- Keep it short and direct
+- Examples:
+  * "add some context next time!"
+  * "what did you think tho?"
+  * "lol but about what?"
+  * "try saying what you liked 💡\""""
+
+# Condensed variants, used when the evaluator runs with compact_prompts=True
+COMPACT_RESPONSE_STYLE_GUIDE = """STYLE: pick ONE at random - short & sweet ("felt that 🔥"), enthusiastic ("YESS!! 🔥"),
+chill ("ngl this is a mood"), supportive with a tip woven in ("Love it! Tip: 'want to' > 'wanna' 💡"),
+relatable ("literally me 💀") or engaging ("wait did you try it??").
+- Sound like a real viewer, 3-20 words, varied openings and emoji, match their energy
+- 80+: excited; 60-79: supportive, maybe a gentle tip; 40-59: encouraging, mention they can improve
+- 20-39 (meaningless "lol"/"hihi" alone): don't praise; short and honest ("what did you think tho?")"""
+
+COMPACT_EVALUATION_CRITERIA = """[SAFETY FIRST]
+If the comment has hate speech/racism, harassment/threats/doxxing or discriminatory slurs/attacks:
+all scores 0, correction "", mistakes ["This comment contains <type> which is not acceptable"], goodParts [].
+
+[Scoring - appropriate comments]
+Reward communication, not perfection: understandable (40%), related to the video (30%), natural for social media (30%).
+Emoticons (TuT, ^_^), casual slang (omg, lol) and minor typos are fine.
+85-100 great, 70-84 good, 55-69 nice try, 40-54 keep practicing,
+20-39 meaningless alone ("hihi", "lol", "lmao" with no context - suggest adding what they thought).
+Reasonable video-related comments score 60+. Lead with positives; "mistakes" are friendly tips."""
+
 
 class GroqCommentEvaluator:
     """
@@ -12,9 +138,30 @@ class GroqCommentEvaluator:
     Focuses on communication success rather than perfection.
     """
 
-    def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
-        self.model = "llama-3.3-70b-versatile"
+    def __init__(self, api_key: str, request_timeout: float = 20.0, batch_replies: bool = True,
+                 response_cache: Optional[LLMResponseCache] = None,
+                 near_duplicates: Optional[NearDuplicateIndex] = None,
+                 prescreener: Optional[CommentPrescreener] = None,
+                 usage_tracker: Optional[LLMUsageTracker] = None,
+                 router: Optional[ModelRouter] = None,
+                 gateway: Optional[LLMGateway] = None,
+                 hedging: Optional[HedgingPolicy] = None,
+                 compact_prompts: bool = False, description_token_budget: int = 150,
+                 json_mode: bool = True):
+        self.client = AsyncGroq(api_key=api_key)
+        self.router = router or ModelRouter()  # Task -> model tier, with latency-driven downgrades
+        self.gateway = gateway or LLMGateway()  # Rate limits, priorities, load shedding, circuit breakers
+        self.hedging = hedging  # Duplicate requests for slow calls of latency-critical tasks (optional)
+        self.request_timeout = request_timeout  # Seconds allowed per LLM call
+        self.batch_replies = batch_replies  # One structured call for all replies instead of N calls
+        self.response_cache = response_cache  # Persistent exact-match cache (optional)
+        self.near_duplicates = near_duplicates  # In-memory near-duplicate index (optional)
+        self.prescreener = prescreener  # Local rules that settle trivial/abusive comments (optional)
+        self.usage = usage_tracker or LLMUsageTracker()  # Per-task token/latency accounting
+        self.compact_prompts = compact_prompts  # Condensed instruction blocks
+        self.description_token_budget = description_token_budget  # Max tokens of video description per prompt
+        self.json_mode = json_mode  # Ask the API for JSON-mode output on structured calls
+        self.speculation_stats = {"hits": 0, "misses": 0, "skipped": 0}  # Speculative reply outcomes
 
         # Mix of learning-focused and casual usernames
         self.ai_authors = [
@@ -47,7 +194,302 @@ class GroqCommentEvaluator:
             "viewer_789"
         ]
 
-    def evaluate_comment(
+    async def _chat_completion(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float] = None,
+        task: str = "other",
+        json_mode: bool = False
+    ) -> str:
+        """
+        Single-prompt chat completion with a per-request timeout. Returns the stripped text.
+        Token usage and latency are recorded under `task` (e.g. "evaluate"); the model is
+        picked by the router for that task, and timeouts count as missed latency targets.
+        The call goes through the gateway, which may refuse it with LLMUnavailableError.
+        With json_mode, the API is asked for a JSON object; if its own JSON check rejects the
+        generation, the rejected text is returned so the caller can still parse or repair it.
+        Tasks covered by the hedging policy may get a duplicate request when slow (see hedging.py).
+        """
+        model = self._pick_model(task)
+        request = {
+            "messages": [{
+                "role": "user",
+                "content": prompt
+            }],
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if json_mode and self.json_mode:
+            request["response_format"] = {"type": "json_object"}
+
+        estimated_tokens = estimate_tokens(prompt) + max_tokens
+        timeout = timeout or self.request_timeout
+        delay = self.hedging.hedge_delay(task) if self.hedging else None
+        if delay is None:
+            start_time = time.perf_counter()
+            text, tokens = await self._send_request(request, task, estimated_tokens, timeout)
+            if self.hedging:
+                elapsed = time.perf_counter() - start_time
+                self.hedging.record_call(task, elapsed, elapsed, tokens)
+            return text
+        return await self._hedged_request(request, task, estimated_tokens, timeout, delay)
+
+    async def _send_request(self, request: Dict, task: str, estimated_tokens: int, timeout: float,
+                            admitted: Optional[asyncio.Event] = None) -> Tuple[str, int]:
+        """
+        One API request through the gateway, with accounting. Returns (text, total tokens).
+        `admitted` is set once the request has its gateway slot.
+        """
+        model = request["model"]
+        start_time = time.perf_counter()
+        try:
+            async with self.gateway.slot(task, model, estimated_tokens) as lease:
+                start_time = time.perf_counter()  # Time in the gateway queue isn't model latency
+                if admitted:
+                    admitted.set()
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(**request),
+                    timeout=timeout
+                )
+                lease.used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+        except LLMUnavailableError:
+            raise
+        except BadRequestError as e:
+            failed_generation = self._failed_generation(e)
+            if failed_generation is None:
+                self.usage.record_error(task)
+                raise
+            self.usage.record(task, time.perf_counter() - start_time)
+            self.router.record(task, model, time.perf_counter() - start_time)
+            return failed_generation, 0
+        except asyncio.TimeoutError:
+            self.usage.record_error(task)
+            self.router.record(task, model, time.perf_counter() - start_time)
+            raise
+        except Exception:
+            self.usage.record_error(task)
+            raise
+
+        latency = time.perf_counter() - start_time
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        self.usage.record(task, latency, prompt_tokens, completion_tokens)
+        self.router.record(task, model, latency)
+        if self.hedging:
+            self.hedging.record_sample(task, latency)
+        print(f"📏 {task} [{model}]: {prompt_tokens} prompt + {completion_tokens} completion tokens in {latency:.2f}s")
+        return response.choices[0].message.content.strip(), (prompt_tokens or 0) + (completion_tokens or 0)
+
+    async def _hedged_request(self, request: Dict, task: str, estimated_tokens: int,
+                              timeout: float, delay: float) -> str:
+        """
+        Send the request; if it hasn't answered `delay` seconds after getting its gateway slot
+        and the hedge budget allows, send one duplicate and use whichever reply arrives first,
+        cancelling the other. No duplicate is sent while calls are queued at the gateway.
+        Fails only if both requests fail (with the primary's error).
+        """
+        start_time = time.perf_counter()
+        admitted = asyncio.Event()
+        primary = asyncio.create_task(self._send_request(request, task, estimated_tokens, timeout, admitted))
+        requests = [primary]
+        waiting_for_slot = asyncio.create_task(admitted.wait())
+        reserved = recorded = False
+        try:
+            # Time in the gateway queue doesn't count towards the hedge delay
+            await asyncio.wait({primary, waiting_for_slot}, return_when=asyncio.FIRST_COMPLETED)
+            await asyncio.wait({primary}, timeout=delay)
+            if primary.done() or self.gateway.queued() or not self.hedging.allow_hedge(task):
+                text, tokens = await primary
+                elapsed = time.perf_counter() - start_time
+                self.hedging.record_call(task, elapsed, elapsed, tokens)
+                return text
+            reserved = True
+
+            print(f"🔀 {task}: no reply after {delay:.2f}s, sending a hedge request")
+            hedge = asyncio.create_task(self._send_request(request, task, estimated_tokens, timeout))
+            requests.append(hedge)
+            pending = set(requests)
+            winner = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((r for r in requests if r in done and not r.exception()), None)
+            elapsed = time.perf_counter() - start_time
+            if winner is None:
+                raise primary.exception()
+
+            text, tokens = winner.result()
+            loser = hedge if winner is primary else primary
+            if loser.done() and not loser.exception():
+                extra_tokens = loser.result()[1]
+            else:
+                # A cancelled request's prompt has usually been processed already
+                extra_tokens = estimate_tokens(request["messages"][0]["content"])
+            self.hedging.record_call(task, elapsed, elapsed, tokens, hedged=True,
+                                     hedge_won=winner is hedge, extra_tokens=extra_tokens)
+            recorded = True
+            return text
+        finally:
+            waiting_for_slot.cancel()
+            if reserved and not recorded:
+                self.hedging.release_hedge(task)
+            for pending_request in requests:
+                if not pending_request.done():
+                    pending_request.cancel()
+                # Nobody awaits a loser's outcome; keep its error from being logged as unretrieved
+                pending_request.add_done_callback(lambda r: r.cancelled() or r.exception())
+
+    def _pick_model(self, task: str) -> str:
+        """The router's model for the task, or the next faster tier while that model's circuit is open."""
+        model = self.router.model_for(task)
+        if not self.gateway.is_available(model):
+            fallback = self.router.fallback_model(task)
+            if fallback and self.gateway.is_available(fallback):
+                print(f"🚧 {task}: circuit open for {model}, using {fallback}")
+                return fallback
+        return model
+
+    @staticmethod
+    def _failed_generation(error: BadRequestError) -> Optional[str]:
+        """Text of a generation the API rejected in JSON mode (error code json_validate_failed), if any."""
+        body = error.body if isinstance(error.body, dict) else {}
+        details = body.get("error", body)
+        if isinstance(details, dict) and details.get("code") == "json_validate_failed":
+            return details.get("failed_generation") or ""
+        return None
+
+    async def _structured_completion(
+        self,
+        prompt: str,
+        schema,
+        temperature: float,
+        max_tokens: int,
+        task: str,
+        timeout: Optional[float] = None
+    ):
+        """
+        JSON-mode completion validated against a pydantic schema (see llm_schemas.py).
+        Raises LLMOutputError if the reply can't be parsed even after a repair call.
+        """
+        response_text = await self._chat_completion(
+            prompt, temperature=temperature, max_tokens=max_tokens,
+            timeout=timeout, task=task, json_mode=True
+        )
+        return await self._validate_or_repair(response_text, schema, task, max_tokens, timeout)
+
+    async def _validate_or_repair(
+        self,
+        response_text: str,
+        schema,
+        task: str,
+        max_tokens: int,
+        timeout: Optional[float] = None
+    ):
+        """
+        Parse and validate an LLM reply. A reply that doesn't fit is counted as a parse failure
+        and sent back once, alone with the schema, for a deterministic repair; that prompt is much
+        shorter than the original instructions.
+        """
+        parsed = self._parse_output(response_text, schema)
+        if parsed is not None:
+            return parsed
+
+        self.usage.record_parse_failure(task)
+        print(f"⚠️ {task}: reply did not match {schema.__name__}, asking for a repair")
+        repaired_text = await self._chat_completion(
+            self._build_repair_prompt(response_text, schema), temperature=0, max_tokens=max_tokens,
+            timeout=timeout, task=f"{task}_repair", json_mode=True
+        )
+        parsed = self._parse_output(repaired_text, schema)
+        if parsed is None:
+            self.usage.record_parse_failure(f"{task}_repair")
+            raise LLMOutputError(f"{task}: LLM reply could not be parsed as {schema.__name__}")
+        return parsed
+
+    @staticmethod
+    def _parse_output(response_text: str, schema):
+        """Tolerant parse + schema validation; None if the reply doesn't fit."""
+        data = parse_llm_json(response_text)
+        if data is None:
+            return None
+        try:
+            return schema.model_validate(data)
+        except ValidationError:
+            return None
+
+    def _build_repair_prompt(self, response_text: str, schema) -> str:
+        """Prompt asking the model to turn a malformed reply into valid JSON for the schema."""
+        return f"""The reply below was supposed to be a JSON object matching this JSON Schema, but it is malformed or incomplete.
+
+[JSON Schema]
+{json.dumps(schema.model_json_schema(), separators=(",", ":"))}
+
+[Reply]
+{response_text}
+
+Return ONLY the corrected JSON object. Keep the original content; fix the structure only."""
+
+    async def _chat_completion_stream(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float] = None,
+        task: str = "other"
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of _chat_completion: yields text deltas as they arrive.
+        The timeout applies to opening the stream; usage and latency are recorded once it ends.
+        The gateway slot is held until the stream is finished.
+        """
+        model = self._pick_model(task)
+        async with self.gateway.slot(task, model, estimate_tokens(prompt) + max_tokens) as lease:
+            start_time = time.perf_counter()
+            try:
+                stream = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        messages=[{
+                            "role": "user",
+                            "content": prompt
+                        }],
+                        model=model,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=True
+                    ),
+                    timeout=timeout or self.request_timeout
+                )
+            except asyncio.TimeoutError:
+                self.usage.record_error(task)
+                self.router.record(task, model, time.perf_counter() - start_time)
+                raise
+            except Exception:
+                self.usage.record_error(task)
+                raise
+
+            usage = None
+            try:
+                async for chunk in stream:
+                    # Groq reports usage on the last chunk, under x_groq
+                    usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except Exception:
+                self.usage.record_error(task)
+                raise
+            lease.used_tokens = getattr(usage, "total_tokens", None)
+
+        latency = time.perf_counter() - start_time
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        self.usage.record(task, latency, prompt_tokens, completion_tokens)
+        self.router.record(task, model, latency)
+        print(f"📏 {task} [{model}] (stream): {prompt_tokens} prompt + {completion_tokens} completion tokens in {latency:.2f}s")
+
+    async def evaluate_comment(
         self,
         video_title: str,
         video_description: str,
@@ -58,7 +500,36 @@ class GroqCommentEvaluator:
         """
         Evaluate a user's comment with friendly, encouraging feedback.
         Focuses on what they did well while gently guiding improvements.
+        Identical submissions are served from the response cache and near-duplicates
+        (same video and language) from the near-duplicate index; likes are always recalculated.
+        Bare reactions and blocklisted comments are settled by the pre-screen without any LLM call.
+        Failures are never replaced with made-up scores: LLMUnavailableError, timeouts, API
+        errors and LLMOutputError reach the caller.
         """
+        if self.prescreener:
+            screened = self.prescreener.screen(user_comment)
+            if screened:
+                screened["likes"] = self.calculate_likes(screened["score"], video_like_count)
+                return screened
+
+        cache_key = None
+        if self.response_cache:
+            cache_key = self._evaluation_cache_key(video_title, video_description, user_comment, target_language)
+            cached = self.response_cache.get("evaluate", cache_key)
+            if cached:
+                evaluation_data = dict(cached)
+                evaluation_data["likes"] = self.calculate_likes(evaluation_data.get("score", 50), video_like_count)
+                return evaluation_data
+
+        near_scope = None
+        if self.near_duplicates:
+            near_scope = self._near_duplicate_scope("evaluate", video_title, video_description, target_language)
+            match = self.near_duplicates.lookup(near_scope, user_comment)
+            if match:
+                evaluation_data = dict(match[0])
+                evaluation_data["likes"] = self.calculate_likes(evaluation_data.get("score", 50), video_like_count)
+                return evaluation_data
+
         prompt = self._build_evaluation_prompt(
             video_title,
             video_description,
@@ -66,41 +537,24 @@ class GroqCommentEvaluator:
             target_language
         )
 
-        try:
-            response = self.client.chat.completions.create(
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                model=self.model,
-                temperature=0.7,
-                max_tokens=1000
-            )
+        evaluation = await self._structured_completion(
+            prompt, EvaluationOutput, temperature=0.7, max_tokens=1000, task="evaluate"
+        )
+        evaluation_data = evaluation.to_dict()
+        if cache_key:
+            self.response_cache.set("evaluate", cache_key, evaluation_data)
+        if near_scope:
+            self.near_duplicates.add(near_scope, user_comment, dict(evaluation_data))
 
-            response_text = response.choices[0].message.content.strip()
-            evaluation_data = self._parse_json_response(response_text)
+        # Calculate likes based on score
+        score = evaluation_data.get("score", 50)
+        likes = self.calculate_likes(score, video_like_count)
+        evaluation_data["likes"] = likes
 
-            # Calculate likes based on score
-            score = evaluation_data.get("score", 50)
-            likes = self.calculate_likes(score, video_like_count)
-            evaluation_data["likes"] = likes
+        return evaluation_data
 
-            return evaluation_data
 
-        except Exception as e:
-            print(f"Error in evaluate_comment: {e}")
-            return {
-                "score": 70,
-                "grammarScore": 70,
-                "contextScore": 70,
-                "naturalnessScore": 70,
-                "likes": 150,
-                "correction": "Great effort! Keep it up! 😊",
-                "mistakes": ["💡 You're doing great! Keep practicing! 🌟"],
-                "goodParts": ["✨ You expressed yourself clearly!", "✨ Great enthusiasm! 🎉"]
-            }
-
-    def generate_response(
+    async def generate_response(
         self,
         user_comment: str,
         score: int,
@@ -113,7 +567,7 @@ class GroqCommentEvaluator:
         Generate warm, encouraging AI responses.
         Note: 'mistakes' is now 'suggestions' in spirit but kept for API compatibility.
         """
-        prompt = self._build_response_prompt(
+        response = await self._generate_reply_or_none(
             user_comment,
             score,
             mistakes,
@@ -121,37 +575,15 @@ class GroqCommentEvaluator:
             video_title,
             target_language
         )
-
-        try:
-            response = self.client.chat.completions.create(
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                model=self.model,
-                temperature=0.9,
-                max_tokens=400
-            )
-
-            ai_comment = response.choices[0].message.content.strip()
-            author_name = self._get_random_ai_author()
-            ai_likes = random.randint(20, 500)
-
-            return {
-                "aiComment": ai_comment,
-                "authorName": author_name,
-                "likes": ai_likes
-            }
-
-        except Exception as e:
-            print(f"Error in generate_response: {e}")
+        if response is None:
             return {
                 "aiComment": "Awesome comment! Keep up the good work! 😊",
                 "authorName": "LanguagePal",
                 "likes": 100
             }
+        return response
 
-    def generate_multiple_responses(
+    async def generate_multiple_responses(
         self,
         user_comment: str,
         score: int,
@@ -164,16 +596,12 @@ class GroqCommentEvaluator:
         Generate multiple AI responses based on comment quality.
         Returns 1-5 responses depending on score.
         Violations get only 1 moderator response.
+        With batch_replies, all replies come from one structured call; otherwise (or if
+        that call fails) they are requested concurrently and failed calls are dropped.
         """
-        # Check if this is a violation (score 0 or contains violation keywords)
-        is_violation = score == 0 or any(
-            keyword in str(mistakes).lower() 
-            for keyword in ['hate speech', 'harassment', 'discriminat', 'personal attack', 'violat']
-        )
-        
-        if is_violation:
+        if self._is_violation(score, mistakes):
             # Only 1 response for violations (moderator message)
-            response = self.generate_response(
+            response = await self.generate_response(
                 user_comment, score, mistakes, correction, 
                 video_title, target_language
             )
@@ -184,19 +612,24 @@ class GroqCommentEvaluator:
         
         # For appropriate comments, generate multiple responses
         num_responses = self.calculate_response_count(score)
-        responses = []
-        
-        for i in range(num_responses):
-            try:
-                response = self.generate_response(
-                    user_comment, score, mistakes, correction,
-                    video_title, target_language
-                )
-                responses.append(response)
-            except Exception as e:
-                print(f"Error generating response {i+1}: {e}")
-                # Continue with other responses even if one fails
-                continue
+
+        if self.batch_replies and num_responses > 1:
+            responses = await self.generate_replies_batch(
+                user_comment, score, mistakes, correction,
+                video_title, target_language, num_responses
+            )
+            if responses:
+                return responses
+
+        results = await asyncio.gather(*[
+            self._generate_reply_or_none(
+                user_comment, score, mistakes, correction,
+                video_title, target_language
+            )
+            for _ in range(num_responses)
+        ])
+        # Continue with the other responses even if some failed
+        responses = [r for r in results if r is not None]
         
         # Ensure at least one response
         if not responses:
@@ -208,6 +641,336 @@ class GroqCommentEvaluator:
         
         return responses
 
+    async def generate_replies_batch(
+        self,
+        user_comment: str,
+        score: int,
+        mistakes: List[str],
+        correction: str,
+        video_title: str,
+        target_language: str,
+        count: int
+    ) -> List[Dict]:
+        """
+        Generate `count` distinct replies, each with its own persona, in ONE chat completion.
+        Returns an empty list if the call fails or the output can't be used.
+        """
+        prompt = self._build_batch_response_prompt(
+            user_comment,
+            score,
+            mistakes,
+            video_title,
+            count
+        )
+        try:
+            output = await self._structured_completion(
+                prompt, RepliesOutput, temperature=0.95, max_tokens=120 * count + 100, task="respond_batch"
+            )
+        except Exception as e:
+            print(f"Error in generate_replies_batch: {e!r}")
+            return []
+
+        responses = []
+        seen_comments = set()
+        used_authors = set()
+        for item in output.replies[:count]:
+            reply = self._reply_from_batch_item(item.model_dump(), seen_comments, used_authors)
+            if reply:
+                responses.append(reply)
+        return responses
+
+    def _reply_from_batch_item(self, item, seen_comments: set, used_authors: set) -> Optional[Dict]:
+        """Turn one {"authorName", "aiComment"} entry into a reply; None for unusable or duplicate entries."""
+        if not isinstance(item, dict):
+            return None
+        ai_comment = str(item.get("aiComment", "")).strip()
+        if not ai_comment or ai_comment.lower() in seen_comments:
+            return None
+        seen_comments.add(ai_comment.lower())
+
+        author_name = str(item.get("authorName", "")).strip()
+        if not author_name or author_name in used_authors:
+            author_name = self._get_random_ai_author()
+        used_authors.add(author_name)
+
+        return {
+            "aiComment": ai_comment,
+            "authorName": author_name,
+            "likes": random.randint(20, 500)
+        }
+
+    @staticmethod
+    def _complete_json_objects(text: str, start: int):
+        """
+        Parse the complete top-level {...} objects in text[start:] (e.g. array items of a
+        streaming response). Returns (objects, resume_position); a trailing partial object
+        is left for the next call.
+        """
+        objects = []
+        depth = 0
+        in_string = False
+        escaped = False
+        object_start = None
+        resume = start
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                if depth == 0:
+                    object_start = i
+                depth += 1
+            elif char == "}" and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    try:
+                        objects.append(json.loads(text[object_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    resume = i + 1
+        return objects, resume
+
+    async def stream_multiple_responses(
+        self,
+        user_comment: str,
+        score: int,
+        mistakes: List[str],
+        correction: str,
+        video_title: str,
+        target_language: str
+    ) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of generate_multiple_responses: yields each reply as soon as it is complete.
+        Batched replies are picked out of the streamed JSON one object at a time; the per-reply
+        fan-out yields replies in completion order.
+        """
+        if self._is_violation(score, mistakes):
+            response = await self.generate_response(
+                user_comment, score, mistakes, correction,
+                video_title, target_language
+            )
+            response["authorName"] = "Community Moderator"
+            response["likes"] = 0
+            yield response
+            return
+
+        num_responses = self.calculate_response_count(score)
+        emitted = 0
+
+        if self.batch_replies and num_responses > 1:
+            prompt = self._build_batch_response_prompt(
+                user_comment,
+                score,
+                mistakes,
+                video_title,
+                num_responses
+            )
+            seen_comments = set()
+            used_authors = set()
+            buffer = ""
+            scan_from = None
+            try:
+                async for delta in self._chat_completion_stream(
+                    prompt, temperature=0.95, max_tokens=120 * num_responses + 100, task="respond_batch"
+                ):
+                    buffer += delta
+                    if scan_from is None:
+                        # Reply objects start after the opening bracket of the "replies" array
+                        bracket = buffer.find("[")
+                        if bracket == -1:
+                            continue
+                        scan_from = bracket + 1
+                    objects, scan_from = self._complete_json_objects(buffer, scan_from)
+                    for item in objects:
+                        reply = self._reply_from_batch_item(item, seen_comments, used_authors)
+                        if reply and emitted < num_responses:
+                            emitted += 1
+                            yield reply
+            except Exception as e:
+                print(f"Error in stream_multiple_responses: {e!r}")
+
+            if emitted:
+                return
+
+        tasks = [
+            asyncio.create_task(self._generate_reply_or_none(
+                user_comment, score, mistakes, correction,
+                video_title, target_language
+            ))
+            for _ in range(num_responses)
+        ]
+        try:
+            for next_reply in asyncio.as_completed(tasks):
+                reply = await next_reply
+                if reply:
+                    emitted += 1
+                    yield reply
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not emitted:
+            yield {
+                "aiComment": "Great effort! Keep practicing!",
+                "authorName": "LanguageBuddy",
+                "likes": 50
+            }
+
+    async def stream_comment_feedback(
+        self,
+        video_title: str,
+        video_description: str,
+        user_comment: str,
+        target_language: str,
+        video_like_count: int
+    ) -> AsyncIterator[Dict]:
+        """
+        Evaluate a comment and generate its replies in one go: yields {"type": "evaluation"}
+        first, then one {"type": "reply"} per reply.
+
+        Unless the evaluation is ready right away (pre-screen or cache), replies are started
+        in parallel for the predicted score bucket, without the evaluation's tips. If the real
+        score lands in the same bucket those replies are used; otherwise they are dropped and
+        regenerated from the evaluation. Errors from the evaluation propagate.
+        """
+        evaluation_task = asyncio.create_task(self.evaluate_comment(
+            video_title, video_description, user_comment, target_language, video_like_count
+        ))
+        speculative_task = None
+        speculative_replies: asyncio.Queue = asyncio.Queue()
+        predicted_bucket = None
+
+        done, _ = await asyncio.wait({evaluation_task}, timeout=SPECULATION_HEAD_START)
+        if not done:
+            predicted_bucket = (
+                self.prescreener.predict_score_bucket(user_comment) if self.prescreener else "supportive"
+            )
+            speculative_task = asyncio.create_task(self._collect_replies(
+                speculative_replies, user_comment, BUCKET_SCORES[predicted_bucket],
+                video_title, target_language
+            ))
+
+        try:
+            evaluation = await evaluation_task
+            yield {"type": "evaluation", "evaluation": evaluation}
+
+            score = evaluation.get("score", 50)
+            mistakes = evaluation.get("mistakes", [])
+            actual_bucket = "violation" if self._is_violation(score, mistakes) else score_bucket(score)
+            if speculative_task and actual_bucket == predicted_bucket:
+                self.speculation_stats["hits"] += 1
+                while True:
+                    reply = await speculative_replies.get()
+                    if reply is None:
+                        break
+                    yield {"type": "reply", "reply": reply}
+                return
+
+            if speculative_task:
+                self.speculation_stats["misses"] += 1
+                print(f"🔮 Speculative replies for '{predicted_bucket}' discarded, score {score} is '{actual_bucket}'")
+                speculative_task.cancel()
+            else:
+                self.speculation_stats["skipped"] += 1
+            async for reply in self.stream_multiple_responses(
+                user_comment, score, mistakes, evaluation.get("correction", ""),
+                video_title, target_language
+            ):
+                yield {"type": "reply", "reply": reply}
+        finally:
+            for task in (evaluation_task, speculative_task):
+                if task and not task.done():
+                    task.cancel()
+
+    async def _collect_replies(
+        self,
+        queue: asyncio.Queue,
+        user_comment: str,
+        score: int,
+        video_title: str,
+        target_language: str
+    ):
+        """Stream replies for a provisional score into a queue, ending with None."""
+        try:
+            async for reply in self.stream_multiple_responses(
+                user_comment, score, [], "", video_title, target_language
+            ):
+                queue.put_nowait(reply)
+        finally:
+            queue.put_nowait(None)
+
+    async def _generate_reply_or_none(
+        self,
+        user_comment: str,
+        score: int,
+        mistakes: List[str],
+        correction: str,
+        video_title: str,
+        target_language: str
+    ) -> Optional[Dict]:
+        """One reply for the concurrent fan-out; None if the LLM call fails or times out."""
+        prompt = self._build_response_prompt(
+            user_comment,
+            score,
+            mistakes,
+            correction,
+            video_title,
+            target_language
+        )
+        try:
+            ai_comment = await self._chat_completion(prompt, temperature=0.9, max_tokens=400, task="respond")
+        except Exception as e:
+            print(f"Error in generate_response: {e!r}")
+            return None
+
+        return {
+            "aiComment": ai_comment,
+            "authorName": self._get_random_ai_author(),
+            "likes": random.randint(20, 500)
+        }
+
+    def _evaluation_cache_key(
+        self,
+        video_title: str,
+        video_description: str,
+        user_comment: str,
+        target_language: str
+    ) -> str:
+        """Exact-match key: normalized inputs + routed model + prompt version/variant."""
+        return LLMResponseCache.make_key(
+            normalize_text(video_title).lower(),
+            fingerprint(video_description),
+            normalize_text(user_comment),
+            normalize_text(target_language).lower(),
+            self.router.model_for("evaluate"),
+            EVALUATION_PROMPT_VERSION,
+            self.compact_prompts,
+            self.description_token_budget
+        )
+
+    def _near_duplicate_scope(
+        self,
+        task: str,
+        video_title: str,
+        video_description: str,
+        target_language: str = ""
+    ) -> tuple:
+        """Near-duplicate matches are only reused within the same task, video and language."""
+        return (
+            task,
+            normalize_text(video_title).lower(),
+            fingerprint(video_description),
+            normalize_text(target_language).lower(),
+            self.router.model_for(task)
+        )
+
     def calculate_likes(self, score: int, video_like_count: int) -> int:
         """
         Calculate likes - be REALISTIC!
@@ -264,6 +1027,9 @@ class GroqCommentEvaluator:
         target_language: str
     ) -> str:
         """Build friendly evaluation prompt with safety checks."""
+        video_description = compact_description(video_description, self.description_token_budget)
+        if self.compact_prompts:
+            return self._build_compact_evaluation_prompt(video_title, video_description, user_comment, target_language)
 
         evaluation_criteria = """[CRITICAL SAFETY CHECK - CHECK THIS FIRST]
 ⚠️ BEFORE evaluating language quality, check if the comment contains:
@@ -393,6 +1159,45 @@ CRITICAL RULES:
 13. If comment is reasonable and video-related, score should be 60+
 14. ZERO TOLERANCE for racism, hate speech, harassment, or discrimination"""
 
+    def _build_compact_evaluation_prompt(
+        self,
+        video_title: str,
+        video_description: str,
+        user_comment: str,
+        target_language: str
+    ) -> str:
+        """Condensed evaluation prompt: same output contract, much shorter instructions."""
+        return f"""You're a friendly language buddy helping someone practice {target_language}. Encourage them, but check for harmful content first.
+
+[Video Context]
+Video Title: {video_title}
+Video Description: {video_description}
+
+[Their Comment]
+"{user_comment}"
+Language: {target_language}
+
+{COMPACT_EVALUATION_CRITERIA}
+
+[Output Format]
+Return ONLY valid JSON (no markdown):
+{{
+  "score": <0 if violation, otherwise 20-100>,
+  "grammarScore": <0 if violation, otherwise 20-100>,
+  "contextScore": <0 if violation, otherwise 20-100>,
+  "naturalnessScore": <0 if violation, otherwise 20-100>,
+  "correction": "<'' if violation, otherwise gentle suggestion or 'Perfect!'>",
+  "mistakes": ["<violation message, or friendly tip without emoji>"],
+  "goodParts": ["<positive thing without emoji; empty if violation>"]
+}}"""
+
+    def _is_violation(self, score: int, mistakes: List[str]) -> bool:
+        """Check if this is a violation (score 0 or contains violation keywords)"""
+        return score == 0 or any(
+            keyword in str(mistakes).lower()
+            for keyword in ['hate speech', 'harassment', 'discriminat', 'personal attack', 'violat']
+        )
+
     def _build_response_prompt(
         self,
         user_comment: str,
@@ -403,13 +1208,7 @@ CRITICAL RULES:
         target_language: str
     ) -> str:
         """Build friendly response prompt with safety awareness."""
-        # Check if this is a violation (score 0 or contains violation keywords)
-        is_violation = score == 0 or any(
-            keyword in str(mistakes).lower() 
-            for keyword in ['hate speech', 'harassment', 'discriminat', 'personal attack', 'violat']
-        )
-        
-        if is_violation:
+        if self._is_violation(score, mistakes):
             # For violations, return a firm but educational response
             return f"""You're a community moderator. The user posted a comment that violates guidelines.
 
@@ -455,91 +1254,49 @@ CRITICAL: Each response should feel DIFFERENT:
 User's score: {score}/100
 Tips for them: {suggestions_text}
 
-RESPONSE STYLE EXAMPLES (pick ONE style randomly):
-
-STYLE 1 - Short & Sweet:
-"haha love the energy! 😊"
-"this! 💯"
-"relatable lol"
-"felt that 🔥"
-"same here!"
-
-STYLE 2 - Enthusiastic:
-"YESS!! Your excitement is contagious! 🔥"
-"Love this comment!! You get it! 💯"
-"THIS is it!! 😍"
-"Exactly what I was thinking! 🙌"
-
-STYLE 3 - Chill & Casual:
-"haha yeah totally"
-"for real though"
-"ngl this is a mood"
-"honestly same"
-"I feel you on this"
+{COMPACT_RESPONSE_STYLE_GUIDE if self.compact_prompts else RESPONSE_STYLE_GUIDE}
 
-STYLE 4 - Supportive (Teacher-ish but human):
-"Love the enthusiasm! Quick tip: try 'want to' instead of 'wanna' for formal writing 💡"
-"Great energy! Btw, 'helpful' has one L at the end 😊"
-"You're getting there! Maybe add a bit more detail next time?"
-"Nice! Just a heads up - consider adding what you liked specifically"
+For "{user_comment}" about "{video_title}":
+Write ONE natural response. Be human. Be real. Mix it up!
 
-STYLE 5 - Just Vibing:
-"the :)) made me smile 😊"
-"your energy >>> 🔥"
-"this comment has good vibes"
-"love the simplicity"
-"straight to the point, respect"
+Just write the comment. No explanation. No quotes."""
 
-STYLE 6 - Relatable:
-"omg same though"
-"literally me"
-"why is this so true 💀"
-"facts"
-"big mood"
+    def _build_batch_response_prompt(
+        self,
+        user_comment: str,
+        score: int,
+        mistakes: List[str],
+        video_title: str,
+        count: int
+    ) -> str:
+        """Prompt for several replies in one call; the style guide is sent once."""
+        suggestions_text = "\n".join([f"- {s}" for s in mistakes]) if mistakes else "None"
+        persona_examples = ", ".join(random.sample(self.ai_authors, min(6, len(self.ai_authors))))
 
-STYLE 7 - Questioning/Engaging:
-"wait did you try it??"
-"right?? so good!"
-"are you gonna make this?"
-"same! did you see the part where...?"
+        return f"""You're simulating {count} DIFFERENT people commenting on a YouTube video about "{video_title}". The user commented: "{user_comment}"
 
-YOUR RESPONSE GUIDELINES:
-1. Pick a random style that fits the score
-2. Keep it natural - how YOU would actually comment
-3. DIVERSE EMOJI - don't repeat! Pick from: 😊🔥💯💡👍😅💪🌟✨👌😂💀🙌
-4. Vary sentence length (3-20 words usually)
-5. Match their energy level
-6. If tips needed, weave them in naturally
-7. DON'T use the same structure as other AIs
-8. Sound like a real person scrolling and reacting
-9. Be genuine - not fake enthusiastic
+Each person replies to the user naturally, like a real viewer would. BE DIVERSE AND HUMAN-LIKE!
 
-Score Guidelines:
-- 80+: Be excited! Short or enthusiastic works
-- 60-79: Supportive, maybe gentle tip
-- 40-59: Encouraging but mention they can improve
-- 20-39: BE HONEST - it's meaningless, guide them to add context
-  * Don't be overly encouraging for "hihi" or "lol" alone
-  * Be friendly but direct: "add what you thought!"
-  * Don't give them high praise for random noise
+User's score: {score}/100
+Tips for them: {suggestions_text}
 
-CRITICAL FOR LOW SCORES (20-39):
-These are meaningless comments like "hihi", "lol", "hehe" with NO context.
-- DON'T say "love this!" or "great!" - it's not great, it's random
-- DO be honest: "try adding what you liked", "what did you think?"
-- Keep it short and direct
-- Examples:
-  * "add some context next time!"
-  * "what did you think tho?"
-  * "lol but about what?"
-  * "try saying what you liked 💡"
+{COMPACT_RESPONSE_STYLE_GUIDE if self.compact_prompts else RESPONSE_STYLE_GUIDE}
 
-For "{user_comment}" about "{video_title}":
-Write ONE natural response. Be human. Be real. Mix it up!
+BATCH RULES:
+1. Write exactly {count} replies, each in a DIFFERENT style from the list above
+2. Each reply comes from a different person with their own username (casual handles like: {persona_examples})
+3. No two replies may start the same way or reuse the same emoji
+4. All replies must follow the score guidelines above
 
-Just write the comment. No explanation. No quotes."""
+[Output Format]
+Return ONLY valid JSON (no markdown):
+{{
+  "replies": [
+    {{"authorName": "<username>", "aiComment": "<the reply text, no quotes>"}}
+  ]
+}}"""
 
-    def explain_comment(
+    async def explain_comment(
         self,
         comment_text: str,
         video_title: str,
@@ -548,10 +1305,18 @@ Just write the comment. No explanation. No quotes."""
     ) -> Dict:
         """
         Explain a comment in a friendly, conversational way.
+        Near-duplicates of an already explained comment on the same video reuse its explanation.
         """
         if detected_slang is None:
             detected_slang = []
 
+        near_scope = None
+        if self.near_duplicates:
+            near_scope = self._near_duplicate_scope("explain", video_title, video_description)
+            match = self.near_duplicates.lookup(near_scope, comment_text)
+            if match:
+                return dict(match[0])
+
         prompt = self._build_explanation_prompt(
             comment_text,
             video_title,
@@ -560,27 +1325,194 @@ Just write the comment. No explanation. No quotes."""
         )
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                model=self.model,
-                temperature=0.7,
-                max_tokens=600
+            explanation = await self._structured_completion(
+                prompt, ExplanationOutput, temperature=0.7, max_tokens=600, task="explain"
             )
+            explanation_data = explanation.model_dump()
 
-            response_text = response.choices[0].message.content.strip()
-            explanation_data = self._parse_json_response(response_text)
-
+            if near_scope:
+                self.near_duplicates.add(near_scope, comment_text, dict(explanation_data))
             return explanation_data
 
+        except LLMOutputError:
+            raise
         except Exception as e:
             print(f"Error in explain_comment: {e}")
-            return {
-                "translation": "This is a friendly comment expressing interest in the video! 😊",
-                "slangBreakdown": []
-            }
+            return self._fallback_explanation()
+
+    async def stream_explanation(
+        self,
+        comment_text: str,
+        video_title: str,
+        video_description: str,
+        detected_slang: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of explain_comment. Yields {"type": "delta", "text": ...} pieces of the
+        translation as they arrive, then {"type": "explanation", "explanation": {...}} with the
+        full result. Near-duplicate hits yield only the final event.
+        """
+        near_scope = None
+        if self.near_duplicates:
+            near_scope = self._near_duplicate_scope("explain", video_title, video_description)
+            match = self.near_duplicates.lookup(near_scope, comment_text)
+            if match:
+                yield {"type": "explanation", "explanation": dict(match[0])}
+                return
+
+        prompt = self._build_explanation_prompt(
+            comment_text,
+            video_title,
+            video_description,
+            detected_slang or []
+        )
+
+        buffer = ""
+        sent = ""
+        try:
+            async for delta in self._chat_completion_stream(prompt, temperature=0.7, max_tokens=600, task="explain"):
+                buffer += delta
+                translation = self._partial_json_string(buffer, "translation")
+                if translation and len(translation) > len(sent):
+                    yield {"type": "delta", "text": translation[len(sent):]}
+                    sent = translation
+
+            explanation = await self._validate_or_repair(buffer, ExplanationOutput, "explain", max_tokens=600)
+            explanation_data = explanation.model_dump()
+            if near_scope:
+                self.near_duplicates.add(near_scope, comment_text, dict(explanation_data))
+        except LLMOutputError:
+            raise
+        except Exception as e:
+            print(f"Error in stream_explanation: {e}")
+            explanation_data = self._fallback_explanation()
+
+        yield {"type": "explanation", "explanation": explanation_data}
+
+    @staticmethod
+    def _partial_json_string(text: str, key: str) -> Optional[str]:
+        """Decoded prefix of a (possibly still streaming) JSON string value, e.g. "translation"."""
+        match = re.search(r'"' + re.escape(key) + r'"\s*:\s*"', text)
+        if not match:
+            return None
+
+        end = match.end()
+        escaped = False
+        while end < len(text):
+            char = text[end]
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                break
+            end += 1
+
+        body = text[match.end():end]
+        # Trim a trailing escape sequence that hasn't fully arrived yet (e.g. "\u00")
+        for trim in range(0, 7):
+            try:
+                return json.loads('"' + body[:len(body) - trim] + '"')
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    def _fallback_explanation(self) -> Dict:
+        """Placeholder explanation used when the LLM call or its output fails."""
+        return {
+            "translation": "This is a friendly comment expressing interest in the video! 😊",
+            "slangBreakdown": []
+        }
+
+    async def explain_comments_batch(
+        self,
+        video_title: str,
+        video_description: str,
+        comments: List[Dict]
+    ) -> Dict[str, Dict]:
+        """
+        Explain several comments from the same video in ONE chat completion.
+        `comments` are dicts with comment_id, text and detected_slang.
+        Returns {comment_id: explanation} for the explanations that came back usable.
+        """
+        if not comments:
+            return {}
+
+        prompt = self._build_batch_explanation_prompt(video_title, video_description, comments)
+        try:
+            output = await self._structured_completion(
+                prompt, ExplanationsOutput, temperature=0.7, max_tokens=350 * len(comments) + 100,
+                timeout=self.request_timeout * 2, task="explain_batch"
+            )
+        except Exception as e:
+            print(f"Error in explain_comments_batch: {e!r}")
+            return {}
+
+        results = {}
+        for item in output.explanations:
+            index = item.id - 1
+            if 0 <= index < len(comments) and item.translation:
+                results[comments[index]["comment_id"]] = item.model_dump(exclude={"id"})
+        return results
+
+    def _build_batch_explanation_prompt(
+        self,
+        video_title: str,
+        video_description: str,
+        comments: List[Dict]
+    ) -> str:
+        """Build the multi-comment variant of the explanation prompt."""
+        video_description = compact_description(video_description, self.description_token_budget)
+
+        numbered = "\n".join(
+            f'{i}. "{c["text"]}" (detected slang: {", ".join(c.get("detected_slang") or []) or "none detected"})'
+            for i, c in enumerate(comments, 1)
+        )
+
+        return f"""You're helping someone understand YouTube comments! Be friendly and conversational.
+
+[Video Context]
+Video Title: {video_title}
+Video Description: {video_description}
+
+[Comments to Explain]
+{numbered}
+
+For EACH comment:
+1. Explain what the commenter meant in simple, friendly language
+2. Break down any slang, emoticons, or unusual expressions
+3. Help them understand the vibe and meaning
+
+BE CONVERSATIONAL! Like explaining to a friend. Don't be robotic!
+
+IMPORTANT:
+- Emoticons (TuT, ^_^, >_<) are emotional expressions - explain the feeling!
+- Internet slang (omg, lol) is normal - explain casually!
+- Focus on the FEELING and INTENT, not just literal meaning
+
+[Output Format]
+Return ONLY valid JSON (no markdown), one entry per comment, using the comment's number as "id":
+{{
+  "explanations": [
+    {{
+      "id": 1,
+      "translation": "<explain the comment's meaning and vibe in friendly language>",
+      "slangBreakdown": [
+        {{
+          "term": "<word/expression/emoticon>",
+          "definition": "<what it means>",
+          "usage": "<how it's used here>"
+        }}
+      ]
+    }}
+  ]
+}}
+
+RULES:
+1. Keep it conversational and fun
+2. Translation should be 2-3 sentences explaining meaning + vibe
+3. Each definition: 1 friendly sentence
+4. Include emoticons in slangBreakdown if present!"""
 
     def _build_explanation_prompt(
         self,
@@ -590,6 +1522,7 @@ Just write the comment. No explanation. No quotes."""
         detected_slang: List[str]
     ) -> str:
         """Build friendly explanation prompt."""
+        video_description = compact_description(video_description, self.description_token_budget)
 
         slang_list = ", ".join(detected_slang) if detected_slang else "none detected"
 
@@ -638,139 +1571,210 @@ RULES:
 5. Include emoticons in slangBreakdown if present!
 6. Example: {{"term": "TuT", "definition": "A crying emoticon expressing sadness or disappointment", "usage": "Shows they really want to try it but maybe can't"}}"""
 
-    def suggest_related_slang(
+    async def define_word(
         self,
-        learned_terms: List[str],
-        slang_database: Dict
-    ) -> List[Dict]:
+        word: str,
+        context: str,
+        slang_dictionary: Optional[SlangDictionary] = None
+    ) -> Dict:
         """
-        Suggest related slang terms based on what user learned.
+        Define a word for a learner. Answer ladder: local slang dictionary,
+        then the persistent definition cache, then the LLM.
         """
-        if not learned_terms or not slang_database:
-            return []
+        return (await self.define_words([word], context, slang_dictionary))[word]
 
-        import random as rand
-        all_terms = list(slang_database.items())
-        sample_size = min(50, len(all_terms))
-        slang_sample = dict(rand.sample(all_terms, sample_size))
+    async def define_words(
+        self,
+        words: List[str],
+        context: str,
+        slang_dictionary: Optional[SlangDictionary] = None
+    ) -> Dict[str, Dict]:
+        """
+        Define several words from the same context (e.g. every unknown word in a comment).
+        Words not answered by the dictionary or cache are defined together in ONE LLM call.
+        Returns {word: {"word", "definition", "example", "source"}} for every requested word.
+        """
+        results: Dict[str, Dict] = {}
+        context_key = fingerprint(context)
+        missing = []
+
+        for word in dict.fromkeys(words):
+            normalized = normalize_text(word).lower()
+            entry = slang_dictionary.get(word) if slang_dictionary else None
+            if entry:
+                results[word] = {
+                    "word": word,
+                    "definition": entry.get("definition", ""),
+                    "example": entry.get("example", ""),
+                    "source": "dictionary"
+                }
+                continue
 
-        prompt = self._build_suggestion_prompt(learned_terms, slang_sample)
+            if self.response_cache:
+                cached = self.response_cache.get("define_word", self._definition_cache_key(normalized, context_key))
+                if cached:
+                    results[word] = dict(cached, word=word, source="cache")
+                    continue
+            missing.append(word)
+
+        if missing:
+            defined = await self._define_words_llm(missing, context)
+            for word in missing:
+                definition = defined.get(normalize_text(word).lower())
+                if definition:
+                    if self.response_cache:
+                        self.response_cache.set(
+                            "define_word",
+                            self._definition_cache_key(normalize_text(word).lower(), context_key),
+                            definition
+                        )
+                    results[word] = dict(definition, word=word, source="llm")
+                else:
+                    results[word] = {
+                        "word": word,
+                        "definition": "Definition not available",
+                        "example": "",
+                        "source": "none"
+                    }
+
+        return {word: results[word] for word in dict.fromkeys(words)}
+
+    async def _define_words_llm(self, words: List[str], context: str) -> Dict[str, Dict]:
+        """One LLM call for all words; returns {lowercased word: {"definition", "example"}}."""
+        if len(words) == 1:
+            prompt = self._build_definition_prompt(words[0], context)
+            schema, max_tokens = DefinitionItem, 200
+        else:
+            prompt = self._build_batch_definition_prompt(words, context)
+            schema, max_tokens = DefinitionsOutput, 80 * len(words) + 100
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                model=self.model,
-                temperature=0.8,
-                max_tokens=800
+            output = await self._structured_completion(
+                prompt, schema, temperature=0.7, max_tokens=max_tokens, task="define_word"
             )
-
-            response_text = response.choices[0].message.content.strip()
-            suggestions_data = self._parse_json_response(response_text)
-
-            if isinstance(suggestions_data, dict) and "suggestions" in suggestions_data:
-                suggestions = suggestions_data["suggestions"]
-            elif isinstance(suggestions_data, list):
-                suggestions = suggestions_data
-            else:
-                return []
-
-            learned_lower = set(term.lower() for term in learned_terms)
-            seen_terms = set()
-            filtered_suggestions = []
-
-            for suggestion in suggestions:
-                term = suggestion.get("term", "").lower()
-                if term not in learned_lower and term not in seen_terms:
-                    seen_terms.add(term)
-                    filtered_suggestions.append(suggestion)
-
-            return filtered_suggestions
-
         except Exception as e:
-            print(f"Error in suggest_related_slang: {e}")
-            return []
+            print(f"Error in define_words: {e!r}")
+            return {}
+
+        # A single-word reply is about the requested word, whatever it echoes back
+        items = [output.model_copy(update={"word": words[0]})] if schema is DefinitionItem else output.definitions
+        return {
+            normalize_text(item.word).lower(): {"definition": item.definition, "example": item.example}
+            for item in items
+            if item.definition
+        }
+
+    def _definition_cache_key(self, normalized_word: str, context_fingerprint: str) -> str:
+        """Definition cache key: (word, context fingerprint) + routed model + prompt version."""
+        return LLMResponseCache.make_key(
+            normalized_word,
+            context_fingerprint,
+            self.router.model_for("define_word"),
+            DEFINITION_PROMPT_VERSION
+        )
 
-    def _build_suggestion_prompt(
-        self,
-        learned_terms: List[str],
-        slang_database: Dict
-    ) -> str:
-        """Build suggestion prompt."""
-        learned_list = ", ".join(learned_terms)
+    def _build_definition_prompt(self, word: str, context: str) -> str:
+        """Build the single-word definition prompt."""
+        return f"""Define the word "{word}" in the context of the comment for someone learning English. 
+        
+Context: {context}
 
-        slang_entries = []
-        for term, info in slang_database.items():
-            definition = info.get('definition', 'No definition')
-            category = info.get('category', 'descriptive')
-            slang_entries.append(f"  - {term}: {definition} (category: {category})")
+Provide:
+1. A simple, clear definition (1-2 sentences)
+2. An example sentence using the word naturally
 
-        slang_db_text = "\n".join(slang_entries[:40])
+Format as JSON:
+{{
+  "word": "{word}",
+  "definition": "...",
+  "example": "..."
+}}"""
 
-        return f"""You're suggesting new slang terms for a learner to explore next!
+    def _build_batch_definition_prompt(self, words: List[str], context: str) -> str:
+        """Build the multi-word definition prompt."""
+        word_list = ", ".join(f'"{w}"' for w in words)
+        return f"""Define each of these words in the context of the comment for someone learning English: {word_list}
 
-[What They've Learned]
-{learned_list}
+Context: {context}
 
-[Available Slang Database]
-{slang_db_text}
+For EACH word provide:
+1. A simple, clear definition (1-2 sentences)
+2. An example sentence using the word naturally
 
-[Task]
-Suggest 6 slang terms that would be fun and useful to learn next.
+Format as JSON (one entry per word, spelled exactly as given):
+{{
+  "definitions": [
+    {{"word": "<word>", "definition": "...", "example": "..."}}
+  ]
+}}"""
+
+    async def write_suggestion_reasons(self, suggestions: List[Dict]) -> Dict[str, str]:
+        """
+        Friendly one-line "why learn this next" texts for recommended slang, in one call.
+        Each suggestion has term, definition, category and the local recommender's `basis`
+        (e.g. "often used with 'fr'"). Returns {normalize_key(term): reason}; terms missing from the reply
+        are left out. Errors propagate to the caller.
+        """
+        if not suggestions:
+            return {}
+        entries = "\n".join(
+            f"- {s['term']}: {s.get('definition', '')} (category: {s.get('category', '')}; why: {s['basis']})"
+            for s in suggestions
+        )
+        prompt = f"""A language learner is exploring English internet slang. These terms were picked for them
+to learn next. Write one short, friendly reason for each (max 15 words), based on the "why" note.
 
-Prioritize:
-1. Terms commonly used together with what they know
-2. Similar vibes or contexts
-3. Natural progression in difficulty
+[Suggested Terms]
+{entries}
 
 [Output Format]
 Return ONLY valid JSON (no markdown):
-{{
-  "suggestions": [
-    {{
-      "term": "<slang term>",
-      "definition": "<definition>",
-      "reason": "<why this is a good next step>",
-      "category": "<category>"
-    }}
-  ]
-}}
+{{"reasons": [{{"term": "<term>", "reason": "<reason>"}}]}}"""
 
-RULES:
-1. Suggest exactly 6 terms (or fewer if database small)
-2. Only suggest terms in the database
-3. Keep reasons friendly and encouraging
-4. Don't suggest already learned terms"""
+        output = await self._structured_completion(
+            prompt, SuggestionReasonsOutput, temperature=0.7,
+            max_tokens=40 * len(suggestions) + 50, task="suggest"
+        )
+        return {normalize_key(item.term): item.reason.strip() for item in output.reasons if item.reason.strip()}
 
     def _get_random_ai_author(self) -> str:
         """Get random AI author name."""
         return random.choice(self.ai_authors)
 
-    def _strip_markdown(self, text: str) -> str:
-        """Remove markdown formatting."""
-        import re
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*', '', text)
-        text = text.strip()
-        return text
-
-    def _fix_array_quotes(self, array_content: str) -> str:
-        """Fix quotes in array content."""
-        import re
-        items = re.findall(r'"([^"]*(?:"[^"]*"[^"]*)*)"', array_content)
-        fixed_items = []
-        for item in items:
-            fixed_item = item.replace('"', '\\"')
-            fixed_items.append(f'"{fixed_item}"')
-        return ', '.join(fixed_items) if fixed_items else array_content
-
-    def text_to_speech(
+    async def translate_segments(self, texts: List[str], target_language: str, task: str = "translate") -> List[str]:
+        """
+        Translate consecutive transcript segments in one call, keeping one translation per
+        segment so timings stay aligned. A segment missing from the reply keeps its original
+        text. Errors propagate to the caller. Background pre-translation passes
+        task="translate_background" so it queues behind user traffic and is accounted separately.
+        """
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        prompt = f"""Translate these numbered segments of a YouTube video transcript from English to {target_language}.
+Keep the translation natural and conversational. Translate each segment on its own so it
+still lines up with the video; a sentence may continue across segments.
+
+[Segments]
+{numbered}
+
+[Output Format]
+Return ONLY valid JSON (no markdown), one entry per segment, same ids:
+{{"segments": [{{"id": 1, "text": "<translation>"}}]}}"""
+
+        # Lower temp for more accurate translation; output runs a bit longer than the input
+        output = await self._structured_completion(
+            prompt, SegmentTranslationsOutput, temperature=0.5,
+            max_tokens=2 * estimate_tokens(numbered) + 15 * len(texts) + 100,
+            timeout=self.request_timeout * 2, task=task
+        )
+        translations = {item.id: item.text.strip() for item in output.segments if item.text.strip()}
+        return [translations.get(i, text) for i, text in enumerate(texts, 1)]
+
+    async def text_to_speech(
         self,
         text: str,
         voice: str = "Atlas-PlayAI",
-        audio_format: str = "mp3"
+        audio_format: str = "mp3",
+        task: str = "tts"
     ) -> bytes:
         """
         Convert text to speech using Groq's TTS API.
@@ -779,53 +1783,25 @@ RULES:
             text: Text to convert to speech
             voice: Voice model to use (default: Atlas-PlayAI)
             audio_format: Audio format (default: mp3)
+            task: Gateway task, for priority (default: tts)
 
         Returns:
             Audio bytes
         """
         try:
             # Groq TTS API call
-            response = self.client.audio.speech.create(
-                model="playai-tts",
-                voice=voice,
-                input=text,
-                response_format=audio_format
-            )
+            async with self.gateway.slot(task, "playai-tts"):
+                response = await self.client.audio.speech.create(
+                    model="playai-tts",
+                    voice=voice,
+                    input=text,
+                    response_format=audio_format
+                )
 
-            # Read the audio content
-            audio_bytes = response.read()
+                # Read the audio content
+                audio_bytes = await response.read()
             return audio_bytes
 
         except Exception as e:
             print(f"Error in text_to_speech: {e}")
             raise Exception(f"TTS generation failed: {str(e)}")
-
-    def _parse_json_response(self, response_text: str) -> Dict:
-        """Parse JSON with error handling."""
-        cleaned_text = self._strip_markdown(response_text)
-
-        try:
-            return json.loads(cleaned_text)
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-
-            try:
-                import re
-                fixed_text = re.sub(
-                    r'("(?:mistakes|suggestions|goodParts)":\s*\[)([^\]]+)(\])',
-                    lambda m: m.group(1) + self._fix_array_quotes(m.group(2)) + m.group(3),
-                    cleaned_text
-                )
-                return json.loads(fixed_text)
-            except Exception as e2:
-                print(f"JSON parsing fallback error: {e2}")
-
-            return {
-                "score": 70,
-                "grammarScore": 70,
-                "contextScore": 70,
-                "naturalnessScore": 70,
-                "correction": "Great job! 😊",
-                "mistakes": ["💡 Keep practicing!"],
-                "goodParts": ["✨ You're doing great!"]
-            }
\ No newline at end of file
@@ -0,0 +1,131 @@
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class HedgingPolicy:
+    """
+    Decides when an LLM call gets a duplicate ("hedge") request, and keeps the books on it.
+
+    A call for a hedged task that is still running the task's recent p90 latency after it got
+    its gateway slot gets one duplicate; the first reply wins and the other request is
+    cancelled. At most `budget_fraction` of a task's recent calls may be hedged (hedges still
+    in flight count against the budget), and nothing is hedged until `min_samples` latencies
+    have been seen.
+
+    Metrics compare the latency callers saw against what they would have seen without
+    hedging. When a hedge wins, the cancelled primary's latency is unknown; it's estimated as
+    the median of the task's recent latencies beyond the primary's elapsed time (or the
+    elapsed time itself if none were slower), so the unhedged p99 is an estimate.
+    """
+
+    def __init__(self, tasks: Iterable[str], budget_fraction: float = 0.05, percentile: float = 0.9,
+                 min_samples: int = 20, window: int = 200, min_delay: float = 0.05):
+        self.tasks = set(tasks)
+        self.budget_fraction = budget_fraction
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+
+        self._lock = threading.Lock()
+        # Latency of single requests that ran to completion (drives the hedge delay)
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        # Whether each recent call was hedged (drives the budget)
+        self._recent: Dict[str, Deque[bool]] = defaultdict(lambda: deque(maxlen=window))
+        self._hedges_in_flight: Dict[str, int] = defaultdict(int)
+        # Latency seen by the caller vs. (a lower bound of) the primary request's latency
+        self._observed: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=1000))
+        self._unhedged: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=1000))
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._hedged: Dict[str, int] = defaultdict(int)
+        self._hedge_wins: Dict[str, int] = defaultdict(int)
+        self._tokens: Dict[str, int] = defaultdict(int)
+        self._extra_tokens: Dict[str, int] = defaultdict(int)
+
+    def hedge_delay(self, task: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None if the task isn't hedged (yet)."""
+        if task not in self.tasks:
+            return None
+        with self._lock:
+            samples = self._samples[task]
+            if len(samples) < self.min_samples:
+                return None
+            return max(self.min_delay, self._percentile(samples, self.percentile))
+
+    def allow_hedge(self, task: str) -> bool:
+        """
+        Reserve one hedge if the task is still under its duplicate budget. The reservation is
+        released by record_call(hedged=True), or by release_hedge() if the call failed.
+        """
+        with self._lock:
+            recent = self._recent[task]
+            in_flight = self._hedges_in_flight[task]
+            if sum(recent) + in_flight + 1 > self.budget_fraction * (len(recent) + in_flight + 1):
+                return False
+            self._hedges_in_flight[task] += 1
+            return True
+
+    def release_hedge(self, task: str):
+        """Give back a reserved hedge whose call is not recorded."""
+        with self._lock:
+            self._hedges_in_flight[task] = max(0, self._hedges_in_flight[task] - 1)
+
+    def record_sample(self, task: str, latency: float):
+        """Latency of one request that completed (primary or hedge)."""
+        if task not in self.tasks:
+            return
+        with self._lock:
+            self._samples[task].append(latency)
+
+    def record_call(self, task: str, latency: float, primary_latency: float, tokens: int,
+                    hedged: bool = False, hedge_won: bool = False, extra_tokens: int = 0):
+        """
+        One finished call: the latency the caller saw, the primary request's latency (or its
+        elapsed time when it was cancelled), the winner's tokens and the duplicate's tokens.
+        """
+        if task not in self.tasks:
+            return
+        with self._lock:
+            if hedge_won:
+                slower = sorted(s for s in self._samples[task] if s > primary_latency)
+                if slower:
+                    primary_latency = slower[len(slower) // 2]
+            self._recent[task].append(hedged)
+            self._observed[task].append(latency)
+            self._unhedged[task].append(primary_latency)
+            self._calls[task] += 1
+            self._tokens[task] += tokens
+            if hedged:
+                self._hedges_in_flight[task] = max(0, self._hedges_in_flight[task] - 1)
+                self._hedged[task] += 1
+                self._extra_tokens[task] += extra_tokens
+                if hedge_won:
+                    self._hedge_wins[task] += 1
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            tasks = {}
+            for task in sorted(self.tasks | set(self._calls)):
+                calls = self._calls.get(task, 0)
+                samples = self._samples.get(task, ())
+                observed = list(self._observed.get(task, ()))
+                unhedged = list(self._unhedged.get(task, ()))
+                tokens = self._tokens.get(task, 0)
+                tasks[task] = {
+                    "calls": calls,
+                    "hedged": self._hedged.get(task, 0),
+                    "hedge_rate": round(self._hedged.get(task, 0) / calls, 4) if calls else 0.0,
+                    "hedge_wins": self._hedge_wins.get(task, 0),
+                    "hedge_delay": (round(max(self.min_delay, self._percentile(samples, self.percentile)), 3)
+                                    if len(samples) >= self.min_samples else None),
+                    "latency_p99": round(self._percentile(observed, 0.99), 3) if observed else None,
+                    "latency_p99_unhedged": round(self._percentile(unhedged, 0.99), 3) if unhedged else None,
+                    "extra_tokens": self._extra_tokens.get(task, 0),
+                    "extra_token_fraction": round(self._extra_tokens.get(task, 0) / tokens, 4) if tokens else 0.0
+                }
+            return {"budget_fraction": self.budget_fraction, "tasks": tasks}
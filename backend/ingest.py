@@ -0,0 +1,276 @@
+"""
+Headless batch ingestion for the video cache.
+
+Fetches Shorts + top comments for a list of topics concurrently and writes them
+straight into VideoDatabase in batches. Progress is checkpointed to a JSON file
+so an interrupted run resumes without repeating finished API calls. Transcript
+availability is probed for each written batch so the UI knows which videos can be translated.
+
+Usage:
+    python ingest.py --topics "gaming,food review" --shorts-per-topic 30
+    python ingest.py --topics-file topics.txt --workers 4 --ndjson seed.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, TextIO
+
+from dotenv import load_dotenv
+
+from database import VideoDatabase
+from slang_dictionary import SlangDictionary
+from transcripts import TranscriptCache
+from youtube_fetcher import YouTubeShortsSlangFetcher
+
+COMMENTS_PER_SHORT = 30  # Matches the fixed value used by the API server's cache keys
+
+
+class IngestCheckpoint:
+    """
+    JSON checkpoint of per-topic progress.
+
+    Each topic records the videos found by search (so search is never repeated)
+    and the video ids whose comments have already been fetched and saved.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state: Dict[str, Dict] = {"topics": {}}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def topic(self, topic: str) -> Dict:
+        with self.lock:
+            return self.state["topics"].setdefault(topic, {
+                "search_done": False,
+                "videos": [],
+                "done_video_ids": [],
+                "completed": False
+            })
+
+    def update_topic(self, topic: str, **fields):
+        with self.lock:
+            self.state["topics"].setdefault(topic, {}).update(fields)
+            self._save()
+
+    def mark_videos_done(self, topic: str, video_ids: List[str]):
+        with self.lock:
+            entry = self.state["topics"][topic]
+            entry["done_video_ids"] = entry.get("done_video_ids", []) + video_ids
+            self._save()
+
+    def _save(self):
+        # Write-then-rename so a crash mid-write never corrupts the checkpoint
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ingest-")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class BatchIngestor:
+    """Runs topic ingestion concurrently against one fetcher and one database."""
+
+    def __init__(self, fetcher: YouTubeShortsSlangFetcher, db: VideoDatabase,
+                 checkpoint: IngestCheckpoint, shorts_per_topic: int = 15,
+                 batch_size: int = 10, cache_hours: int = 72,
+                 ndjson_out: Optional[TextIO] = None,
+                 slang_dictionary: Optional[SlangDictionary] = None,
+                 transcript_cache: Optional[TranscriptCache] = None):
+        self.fetcher = fetcher
+        self.db = db
+        self.checkpoint = checkpoint
+        self.shorts_per_topic = shorts_per_topic
+        self.batch_size = batch_size
+        self.cache_hours = cache_hours
+        self.ndjson_out = ndjson_out
+        self.slang_dictionary = slang_dictionary
+        self.transcript_cache = transcript_cache
+
+        self.write_lock = threading.Lock()
+        self.seen_lock = threading.Lock()
+        self.seen_video_ids = set()
+
+    def run(self, topics: List[str], workers: int = 4) -> Dict[str, int]:
+        """Ingest all topics and return the number of videos saved per topic."""
+        # Videos already assigned to a topic in an earlier run keep their owner
+        for topic in topics:
+            self.seen_video_ids.update(v['video_id'] for v in self.checkpoint.topic(topic)["videos"])
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(topics)))) as executor:
+            future_to_topic = {executor.submit(self.ingest_topic, topic): topic for topic in topics}
+            for future in as_completed(future_to_topic):
+                topic = future_to_topic[future]
+                try:
+                    results[topic] = future.result()
+                except Exception as e:
+                    print(f"   ❌ Topic '{topic}' failed: {e} (progress kept in checkpoint)")
+                    results[topic] = 0
+        return results
+
+    def ingest_topic(self, topic: str) -> int:
+        state = self.checkpoint.topic(topic)
+        if state.get("completed"):
+            print(f"   ⏭️ '{topic}' already ingested, skipping")
+            return 0
+
+        if not state.get("search_done"):
+            videos = self._search_topic(topic)
+            self.checkpoint.update_topic(topic, search_done=True, videos=videos)
+        else:
+            videos = state["videos"]
+            print(f"   ↩️ Resuming '{topic}' ({len(state['done_video_ids'])}/{len(videos)} videos done)")
+
+        done = set(state.get("done_video_ids", []))
+        pending = [v for v in videos if v['video_id'] not in done]
+        saved = 0
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            comments_dict = self.fetcher.fetch_comments_parallel([v['video_id'] for v in batch])
+            for video in batch:
+                video['top_comments'] = comments_dict.get(video['video_id'], [])
+
+            self._write_batch(batch)
+            self.checkpoint.mark_videos_done(topic, [v['video_id'] for v in batch])
+            saved += len(batch)
+            print(f"   💾 '{topic}': saved {len(done) + saved}/{len(videos)} videos")
+
+        self.db.record_cache_entry(
+            topics=[topic],
+            custom_slang=[],
+            shorts_per_topic=self.shorts_per_topic,
+            comments_per_short=COMMENTS_PER_SHORT,
+            cache_hours=self.cache_hours
+        )
+        self.checkpoint.update_topic(topic, completed=True)
+        return saved
+
+    def _search_topic(self, topic: str) -> List[Dict]:
+        """Page through search results until shorts_per_topic new videos are found."""
+        print(f"\n🔍 Searching '{topic}' (target: {self.shorts_per_topic} shorts)...")
+        videos = []
+        next_page_token = None
+        max_pages = min(max(1, (self.shorts_per_topic + 49) // 50), 3)
+
+        for _ in range(max_pages):
+            results_per_page = min(self.shorts_per_topic - len(videos), 50)
+            if results_per_page <= 0:
+                break
+            page, next_page_token = self.fetcher.search_shorts(
+                topic, max_results=results_per_page, page_token=next_page_token
+            )
+            with self.seen_lock:
+                for video in page:
+                    if video['video_id'] not in self.seen_video_ids:
+                        self.seen_video_ids.add(video['video_id'])
+                        videos.append(video)
+            if not next_page_token:
+                break
+
+        print(f"   Found {len(videos)} new shorts for '{topic}'")
+        return videos
+
+    def _write_batch(self, batch: List[Dict]):
+        if self.slang_dictionary:
+            self.slang_dictionary.matcher().annotate_videos(batch)
+        with self.write_lock:
+            self.db.save_videos(batch)
+            if self.ndjson_out:
+                for video in batch:
+                    self.ndjson_out.write(json.dumps(video, ensure_ascii=False) + "\n")
+                self.ndjson_out.flush()
+        if self.transcript_cache:
+            self.transcript_cache.probe([v['video_id'] for v in batch])
+
+
+def read_topics(topics_arg: Optional[str], topics_file: Optional[str]) -> List[str]:
+    """Merge comma-separated --topics with a one-per-line --topics-file (# comments allowed)."""
+    topics = []
+    if topics_arg:
+        topics.extend(t.strip() for t in topics_arg.split(','))
+    if topics_file:
+        with open(topics_file, 'r', encoding='utf-8') as f:
+            topics.extend(line.split('#', 1)[0].strip() for line in f)
+
+    unique = []
+    for topic in topics:
+        if topic and topic not in unique:
+            unique.append(topic)
+    return unique
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-seed the video cache from YouTube")
+    parser.add_argument('--topics', help="Comma-separated topics")
+    parser.add_argument('--topics-file', help="File with one topic per line")
+    parser.add_argument('--shorts-per-topic', type=int, default=15)
+    parser.add_argument('--workers', type=int, default=4, help="Topics fetched concurrently")
+    parser.add_argument('--batch-size', type=int, default=10, help="Videos written per DB batch")
+    parser.add_argument('--cache-hours', type=int, default=72)
+    parser.add_argument('--db', default="videos_cache.db")
+    parser.add_argument('--checkpoint', default="ingest_checkpoint.json")
+    parser.add_argument('--ndjson', help="Also stream saved videos as NDJSON to this file ('-' for stdout)")
+    parser.add_argument('--reset', action='store_true', help="Ignore and overwrite an existing checkpoint")
+    parser.add_argument('--skip-transcripts', action='store_true', help="Don't probe transcript availability")
+    args = parser.parse_args(argv)
+
+    topics = read_topics(args.topics, args.topics_file)
+    if not topics:
+        parser.error("no topics given (use --topics and/or --topics-file)")
+
+    load_dotenv()
+    api_key = os.getenv('YOUTUBE_API_KEY')
+    if not api_key:
+        print("❌ YOUTUBE_API_KEY missing")
+        return 1
+
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    ndjson_out = None
+    if args.ndjson == '-':
+        # Keep stdout clean for NDJSON; progress logs go to stderr
+        ndjson_out = sys.stdout
+        sys.stdout = sys.stderr
+    elif args.ndjson:
+        ndjson_out = open(args.ndjson, 'a', encoding='utf-8')
+
+    db = VideoDatabase(args.db)
+    ingestor = BatchIngestor(
+        fetcher=YouTubeShortsSlangFetcher(api_key),
+        db=db,
+        checkpoint=IngestCheckpoint(args.checkpoint),
+        shorts_per_topic=args.shorts_per_topic,
+        batch_size=args.batch_size,
+        cache_hours=args.cache_hours,
+        ndjson_out=ndjson_out,
+        slang_dictionary=SlangDictionary(),
+        transcript_cache=None if args.skip_transcripts else TranscriptCache(
+            db, negative_ttl_hours=float(os.getenv('TRANSCRIPT_NEGATIVE_TTL_HOURS', '24')))
+    )
+
+    start_time = time.time()
+    try:
+        results = ingestor.run(topics, workers=args.workers)
+    finally:
+        if ndjson_out and args.ndjson != '-':
+            ndjson_out.close()
+
+    print(f"\n⏱️ Ingestion finished in {time.time() - start_time:.1f}s")
+    for topic, count in results.items():
+        print(f"   {topic}: {count} videos saved this run")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def fingerprint(text: str) -> str:
+    """Short stable hash of (normalized) text, for long fields like video descriptions."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """
+    Persistent cache for LLM results, keyed per namespace (e.g. "evaluate").
+
+    Entries expire after a TTL, and the table is bounded by max_entries with
+    least-recently-used eviction. Hit/miss counters are kept per namespace
+    since process start.
+    """
+
+    def __init__(self, db_path: str = "llm_cache.db", ttl_hours: float = 24 * 7,
+                 max_entries: int = 50000, prune_every: int = 200):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self.init_database()
+
+    def init_database(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                namespace TEXT,
+                cache_key TEXT,
+                value TEXT,
+                created_at REAL,
+                expires_at REAL,
+                last_accessed REAL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_cache (last_accessed)')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable key from any JSON-serializable parts."""
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time.time()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT value FROM llm_cache
+            WHERE namespace = ? AND cache_key = ? AND expires_at > ?
+        ''', (namespace, key, now))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute('''
+                UPDATE llm_cache SET last_accessed = ? WHERE namespace = ? AND cache_key = ?
+            ''', (now, namespace, key))
+            conn.commit()
+        conn.close()
+
+        with self._lock:
+            if row:
+                self._hits[namespace] += 1
+            else:
+                self._misses[namespace] += 1
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO llm_cache
+            (namespace, cache_key, value, created_at, expires_at, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (namespace, key, json.dumps(value, ensure_ascii=False), now, expires_at, now))
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= self.prune_every
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (time.time(),))
+        cursor.execute('''
+            DELETE FROM llm_cache WHERE rowid IN (
+                SELECT rowid FROM llm_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+        conn.commit()
+        conn.close()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-namespace entry counts and hit rates."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT namespace, COUNT(*) FROM llm_cache GROUP BY namespace')
+        entries = dict(cursor.fetchall())
+        conn.close()
+
+        with self._lock:
+            namespaces = set(entries) | set(self._hits) | set(self._misses)
+            result = {}
+            for namespace in sorted(namespaces):
+                hits = self._hits.get(namespace, 0)
+                misses = self._misses.get(namespace, 0)
+                lookups = hits + misses
+                result[namespace] = {
+                    "entries": entries.get(namespace, 0),
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+                }
+        return result
@@ -0,0 +1,369 @@
+import asyncio
+import bisect
+import itertools
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from groq import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from model_router import base_task
+
+# task -> (priority, seconds it may wait for a slot before it is shed); lower priority runs first
+TASK_PRIORITIES = {
+    "evaluate": (0, 15.0),
+    "respond": (1, 4.0),
+    "respond_batch": (1, 4.0),
+    "explain": (2, 6.0),
+    "define_word": (2, 4.0),
+    "suggest": (3, 3.0),
+    "translate": (3, 20.0),
+    "tts": (3, 10.0),
+    "explain_batch": (4, 30.0),  # background precompute
+    "translate_background": (4, 60.0),  # idle-time pre-translation
+    "tts_background": (4, 60.0),  # audio for idle-time pre-translation
+}
+DEFAULT_PRIORITY = (3, 5.0)
+
+# Provider limits per model as (requests/minute, tokens/minute); models not listed are only
+# bounded by the concurrency limit. Defaults are Groq's free-tier limits.
+DEFAULT_RATE_LIMITS = {
+    "llama-3.3-70b-versatile": (30, 12000),
+    "llama-3.1-8b-instant": (30, 6000),
+}
+
+
+class LLMUnavailableError(Exception):
+    """The gateway refused the call without sending it; callers fall back right away."""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds until a retry is worth trying
+
+
+class LLMOverloadedError(LLMUnavailableError):
+    """Shed under load: no slot within the task's queue-wait budget."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """The model's circuit breaker is open after repeated failures."""
+
+
+def parse_rate_limits(spec: Optional[str]) -> Dict[str, Tuple[int, int]]:
+    """Parse "model=rpm/tpm,model=rpm/tpm" (e.g. from an env var)."""
+    limits = {}
+    for part in (spec or "").split(","):
+        model, _, value = part.partition("=")
+        rpm, _, tpm = value.partition("/")
+        if model.strip() and rpm.strip() and tpm.strip():
+            limits[model.strip()] = (int(rpm), int(tpm))
+    return limits
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute up to one minute's worth; can go into debt on settle."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self.refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def consume(self, amount: float):
+        self.level -= amount
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; lets trial calls through after `reset_seconds`."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def seconds_until_trial(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            # A failed trial call re-opens for another full reset window
+            if self.opened_at is None:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    tokens: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class Lease:
+    """Handed to the caller for the duration of a call; set used_tokens to settle the estimate."""
+
+    def __init__(self, model: str, estimated_tokens: float):
+        self.model = model
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+
+
+class LLMGateway:
+    """
+    Single entry point for LLM calls.
+
+    - concurrency limit shared by all calls, handed out in priority order (evaluate > respond
+      > explain > suggest, see TASK_PRIORITIES)
+    - per-model request and token buckets matching the provider's limits; a 429 pauses the
+      model's bucket for the Retry-After period
+    - load shedding: a call that can't get a slot within its task's wait budget, or arrives to
+      a queue that is already `max_queue` deep, fails fast with LLMOverloadedError
+    - a circuit breaker per model, counting 429s, 5xx, timeouts and connection errors
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 64,
+                 rate_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self._active = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_busy = time.monotonic()
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        self._admitted: Dict[str, int] = defaultdict(int)
+        self._shed: Dict[str, int] = defaultdict(int)
+        self._rejected_open: Dict[str, int] = defaultdict(int)
+        self._queue_wait: Dict[str, float] = defaultdict(float)
+
+    # --- Per-model state ---
+
+    def _buckets(self, model: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        limits = self.rate_limits.get(model)
+        if not limits:
+            return None, None
+        if model not in self._request_buckets:
+            self._request_buckets[model] = TokenBucket(limits[0])
+            self._token_buckets[model] = TokenBucket(limits[1])
+        return self._request_buckets[model], self._token_buckets[model]
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+        return self._breakers[model]
+
+    def is_available(self, model: str) -> bool:
+        """False while the model's circuit breaker is open."""
+        return self.breaker(model).allow()
+
+    def queued(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    def is_idle(self, for_seconds: float = 0.0) -> bool:
+        """True if no call is running or queued, and none has been for `for_seconds`."""
+        if self._active or self._waiters:
+            return False
+        return time.monotonic() - self._last_busy >= for_seconds
+
+    # --- Admission ---
+
+    def _dispatch(self):
+        """Admit waiters in priority order while there are free slots and rate budget."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        next_wake = None
+        blocked_models = set()
+        for waiter in list(self._waiters):
+            if self._active >= self.max_concurrency:
+                break
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            # Keep priority order within a model; other models may still go ahead
+            if waiter.model in blocked_models:
+                continue
+            requests, tokens = self._buckets(waiter.model)
+            wait = max(requests.wait_time(1, now), tokens.wait_time(waiter.tokens, now)) if requests else 0.0
+            if wait > 0:
+                blocked_models.add(waiter.model)
+                next_wake = wait if next_wake is None else min(next_wake, wait)
+                continue
+            if requests:
+                requests.consume(1)
+                tokens.consume(waiter.tokens)
+            self._active += 1
+            self._waiters.remove(waiter)
+            waiter.future.set_result(None)
+        if next_wake is not None and self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(next_wake, self._dispatch)
+
+    async def _acquire(self, task: str, model: str, tokens: float):
+        priority, max_wait = TASK_PRIORITIES.get(base_task(task), DEFAULT_PRIORITY)
+        breaker = self.breaker(model)
+        if not breaker.allow():
+            self._rejected_open[task] += 1
+            raise CircuitOpenError(f"{task}: circuit open for {model}", retry_after=breaker.seconds_until_trial())
+        if sum(1 for w in self._waiters if w.priority <= priority) >= self.max_queue:
+            self._shed[task] += 1
+            raise LLMOverloadedError(f"{task}: LLM queue full")
+
+        waiter = _Waiter(priority, next(self._seq), model, tokens, asyncio.get_running_loop().create_future())
+        bisect.insort(self._waiters, waiter)
+        start_time = time.monotonic()
+        self._dispatch()
+        try:
+            await asyncio.wait({waiter.future}, timeout=max_wait)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.future.done():
+            self._abandon(waiter)
+            self._shed[task] += 1
+            raise LLMOverloadedError(f"{task}: no LLM slot within {max_wait:.0f}s")
+        self._admitted[task] += 1
+        self._queue_wait[task] += time.monotonic() - start_time
+
+    def _abandon(self, waiter: _Waiter):
+        """Withdraw a waiter; if it was admitted in the meantime, give its slot back."""
+        if waiter.future.done():
+            self._release()
+        else:
+            waiter.future.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _release(self):
+        self._active -= 1
+        self._last_busy = time.monotonic()
+        self._dispatch()
+
+    # --- Outcomes ---
+
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> float:
+        try:
+            return float(error.response.headers.get("retry-after", 1))
+        except (AttributeError, TypeError, ValueError):
+            return 1.0
+
+    def _record_outcome(self, model: str, error: Optional[BaseException]):
+        if error is None:
+            self.breaker(model).record_success()
+            return
+        if isinstance(error, RateLimitError):
+            for bucket in self._buckets(model):
+                if bucket:
+                    bucket.pause(self._retry_after(error))
+        # Only provider-side trouble counts against the model; bad requests don't
+        if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError, asyncio.TimeoutError)) or (
+                isinstance(error, APIStatusError) and error.status_code >= 500):
+            breaker = self.breaker(model)
+            was_open = breaker.state != "closed"
+            breaker.record_failure()
+            if not was_open and breaker.state != "closed":
+                print(f"🚧 Circuit opened for {model} after {breaker.failures} failures")
+
+    @asynccontextmanager
+    async def slot(self, task: str, model: str, estimated_tokens: float = 0):
+        """
+        Hold one admitted call for `task` on `model` (including a whole stream).
+        Raises LLMUnavailableError if the call is shed or the model's breaker is open.
+        """
+        await self._acquire(task, model, estimated_tokens)
+        lease = Lease(model, estimated_tokens)
+        try:
+            yield lease
+        except BaseException as e:
+            if not isinstance(e, (asyncio.CancelledError, GeneratorExit)):
+                self._record_outcome(model, e)
+            raise
+        else:
+            self._record_outcome(model, None)
+        finally:
+            if lease.used_tokens is not None:
+                _, tokens = self._buckets(model)
+                if tokens:
+                    tokens.consume(lease.used_tokens - estimated_tokens)
+            self._release()
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        tasks = {}
+        for task in sorted(set(self._admitted) | set(self._shed) | set(self._rejected_open)):
+            admitted = self._admitted.get(task, 0)
+            tasks[task] = {
+                "admitted": admitted,
+                "shed": self._shed.get(task, 0),
+                "rejected_circuit_open": self._rejected_open.get(task, 0),
+                "avg_queue_wait": round(self._queue_wait.get(task, 0.0) / admitted, 3) if admitted else 0.0
+            }
+        models = {}
+        for model in sorted(set(self._breakers) | set(self._request_buckets)):
+            requests, tokens = self._buckets(model)
+            for bucket in (requests, tokens):
+                if bucket:
+                    bucket.refill(now)
+            breaker = self.breaker(model)
+            models[model] = {
+                "circuit": breaker.state,
+                "consecutive_failures": breaker.failures,
+                "times_opened": breaker.times_opened,
+                "requests_available": round(requests.level, 1) if requests else None,
+                "tokens_available": round(tokens.level) if tokens else None
+            }
+        return {
+            "active": self._active,
+            "queued": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "tasks": tasks,
+            "models": models
+        }
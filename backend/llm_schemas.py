@@ -0,0 +1,231 @@
+import json
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ValidationError, field_validator
+
+
+class LLMOutputError(Exception):
+    """The LLM's reply could not be turned into the expected structure, even after a repair attempt."""
+
+
+# --- Tolerant JSON extraction ---
+
+def _next_significant(text: str, start: int) -> str:
+    for i in range(start, len(text)):
+        if not text[i].isspace():
+            return text[i]
+    return ""
+
+
+def parse_llm_json(text: str) -> Optional[Any]:
+    """
+    Extract the first JSON object/array from an LLM reply in one pass, tolerating the usual damage:
+    markdown fences and chatter around it, raw newlines/tabs inside strings, unescaped inner
+    quotes ("use "want to" here"), trailing commas and a missing closing bracket at the end.
+    Returns None if nothing parseable is found.
+    """
+    if not text:
+        return None
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+
+    out = []
+    stack = []
+    in_string = False
+    escaped = False
+    i = min(starts)
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(char)
+            elif char == "\\":
+                escaped = True
+                out.append(char)
+            elif char == '"':
+                # A quote only closes the string if JSON structure follows it
+                if _next_significant(text, i + 1) in (",", ":", "}", "]", ""):
+                    in_string = False
+                    out.append(char)
+                else:
+                    out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            elif char == "\t":
+                out.append("\\t")
+            elif char == "\r":
+                pass
+            else:
+                out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            # Drop a trailing comma before the closing bracket
+            while out and (out[-1].isspace() or out[-1] == ","):
+                out.pop()
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break
+        else:
+            out.append(char)
+        i += 1
+
+    # Truncated reply: close whatever is still open
+    if in_string:
+        out.append('"')
+    while stack:
+        while out and (out[-1].isspace() or out[-1] == ","):
+            out.pop()
+        out.append(stack.pop())
+
+    try:
+        return json.loads("".join(out))
+    except json.JSONDecodeError:
+        return None
+
+
+# --- Output schemas ---
+
+def _as_str_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    return [str(v) for v in value if v is not None and str(v).strip()]
+
+
+def _valid_items(model, values: Any) -> List:
+    """Validate list items one by one, dropping the ones that don't fit instead of failing the batch."""
+    if not isinstance(values, list):
+        return []
+    items = []
+    for value in values:
+        try:
+            items.append(model.model_validate(value))
+        except ValidationError:
+            continue
+    return items
+
+
+def _score(value: Any) -> int:
+    return max(0, min(100, int(round(float(value)))))
+
+
+class EvaluationOutput(BaseModel):
+    score: int
+    grammarScore: Optional[int] = None
+    contextScore: Optional[int] = None
+    naturalnessScore: Optional[int] = None
+    correction: str = ""
+    mistakes: List[str] = []
+    goodParts: List[str] = []
+
+    @field_validator("score", "grammarScore", "contextScore", "naturalnessScore", mode="before")
+    @classmethod
+    def clamp_score(cls, value):
+        return None if value is None else _score(value)
+
+    @field_validator("mistakes", "goodParts", mode="before")
+    @classmethod
+    def string_list(cls, value):
+        return _as_str_list(value)
+
+    def to_dict(self) -> dict:
+        data = self.model_dump()
+        for key in ("grammarScore", "contextScore", "naturalnessScore"):
+            if data[key] is None:
+                data[key] = self.score
+        return data
+
+
+class ReplyItem(BaseModel):
+    authorName: str = ""
+    aiComment: str
+
+
+class RepliesOutput(BaseModel):
+    replies: List[ReplyItem]
+
+    @field_validator("replies", mode="before")
+    @classmethod
+    def valid_replies(cls, value):
+        return _valid_items(ReplyItem, value)
+
+
+class SlangBreakdownItem(BaseModel):
+    term: str
+    definition: str = ""
+    usage: str = ""
+
+
+class ExplanationOutput(BaseModel):
+    translation: str
+    slangBreakdown: List[SlangBreakdownItem] = []
+
+    @field_validator("slangBreakdown", mode="before")
+    @classmethod
+    def valid_breakdown(cls, value):
+        return _valid_items(SlangBreakdownItem, value)
+
+
+class BatchExplanationItem(ExplanationOutput):
+    id: int
+
+
+class ExplanationsOutput(BaseModel):
+    explanations: List[BatchExplanationItem]
+
+    @field_validator("explanations", mode="before")
+    @classmethod
+    def valid_explanations(cls, value):
+        return _valid_items(BatchExplanationItem, value)
+
+
+class DefinitionItem(BaseModel):
+    word: str = ""
+    definition: str
+    example: str = ""
+
+
+class DefinitionsOutput(BaseModel):
+    definitions: List[DefinitionItem]
+
+    @field_validator("definitions", mode="before")
+    @classmethod
+    def valid_definitions(cls, value):
+        return _valid_items(DefinitionItem, value)
+
+
+class SuggestionReasonItem(BaseModel):
+    term: str
+    reason: str
+
+
+class SuggestionReasonsOutput(BaseModel):
+    reasons: List[SuggestionReasonItem]
+
+    @field_validator("reasons", mode="before")
+    @classmethod
+    def valid_reasons(cls, value):
+        return _valid_items(SuggestionReasonItem, value)
+
+
+class SegmentTranslationItem(BaseModel):
+    id: int
+    text: str
+
+
+class SegmentTranslationsOutput(BaseModel):
+    segments: List[SegmentTranslationItem]
+
+    @field_validator("segments", mode="before")
+    @classmethod
+    def valid_segments(cls, value):
+        return _valid_items(SegmentTranslationItem, value)
@@ -0,0 +1,109 @@
+import re
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+# Rough English average; only used for budgeting, the API's `usage` field is the real count
+CHARS_PER_TOKEN = 4
+
+_URL = re.compile(r'https?://\S+|www\.\S+')
+_HASHTAG_LINE = re.compile(r'^(?:\s*#\w+)+\s*$')
+_TIMESTAMP_LINE = re.compile(r'^\s*\(?\d{1,2}:\d{2}(?::\d{2})?\)?\s')
+_BOILERPLATE = re.compile(
+    r'subscribe|follow (?:me|us)|instagram|tiktok|twitter|patreon|merch|business inquiries|sponsored|affiliate|'
+    r'use code|discount code|link in bio',
+    re.IGNORECASE
+)
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for prompt budgeting."""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_description(description: str, max_tokens: int) -> str:
+    """
+    Shrink a YouTube description to roughly max_tokens: drop links, hashtag-only and
+    chapter-timestamp lines and promo boilerplate, then keep whole leading sentences
+    that fit the budget (hard-cutting the first one if it alone is too long).
+    """
+    lines = []
+    for line in (description or "").splitlines():
+        line = _URL.sub("", line).strip()
+        if not line or _HASHTAG_LINE.match(line) or _TIMESTAMP_LINE.match(line) or _BOILERPLATE.search(line):
+            continue
+        lines.append(line)
+    text = " ".join(" ".join(lines).split())
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget:
+        return text
+
+    kept = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{kept} {sentence}".strip()
+        if len(candidate) > budget:
+            break
+        kept = candidate
+    if not kept:
+        kept = text[:budget].rsplit(" ", 1)[0]
+    return kept + " …"
+
+
+class LLMUsageTracker:
+    """
+    Per-task token and latency accounting for LLM calls, from the API's `usage` field.
+    Keeps running totals plus a window of recent latencies for percentiles.
+    """
+
+    def __init__(self, latency_window: int = 500):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._parse_failures: Dict[str, int] = defaultdict(int)
+        self._prompt_tokens: Dict[str, int] = defaultdict(int)
+        self._completion_tokens: Dict[str, int] = defaultdict(int)
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=latency_window))
+
+    def record(self, task: str, latency: float, prompt_tokens: Optional[int] = None,
+               completion_tokens: Optional[int] = None):
+        with self._lock:
+            self._calls[task] += 1
+            self._prompt_tokens[task] += prompt_tokens or 0
+            self._completion_tokens[task] += completion_tokens or 0
+            self._latencies[task].append(latency)
+
+    def record_error(self, task: str):
+        with self._lock:
+            self._errors[task] += 1
+
+    def record_parse_failure(self, task: str):
+        """A completed call whose reply didn't parse/validate (the tokens were paid for anyway)."""
+        with self._lock:
+            self._parse_failures[task] += 1
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-task call counts, errors, parse failures, token totals/averages and latency percentiles (seconds)."""
+        with self._lock:
+            result = {}
+            for task in sorted(set(self._calls) | set(self._errors) | set(self._parse_failures)):
+                calls = self._calls.get(task, 0)
+                latencies = list(self._latencies.get(task, ()))
+                result[task] = {
+                    "calls": calls,
+                    "errors": self._errors.get(task, 0),
+                    "parse_failures": self._parse_failures.get(task, 0),
+                    "prompt_tokens": self._prompt_tokens.get(task, 0),
+                    "completion_tokens": self._completion_tokens.get(task, 0),
+                    "avg_prompt_tokens": round(self._prompt_tokens.get(task, 0) / calls, 1) if calls else 0.0,
+                    "avg_completion_tokens": round(self._completion_tokens.get(task, 0) / calls, 1) if calls else 0.0,
+                    "latency_p50": round(self._percentile(latencies, 0.5), 3) if latencies else None,
+                    "latency_p95": round(self._percentile(latencies, 0.95), 3) if latencies else None
+                }
+            return result
@@ -1,11 +1,26 @@
 import requests
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, FileResponse, StreamingResponse
 from pydantic import BaseModel
 from youtube_fetcher import YouTubeShortsSlangFetcher
 from groq_evaluator import GroqCommentEvaluator
 from database import VideoDatabase
+from content_store import ContentStore
+from thumbnail_cache import ThumbnailCache
+from audio_cache import TTSAudioCache
+from translation import TranscriptTranslator
+from transcripts import TranscriptCache
+from pretranslate import TranslationStore, PretranslationWorker
+from slang_dictionary import SlangDictionary
+from llm_cache import LLMResponseCache
+from near_duplicate import NearDuplicateIndex
+from prescreen import CommentPrescreener
+from slang_recommender import SlangRecommender
+from model_router import ModelRouter, parse_overrides
+from llm_gateway import LLMGateway, LLMUnavailableError, parse_rate_limits
+from hedging import HedgingPolicy
+from llm_schemas import LLMOutputError
 from dotenv import load_dotenv
 import os
 import re
@@ -14,8 +29,8 @@ from collections import defaultdict, Counter
 import json
 import random  # <-- NEW: Import for shuffling lists
 import time # <-- NEW: Import for time.sleep in retry logic
-import base64  # <-- NEW: For encoding audio to base64
-from youtube_transcript_api import YouTubeTranscriptApi  # <-- NEW: For fetching transcripts
+import asyncio
+import math
 
 # ============================================================================
 # 3. REQUEST/RESPONSE MODELS
@@ -59,7 +74,25 @@ class AIResponse(BaseModel):
 class RespondResponse(BaseModel):
     responses: List[AIResponse]
 
+class DefineWordsRequest(BaseModel):
+    words: List[str]
+    context: str = ""
+
+class SuggestSlangRequest(BaseModel):
+    learnedTerms: List[str]
+    limit: int = 6
+
+class SlangSuggestion(BaseModel):
+    term: str
+    definition: str
+    reason: str
+    category: str
+
+class SuggestSlangResponse(BaseModel):
+    suggestions: List[SlangSuggestion]
+
 class ExplainCommentRequest(BaseModel):
+    commentId: Optional[str] = None  # Cached comments are served from precomputed explanations
     commentText: str
     videoTitle: str
     videoDescription: str
@@ -83,12 +116,23 @@ class TranscriptSegment(BaseModel):
     start: float
     duration: float
 
+class TranslatedSegment(TranscriptSegment):
+    original: str
+
+class AudioChunk(BaseModel):
+    index: int
+    start: float
+    end: float
+    text: str
+    audio_url: Optional[str] = None
+
 class TranslateVideoResponse(BaseModel):
     video_id: str
     target_language: str
     original_transcript: List[TranscriptSegment]
     translated_text: str
-    audio_base64: str
+    translated_segments: List[TranslatedSegment]
+    audio_chunks: List[AudioChunk]
     audio_format: str
 
 
@@ -96,9 +140,13 @@ class TranslateVideoResponse(BaseModel):
 # 1. HELPER FUNCTIONS
 # ============================================================================
 
-def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = None):
+def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = None,
+                           background_tasks: Optional[BackgroundTasks] = None):
     """
     Unified function to check cache, fetch videos from YouTube, and save results to DB.
+    Freshly cached videos get their thumbnails prefetched, comment explanations precomputed
+    and transcript availability probed after the response is sent; cache hits start no
+    background work.
     """
     
     # Cache Busting logic
@@ -157,6 +205,7 @@ def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = N
                     if fallback_videos:
                         print(f"✅ Found {len(fallback_videos)} fallback videos from cache (quota exhausted)")
                         random.shuffle(fallback_videos)
+                        annotate_transcript_availability(fallback_videos)
                         return fallback_videos
                     else:
                         raise HTTPException(
@@ -167,6 +216,7 @@ def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = N
 
         # 4. Save cache & process data
         if shorts_data:
+            slang_dictionary.matcher().annotate_videos(shorts_data)
             db.cache_videos(
                 videos=shorts_data,
                 topics=config.topics,
@@ -176,6 +226,12 @@ def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = N
                 cache_hours=72  # Extended to 3 days to handle quota issues
             )
             print(f"💾 Cached {len(shorts_data)} videos to SQLite database")
+
+            if background_tasks is not None:
+                video_ids = [v.get('video_id') for v in shorts_data]
+                background_tasks.add_task(thumbnail_cache.prefetch, video_ids)
+                background_tasks.add_task(precompute_explanations, video_ids)
+                background_tasks.add_task(transcript_cache.probe, video_ids)
             
             random.shuffle(shorts_data) 
             final_videos.extend(shorts_data)
@@ -192,9 +248,94 @@ def fetch_and_cache_videos(config: VideoConfig, last_video_id: Optional[str] = N
     if priority_video:
         final_videos.insert(0, priority_video)
 
+    annotate_transcript_availability(final_videos)
     return final_videos
 
 
+def annotate_transcript_availability(videos: List[Dict]):
+    """
+    Set has_transcript on each video: True/False once probed, None while unknown.
+    The UI hides the translate button only for False.
+    """
+    availability = transcript_cache.availability([v.get('video_id') for v in videos])
+    for video in videos:
+        video['has_transcript'] = availability.get(video.get('video_id'))
+
+
+# Upper bound on words per /api/define-words request
+MAX_DEFINE_WORDS = 40
+# Comments explained per LLM call by the precompute job
+EXPLANATION_BATCH_SIZE = int(os.getenv('EXPLANATION_BATCH_SIZE', '8'))
+# Video ids whose explanations are being generated right now (avoids duplicate LLM work)
+_explanations_in_progress = set()
+
+
+async def precompute_explanations(video_ids: List[str]):
+    """
+    Background job: explain the cached comments of these videos, several per LLM call,
+    and store the results on the comment rows so /api/explain-comment is a DB lookup.
+    """
+    video_ids = [v for v in dict.fromkeys(video_ids) if v and v not in _explanations_in_progress]
+    pending = db.get_comments_needing_explanation(video_ids)
+    if not pending:
+        return
+
+    by_video: Dict[str, List[Dict]] = {}
+    for comment in pending:
+        by_video.setdefault(comment['video_id'], []).append(comment)
+    _explanations_in_progress.update(by_video)
+
+    start_time = time.time()
+    stored = 0
+    try:
+        for video_id, comments in by_video.items():
+            for i in range(0, len(comments), EXPLANATION_BATCH_SIZE):
+                chunk = comments[i:i + EXPLANATION_BATCH_SIZE]
+                explanations = await groq_evaluator.explain_comments_batch(
+                    chunk[0]['video_title'], chunk[0]['video_description'], chunk
+                )
+                if explanations:
+                    db.save_comment_explanations(explanations)
+                    stored += len(explanations)
+    finally:
+        _explanations_in_progress.difference_update(by_video)
+
+    print(f"🧠 Precomputed {stored}/{len(pending)} comment explanations for {len(by_video)} videos in {time.time() - start_time:.1f}s")
+
+
+def seed_video_cache(database: VideoDatabase):
+    """
+    Warm an empty cache on startup.
+    Uses CACHE_SNAPSHOT if set, otherwise the JSON dumps shipped with the repo.
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    snapshot_path = os.getenv('CACHE_SNAPSHOT')
+
+    if snapshot_path and os.path.exists(snapshot_path):
+        try:
+            start_time = time.time()
+            count = database.import_snapshot(snapshot_path)
+            print(f"📥 Seeded {count} videos from snapshot {snapshot_path} in {time.time() - start_time:.1f}s")
+            return
+        except Exception as e:
+            print(f"⚠️ Failed to import snapshot {snapshot_path}: {e}")
+
+    legacy_files = [
+        os.path.join(backend_dir, 'cached_shorts.json'),
+        os.path.join(backend_dir, '..', 'youtube_shorts_slang_data.json'),
+        os.path.join(backend_dir, '..', 'src', 'youtube_shorts_slang_data.json'),
+    ]
+    for path in legacy_files:
+        if not os.path.exists(path):
+            continue
+        try:
+            count = database.import_legacy_json(path)
+            if count:
+                print(f"📥 Seeded {count} videos from {os.path.relpath(path, backend_dir)}")
+        except Exception as e:
+            print(f"⚠️ Skipping seed file {os.path.relpath(path, backend_dir)}: {str(e)[:100]}")
+
+
 # ============================================================================
 # 2. INITIALIZATION AND SETUP
 # ============================================================================
@@ -221,8 +362,62 @@ if not GROQ_API_KEY:
 # Initialize FastAPI and services
 app = FastAPI()
 fetcher = YouTubeShortsSlangFetcher(YOUTUBE_API_KEY)
-groq_evaluator = GroqCommentEvaluator(GROQ_API_KEY)
+llm_cache = LLMResponseCache(os.getenv('LLM_CACHE_DB', 'llm_cache.db'))
+near_duplicates = NearDuplicateIndex(threshold=float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8')))
+# Merged slang sources, hot-reloaded when a file changes
+slang_dictionary = SlangDictionary(check_interval=float(os.getenv('SLANG_RELOAD_INTERVAL', '2')))
+prescreener = CommentPrescreener(slang_dictionary, blocklist_file=os.getenv('PRESCREEN_BLOCKLIST_FILE'))
+# e.g. LLM_TASK_TIERS="respond=quality,explain=fast", LLM_LATENCY_TARGETS="evaluate=3.5"
+model_router = ModelRouter(
+    task_tiers=parse_overrides(os.getenv('LLM_TASK_TIERS')),
+    latency_targets=parse_overrides(os.getenv('LLM_LATENCY_TARGETS'), float),
+    models=parse_overrides(os.getenv('LLM_TIER_MODELS')),
+    cooldown_seconds=float(os.getenv('LLM_DOWNGRADE_COOLDOWN', '300'))
+)
+# e.g. LLM_RATE_LIMITS="llama-3.3-70b-versatile=1000/300000" for a paid tier
+llm_gateway = LLMGateway(
+    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+    rate_limits=parse_rate_limits(os.getenv('LLM_RATE_LIMITS'))
+)
+# Duplicate requests for calls slower than the task's p90, capped at LLM_HEDGE_BUDGET of calls
+# (LLM_HEDGE_TASKS="" disables hedging)
+hedging_policy = HedgingPolicy(
+    tasks=[t.strip() for t in os.getenv('LLM_HEDGE_TASKS', 'evaluate').split(',') if t.strip()],
+    budget_fraction=float(os.getenv('LLM_HEDGE_BUDGET', '0.05'))
+)
+groq_evaluator = GroqCommentEvaluator(
+    GROQ_API_KEY,
+    response_cache=llm_cache,
+    near_duplicates=near_duplicates,
+    prescreener=prescreener,
+    router=model_router,
+    gateway=llm_gateway,
+    hedging=hedging_policy,
+    compact_prompts=os.getenv('LLM_COMPACT_PROMPTS', '0') == '1',
+    description_token_budget=int(os.getenv('DESCRIPTION_TOKEN_BUDGET', '150'))
+)
 db = VideoDatabase()
+if db.is_empty():
+    seed_video_cache(db)
+media_store = ContentStore(os.getenv('MEDIA_CACHE_DIR', 'media_cache'))
+thumbnail_cache = ThumbnailCache(db, media_store)
+transcript_cache = TranscriptCache(db, negative_ttl_hours=float(os.getenv('TRANSCRIPT_NEGATIVE_TTL_HOURS', '24')))
+audio_cache = TTSAudioCache(media_store, groq_evaluator)
+transcript_translator = TranscriptTranslator(
+    groq_evaluator, audio_cache, chunk_tokens=int(os.getenv('TRANSLATION_CHUNK_TOKENS', '250'))
+)
+translation_store = TranslationStore(db, audio_cache)
+# Idle-time pre-translation of the most requested videos (PRETRANSLATE_TOP_K=0 disables it)
+pretranslation_worker = PretranslationWorker(
+    translation_store, transcript_cache, transcript_translator, llm_gateway,
+    top_k=int(os.getenv('PRETRANSLATE_TOP_K', '20')),
+    min_requests=int(os.getenv('PRETRANSLATE_MIN_REQUESTS', '2')),
+    tokens_per_hour=int(os.getenv('PRETRANSLATE_TOKENS_PER_HOUR', '50000')),
+    calls_per_hour=int(os.getenv('PRETRANSLATE_CALLS_PER_HOUR', '200')),
+    interval_seconds=float(os.getenv('PRETRANSLATE_INTERVAL', '60')),
+    failure_cooldown_minutes=float(os.getenv('PRETRANSLATE_FAILURE_COOLDOWN_MINUTES', '30'))
+)
+slang_recommender = SlangRecommender(db, slang_dictionary, evaluator=groq_evaluator, response_cache=llm_cache)
 
 # CORS
 app.add_middleware(
@@ -233,6 +428,16 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def start_background_workers():
+    pretranslation_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await pretranslation_worker.stop()
+
+
 # ============================================================================
 # 4. API ENDPOINTS
 # ============================================================================
@@ -277,39 +482,161 @@ def cache_stats():
             "videos_cached": video_count,
             "comments_cached": comment_count,
             "cache_entries": cache_entries,
-            "database_size": os.path.getsize(db.db_path) if os.path.exists(db.db_path) else 0
+            "database_size": os.path.getsize(db.db_path) if os.path.exists(db.db_path) else 0,
+            "llm_cache": llm_cache.stats(),
+            "near_duplicates": near_duplicates.stats(),
+            "transcripts": transcript_cache.stats()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting cache stats: {str(e)}")
 
+@app.get("/api/llm-usage")
+def get_llm_usage():
+    """Per-task LLM token usage and latency since startup, plus the active prompt and routing settings."""
+    return {
+        "routing": model_router.stats(),
+        "gateway": llm_gateway.stats(),
+        "hedging": hedging_policy.stats(),
+        "compact_prompts": groq_evaluator.compact_prompts,
+        "description_token_budget": groq_evaluator.description_token_budget,
+        "tasks": groq_evaluator.usage.stats(),
+        "prescreen": prescreener.stats(),
+        "speculation": groq_evaluator.speculation_stats,
+        "pretranslation": pretranslation_worker.stats()
+    }
+
 
 # --- VIDEO FETCHING ENDPOINTS ---
 
 @app.get("/api/videos")
 def get_videos_db_get(
+    background_tasks: BackgroundTasks,
     topics: List[str] = ["gaming", "food review", "funny moments", "dance", "pets"],
     shorts_per_topic: int = 15,
     last_video_id: Optional[str] = None
 ):
     """Fetches videos using Query Parameters (GET). Checks database cache first."""
     config = VideoConfig(topics=topics, shorts_per_topic=shorts_per_topic)
-    return fetch_and_cache_videos(config, last_video_id=last_video_id)
+    return fetch_and_cache_videos(config, last_video_id=last_video_id, background_tasks=background_tasks)
 
 @app.post("/api/videos")
-def get_videos_db_post(config: VideoConfig, last_video_id: Optional[str] = None):
+def get_videos_db_post(config: VideoConfig, background_tasks: BackgroundTasks, last_video_id: Optional[str] = None):
     """
     Fetches videos using a JSON Request Body (POST). Checks database cache first.
     """
-    return fetch_and_cache_videos(config, last_video_id=last_video_id)
+    return fetch_and_cache_videos(config, last_video_id=last_video_id, background_tasks=background_tasks)
+
+
+# --- SLANG ENDPOINTS ---
+
+@app.get("/api/slang")
+def get_slang(request: Request, q: Optional[str] = None, limit: int = 20):
+    """
+    The merged slang dictionary, or with ?q= the exact, prefix and fuzzy matches for a query.
+    The ETag is the dictionary version, so clients revalidate with If-None-Match.
+    """
+    version = slang_dictionary.version
+    etag = f'"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if q is not None:
+        entries = slang_dictionary.search(q, limit=max(1, min(limit, 100)))
+    else:
+        entries = list(slang_dictionary.entries().values())
+    terms = [{field: entry[field] for field in ("term", "definition", "category", "example")} for entry in entries]
+    body = {"version": version, "total_terms": len(slang_dictionary), "terms": terms}
+    return Response(content=json.dumps(body, ensure_ascii=False), media_type="application/json", headers=headers)
+
+
+@app.get("/api/slang/{term}/examples")
+def get_slang_examples(term: str, limit: int = 5):
+    """Real, high-like cached comments that use a slang term."""
+    limit = max(1, min(limit, 50))
+    examples = db.get_slang_examples(term, limit=limit)
+    return {"term": term, "examples": examples}
+
+
+@app.post("/api/suggest-slang", response_model=SuggestSlangResponse)
+def suggest_slang(request: SuggestSlangRequest, background_tasks: BackgroundTasks):
+    """
+    Slang to learn next, ranked locally from co-occurrence in cached comments, shared
+    categories and popularity. Reasons are templates until an LLM-written one is cached;
+    those are written after the response is sent.
+    """
+    suggestions = slang_recommender.recommend(request.learnedTerms, limit=max(1, min(request.limit, 20)))
+    background_tasks.add_task(slang_recommender.write_reasons, suggestions)
+    return {"suggestions": suggestions}
+
+
+# --- MEDIA ENDPOINTS ---
+
+@app.get("/api/thumbnail/{video_id}")
+def get_thumbnail(video_id: str, request: Request, size: Optional[str] = None):
+    """
+    Serve a video thumbnail from the local disk cache.
+    The variant comes from ?size= (small/medium/large/max) or width client hints.
+    """
+    if not thumbnail_cache.is_valid_video_id(video_id):
+        raise HTTPException(status_code=400, detail="Invalid video id")
+
+    variant = thumbnail_cache.choose_size(size, request.headers)
+    cached = thumbnail_cache.get(video_id, variant)
+    if not cached:
+        raise HTTPException(status_code=404, detail=f"No thumbnail available for video {video_id}")
+
+    content_hash, path = cached
+    etag = f'"{content_hash}"'
+    headers = {
+        "Cache-Control": "public, max-age=2592000, stale-while-revalidate=86400",
+        "ETag": etag,
+        "Accept-CH": "Sec-CH-Width, Width, Sec-CH-Viewport-Width, Viewport-Width",
+        "Vary": "Sec-CH-Width, Width, Sec-CH-Viewport-Width, Viewport-Width",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+@app.get("/api/audio/{key}")
+def get_audio(key: str, request: Request):
+    """
+    Serve synthesized speech from the TTS audio cache.
+    Keys are content addresses, so the bytes never change; Range requests are supported.
+    """
+    if not audio_cache.is_valid_key(key):
+        raise HTTPException(status_code=400, detail="Invalid audio key")
+
+    path = audio_cache.path(key)
+    if not path:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    etag = f'"{key}"'
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, media_type=audio_cache.media_type(key), headers=headers)
 
 
 # --- AI EVALUATION ENDPOINTS ---
 
+def llm_retry_after(error: Exception) -> int:
+    """Retry-After seconds for an LLM call the gateway refused or that timed out."""
+    return max(1, math.ceil(getattr(error, "retry_after", 5)))
+
+
 @app.post("/api/evaluate", response_model=EvaluateResponse)
-def evaluate_comment(request: EvaluateRequest):
+async def evaluate_comment(request: EvaluateRequest):
     """Evaluate a user's comment on a video."""
     try:
-        evaluation = groq_evaluator.evaluate_comment(
+        evaluation = await groq_evaluator.evaluate_comment(
             video_title=request.videoTitle,
             video_description=request.videoDescription,
             user_comment=request.userComment,
@@ -317,41 +644,27 @@ def evaluate_comment(request: EvaluateRequest):
             video_like_count=request.videoLikeCount
         )
         return evaluation
+    except (LLMUnavailableError, asyncio.TimeoutError) as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Evaluation temporarily unavailable: {str(e) or 'LLM call timed out'}",
+            headers={"Retry-After": str(llm_retry_after(e))}
+        )
+    except LLMOutputError as e:
+        raise HTTPException(status_code=502, detail=f"Evaluation error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Evaluation error: {str(e)}")
 
 @app.post("/api/define-word")
-def define_word(request: dict):
-    """Get definition for any word using AI"""
+async def define_word(request: dict):
+    """Get definition for any word: slang dictionary first, then the definition cache, then AI"""
     word = request.get('word', '')
     context = request.get('context', '')
-    
+
     try:
-        prompt = f"""Define the word "{word}" in the context of the comment for someone learning English. 
-        
-Context: {context}
-
-Provide:
-1. A simple, clear definition (1-2 sentences)
-2. An example sentence using the word naturally
-
-Format as JSON:
-{{
-  "word": "{word}",
-  "definition": "...",
-  "example": "..."
-}}"""
-
-        response = groq_evaluator.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=groq_evaluator.model,
-            temperature=0.7,
-            max_tokens=200
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
+        return await groq_evaluator.define_word(word, context, slang_dictionary)
     except Exception as e:
+        print(f"Error in define_word: {e}")
         return {
             "word": word,
             "definition": "Definition not available",
@@ -359,11 +672,26 @@ Format as JSON:
         }
 
 
+@app.post("/api/define-words")
+async def define_words(request: DefineWordsRequest):
+    """Define every word of a comment in one round trip (at most one LLM call)."""
+    words = [w for w in dict.fromkeys(request.words) if w.strip()][:MAX_DEFINE_WORDS]
+    try:
+        definitions = await groq_evaluator.define_words(words, request.context, slang_dictionary)
+    except Exception as e:
+        print(f"Error in define_words: {e}")
+        definitions = {
+            word: {"word": word, "definition": "Definition not available", "example": ""}
+            for word in words
+        }
+    return {"definitions": definitions}
+
+
 @app.post("/api/respond")
 async def generate_response_endpoint(request: RespondRequest):
     try:
         # Use generate_multiple_responses (not generate_response)
-        responses = groq_evaluator.generate_multiple_responses(
+        responses = await groq_evaluator.generate_multiple_responses(
             user_comment=request.userComment,
             score=request.score,
             mistakes=request.mistakes,
@@ -385,139 +713,208 @@ async def generate_response_endpoint(request: RespondRequest):
             "likes": 50
         }]}
 
+
+def sse_event(event: str, data) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    """Stream an async generator of SSE strings without proxy buffering."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/respond/stream")
+async def generate_response_stream(request: RespondRequest):
+    """
+    Streaming /api/respond: one `reply` event per AI reply as soon as it is complete,
+    then a `done` event with the reply count.
+    """
+    async def events():
+        count = 0
+        try:
+            async for reply in groq_evaluator.stream_multiple_responses(
+                user_comment=request.userComment,
+                score=request.score,
+                mistakes=request.mistakes,
+                correction=request.correction,
+                video_title=request.videoTitle,
+                target_language=request.targetLanguage
+            ):
+                count += 1
+                yield sse_event("reply", reply)
+        except Exception as e:
+            print(f"Error in respond stream: {e}")
+            if not count:
+                count = 1
+                yield sse_event("reply", {
+                    "aiComment": "Great effort! 😊",
+                    "authorName": "LanguageBuddy",
+                    "likes": 50
+                })
+        yield sse_event("done", {"count": count})
+
+    return sse_response(events())
+
+@app.post("/api/comment")
+async def submit_comment(request: EvaluateRequest):
+    """
+    Evaluate a comment and stream its AI replies in one request: an `evaluation` event
+    first, then one `reply` event per reply and a `done` event with the reply count.
+    Replies are generated speculatively while the evaluation runs (see
+    GroqCommentEvaluator.stream_comment_feedback). An `error` event is sent if the
+    evaluation fails, with `retryAfter` seconds when the LLM is unavailable.
+    """
+    async def events():
+        count = 0
+        evaluated = False
+        try:
+            async for item in groq_evaluator.stream_comment_feedback(
+                video_title=request.videoTitle,
+                video_description=request.videoDescription,
+                user_comment=request.userComment,
+                target_language=request.targetLanguage,
+                video_like_count=request.videoLikeCount
+            ):
+                if item["type"] == "evaluation":
+                    evaluated = True
+                    yield sse_event("evaluation", item["evaluation"])
+                else:
+                    count += 1
+                    yield sse_event("reply", item["reply"])
+        except Exception as e:
+            print(f"Error in comment stream: {e}")
+            if not evaluated:
+                error = {"detail": f"Evaluation error: {str(e) or type(e).__name__}"}
+                if isinstance(e, (LLMUnavailableError, asyncio.TimeoutError)):
+                    error["retryAfter"] = llm_retry_after(e)
+                yield sse_event("error", error)
+                return
+            if not count:
+                count = 1
+                yield sse_event("reply", {
+                    "aiComment": "Great effort! 😊",
+                    "authorName": "LanguageBuddy",
+                    "likes": 50
+                })
+        yield sse_event("done", {"count": count})
+
+    return sse_response(events())
+
 @app.post("/api/explain-comment", response_model=ExplainCommentResponse)
-def explain_comment(request: ExplainCommentRequest):
-    """Explain a YouTube comment by translating it to simpler language and breaking down each slang term."""
+async def explain_comment(request: ExplainCommentRequest):
+    """
+    Explain a YouTube comment by translating it to simpler language and breaking down each slang term.
+    Cached comments (by commentId) are answered from precomputed explanations; misses fall back to a live call.
+    """
+    if request.commentId:
+        stored = db.get_comment_explanation(request.commentId)
+        if stored:
+            return stored
+
     if not groq_evaluator:
         raise HTTPException(status_code=503, detail="AI response service not available. Please check Groq API key.")
 
     try:
-        explanation = groq_evaluator.explain_comment(
+        explanation = await groq_evaluator.explain_comment(
             comment_text=request.commentText,
             video_title=request.videoTitle,
             video_description=request.videoDescription,
             detected_slang=request.detectedSlang
         )
         return explanation
+    except LLMOutputError as e:
+        raise HTTPException(status_code=502, detail=f"Explanation error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Explanation error: {str(e)}")
 
-@app.post("/api/translate-video", response_model=TranslateVideoResponse)
-def translate_video(request: TranslateVideoRequest):
+@app.post("/api/explain-comment/stream")
+async def explain_comment_stream(request: ExplainCommentRequest):
     """
-    Translate a YouTube video's transcript to the target language and generate TTS audio.
-
-    Flow:
-    1. Fetch transcript using YouTube Transcript API
-    2. Translate full transcript to target language using Groq LLM
-    3. Generate TTS audio using Groq's PlayAI model
-    4. Return transcript, translation, and audio
+    Streaming /api/explain-comment: `delta` events carry pieces of the translation as the
+    model writes them, then an `explanation` event has the full result, then `done`.
+    Precomputed explanations are sent as a single `explanation` event.
     """
-    try:
-        # Step 1: Fetch transcript from YouTube
-        print(f"Fetching transcript for video: {request.video_id}")
-        transcript_data = None
+    stored = db.get_comment_explanation(request.commentId) if request.commentId else None
 
-        # Create instance of the API (required for v1.2.3+)
-        ytt_api = YouTubeTranscriptApi()
-
-        # Try multiple methods to fetch transcripts (especially for YouTube Shorts)
-        try:
-            # Method 1: Try fetch() with default English settings (includes auto-generated)
-            transcript_result = ytt_api.fetch(request.video_id, languages=['en', 'en-US', 'en-GB'])
-            transcript_data = transcript_result.to_raw_data()
-            print(f"✓ Transcript fetched: {len(transcript_data)} segments (is_generated: {transcript_result.is_generated})")
-        except Exception as e1:
-            print(f"Default transcript fetch failed: {str(e1)[:150]}")
-
-            # Method 2: List all available transcripts and try manual + auto-generated explicitly
+    async def events():
+        if stored:
+            yield sse_event("explanation", stored)
+        else:
             try:
-                transcript_list = ytt_api.list(request.video_id)
-                print(f"Available transcripts: {[t.language_code for t in transcript_list]}")
-
-                # Try manually created transcripts first
-                try:
-                    transcript = transcript_list.find_manually_created_transcript(['en', 'en-US', 'en-GB'])
-                    transcript_result = transcript.fetch()
-                    transcript_data = transcript_result.to_raw_data()
-                    print(f"✓ Manual transcript found: {transcript.language_code}")
-                except Exception as e2:
-                    print(f"No manual transcript found: {str(e2)[:150]}")
-
-                    # Try auto-generated transcripts (common for YouTube Shorts)
-                    try:
-                        transcript = transcript_list.find_generated_transcript(['en', 'en-US', 'en-GB', 'a.en'])
-                        transcript_result = transcript.fetch()
-                        transcript_data = transcript_result.to_raw_data()
-                        print(f"✓ Auto-generated transcript found: {transcript.language_code}")
-                    except Exception as e3:
-                        print(f"No auto-generated transcript found: {str(e3)[:150]}")
-            except Exception as e4:
-                print(f"Failed to list transcripts: {str(e4)[:150]}")
-
-        # If all methods failed, raise an error
-        if not transcript_data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No transcript available for video {request.video_id}. The video may not have captions or they may be disabled."
-            )
+                async for part in groq_evaluator.stream_explanation(
+                    comment_text=request.commentText,
+                    video_title=request.videoTitle,
+                    video_description=request.videoDescription,
+                    detected_slang=request.detectedSlang
+                ):
+                    if part["type"] == "delta":
+                        yield sse_event("delta", {"text": part["text"]})
+                    else:
+                        yield sse_event("explanation", part["explanation"])
+            except Exception as e:
+                print(f"Error in explanation stream: {e}")
+                yield sse_event("error", {"detail": f"Explanation error: {str(e)}"})
+        yield sse_event("done", {})
 
-        # Convert transcript to our model format
-        transcript_segments = [
-            TranscriptSegment(
-                text=segment['text'],
-                start=segment['start'],
-                duration=segment['duration']
-            )
-            for segment in transcript_data
-        ]
-
-        # Step 2: Combine transcript into full text
-        full_transcript = " ".join([seg.text for seg in transcript_segments])
-        print(f"Transcript fetched: {len(full_transcript)} characters")
-
-        # Step 3: Translate using Groq LLM
-        print(f"Translating to {request.target_language}...")
-        translation_prompt = f"""Translate the following English text to {request.target_language}.
-Keep the translation natural and conversational, as this is from a YouTube video.
-
-Text to translate:
-{full_transcript}
-
-Provide ONLY the translation, no explanations or additional text."""
-
-        translation_response = groq_evaluator.client.chat.completions.create(
-            messages=[{
-                "role": "user",
-                "content": translation_prompt
-            }],
-            model=groq_evaluator.model,
-            temperature=0.5,  # Lower temp for more accurate translation
-            max_tokens=2000
+    return sse_response(events())
+
+async def load_transcript(video_id: str) -> List[Dict]:
+    """Transcript segments (text/start/duration) for a video; 404 if there is none."""
+    # Cache lookup or blocking HTTP, so off the event loop
+    try:
+        transcript_data = await asyncio.to_thread(transcript_cache.get, video_id)
+    except Exception as e:
+        print(f"Transcript fetch failed for {video_id}: {str(e).strip()[:150]}")
+        raise HTTPException(status_code=502, detail=f"Could not fetch transcript for video {video_id}, try again later")
+    if not transcript_data:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No transcript available for video {video_id}. The video may not have captions or they may be disabled."
         )
+    return [
+        {"text": segment['text'], "start": segment['start'], "duration": segment['duration']}
+        for segment in transcript_data
+    ]
 
-        translated_text = translation_response.choices[0].message.content.strip()
-        print(f"Translation complete: {len(translated_text)} characters")
 
-        # Step 4: Generate TTS audio
-        print("Generating TTS audio...")
-        audio_bytes = groq_evaluator.text_to_speech(
-            text=translated_text,
-            voice="Atlas-PlayAI",  # Default voice
-            audio_format="mp3"
-        )
+@app.post("/api/translate-video", response_model=TranslateVideoResponse)
+async def translate_video(request: TranslateVideoRequest):
+    """
+    Translate a YouTube video's transcript to the target language and generate TTS audio.
 
-        # Convert audio to base64 for transmission
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        print(f"TTS generation complete: {len(audio_bytes)} bytes")
+    Flow:
+    1. Serve a stored translation (live or pre-translated) if there is one, otherwise:
+    2. Fetch transcript using YouTube Transcript API (cached in the DB)
+    3. Split it into segment-aligned chunks and translate them concurrently with Groq LLM
+    4. Generate TTS audio per chunk using Groq's PlayAI model (cached on disk)
+    5. Return transcript, per-segment translation, and one /api/audio URL per chunk
+    """
+    try:
+        translation_store.record_request(request.video_id, request.target_language)
+        stored = translation_store.get(request.video_id, request.target_language)
+        if stored:
+            segments, chunks = stored["original_transcript"], stored["chunks"]
+            print(f"📦 Serving stored {request.target_language} translation of {request.video_id}")
+        else:
+            segments = await load_transcript(request.video_id)
+            chunks = await transcript_translator.translate_chunks(segments, request.target_language)
+            translation_store.save(request.video_id, request.target_language, segments, chunks)
+
+        result = TranscriptTranslator.assemble(chunks)
+        print(f"Translation complete: {len(result['translated_text'])} characters, "
+              f"{len(result['audio_chunks'])} audio chunks")
 
         return TranslateVideoResponse(
             video_id=request.video_id,
             target_language=request.target_language,
-            original_transcript=transcript_segments,
-            translated_text=translated_text,
-            audio_base64=audio_base64,
-            audio_format="mp3"
+            original_transcript=segments,
+            audio_format=transcript_translator.audio_format,
+            **result
         )
 
     except HTTPException:
@@ -526,6 +923,40 @@ Provide ONLY the translation, no explanations or additional text."""
         print(f"Error in translate_video: {e}")
         raise HTTPException(status_code=500, detail=f"Translation error: {str(e)}")
 
+
+@app.post("/api/translate-video/stream")
+async def translate_video_stream(request: TranslateVideoRequest):
+    """
+    Streaming /api/translate-video: a `transcript` event with the original segments, then one
+    `chunk` event per translated chunk in order (segments + audio_url) as soon as it and all
+    earlier chunks are ready, then `done`. A missing transcript is a plain 404.
+    Stored translations are replayed straight from the DB.
+    """
+    translation_store.record_request(request.video_id, request.target_language)
+    stored = translation_store.get(request.video_id, request.target_language)
+    segments = stored["original_transcript"] if stored else await load_transcript(request.video_id)
+
+    async def events():
+        yield sse_event("transcript", {"segments": segments})
+        if stored:
+            for chunk in stored["chunks"]:
+                yield sse_event("chunk", chunk)
+            yield sse_event("done", {"chunks": len(stored["chunks"])})
+            return
+
+        chunks = []
+        try:
+            async for chunk in transcript_translator.stream(segments, request.target_language):
+                chunks.append(chunk)
+                yield sse_event("chunk", chunk)
+            translation_store.save(request.video_id, request.target_language, segments, chunks)
+        except Exception as e:
+            print(f"Error in translate stream: {e}")
+            yield sse_event("error", {"detail": f"Translation error: {str(e)}"})
+        yield sse_event("done", {"chunks": len(chunks)})
+
+    return sse_response(events())
+
 if __name__ == "__main__":
     import uvicorn
     print("\n" + "="*60)
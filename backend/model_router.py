@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+# Tiers from slowest/best to fastest/cheapest; a downgrade moves one step right
+MODEL_TIERS = {
+    "quality": "llama-3.3-70b-versatile",
+    "fast": "llama-3.1-8b-instant",
+}
+TIER_ORDER = ["quality", "fast"]
+
+# Casual one-line replies and word definitions don't need the 70B model
+DEFAULT_TASK_TIERS = {
+    "evaluate": "quality",
+    "explain": "quality",
+    "explain_batch": "quality",
+    "suggest": "quality",
+    "translate": "quality",
+    "translate_background": "quality",
+    "respond": "fast",
+    "respond_batch": "fast",
+    "define_word": "fast",
+}
+
+# Seconds per call (end of stream for streamed tasks) the task should stay under;
+# background tasks have no target and never trigger downgrades
+DEFAULT_LATENCY_TARGETS = {
+    "evaluate": 4.0,
+    "explain": 5.0,
+    "explain_batch": 15.0,
+    "suggest": 5.0,
+    "translate": 20.0,
+    "respond": 2.0,
+    "respond_batch": 4.0,
+    "define_word": 2.0,
+}
+
+
+def parse_overrides(spec: Optional[str], cast=str) -> Dict:
+    """Parse "task=value,task=value" (e.g. from an env var) into a dict."""
+    overrides = {}
+    for part in (spec or "").split(","):
+        key, _, value = part.partition("=")
+        if key.strip() and value.strip():
+            overrides[key.strip()] = cast(value.strip())
+    return overrides
+
+
+def base_task(task: str) -> str:
+    """Repair calls ("evaluate_repair") are routed like the task they repair."""
+    return task[:-len("_repair")] if task.endswith("_repair") else task
+
+
+class ModelRouter:
+    """
+    Maps each LLM task to a model tier and watches observed latency.
+
+    When the recent p90 latency of a task on its configured tier misses the task's
+    target, the task is downgraded to the next faster tier for `cooldown_seconds`,
+    then tried on its configured tier again with a fresh window.
+    """
+
+    def __init__(self, task_tiers: Optional[Dict[str, str]] = None,
+                 latency_targets: Optional[Dict[str, float]] = None,
+                 models: Optional[Dict[str, str]] = None, default_tier: str = "quality",
+                 window: int = 20, min_samples: int = 5, cooldown_seconds: float = 300):
+        self.models = {**MODEL_TIERS, **(models or {})}
+        self.task_tiers = {**DEFAULT_TASK_TIERS, **(task_tiers or {})}
+        self.latency_targets = {**DEFAULT_LATENCY_TARGETS, **(latency_targets or {})}
+        unknown = {t for t in [default_tier, *self.task_tiers.values()] if t not in self.models}
+        if unknown:
+            raise ValueError(f"Unknown model tier(s): {', '.join(sorted(unknown))}")
+        self.default_tier = default_tier
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        # Recent latencies per task on its configured tier (drives downgrades)
+        self._task_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        # Recent latencies per tier across all tasks (reporting only)
+        self._tier_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=200))
+        self._downgraded_until: Dict[str, float] = {}
+        self._downgrades: Dict[str, int] = defaultdict(int)
+
+    def configured_tier(self, task: str) -> str:
+        return self.task_tiers.get(base_task(task), self.default_tier)
+
+    def _faster_tier(self, tier: str) -> str:
+        index = TIER_ORDER.index(tier) if tier in TIER_ORDER else len(TIER_ORDER) - 1
+        return TIER_ORDER[min(index + 1, len(TIER_ORDER) - 1)]
+
+    def tier_for(self, task: str) -> str:
+        """Tier to use right now: the configured one, or the next faster one while downgraded."""
+        task = base_task(task)
+        tier = self.configured_tier(task)
+        with self._lock:
+            until = self._downgraded_until.get(task)
+            if until is None:
+                return tier
+            if time.time() < until:
+                return self._faster_tier(tier)
+            # Cooldown over: back to the configured tier with a fresh window
+            del self._downgraded_until[task]
+            self._task_latencies[task].clear()
+        print(f"🔼 {task}: cooldown over, back on {tier} tier")
+        return tier
+
+    def model_for(self, task: str) -> str:
+        return self.models[self.tier_for(task)]
+
+    def fallback_model(self, task: str) -> Optional[str]:
+        """Model of the next faster tier than the task's current one, if there is one."""
+        tier = self.tier_for(task)
+        faster = self._faster_tier(tier)
+        return self.models[faster] if faster != tier else None
+
+    def record(self, task: str, model: str, latency: float):
+        """Record a call's latency; downgrades the task if its configured tier keeps missing the target."""
+        task = base_task(task)
+        tier = next((name for name, m in self.models.items() if m == model), None)
+        if tier is None:
+            return
+        configured = self.configured_tier(task)
+        target = self.latency_targets.get(task)
+        downgraded = False
+        with self._lock:
+            self._tier_latencies[tier].append(latency)
+            if tier != configured or task in self._downgraded_until:
+                return
+            latencies = self._task_latencies[task]
+            latencies.append(latency)
+            if (target and len(latencies) >= self.min_samples
+                    and self._faster_tier(configured) != configured
+                    and self._percentile(latencies, 0.9) > target):
+                self._downgraded_until[task] = time.time() + self.cooldown_seconds
+                self._downgrades[task] += 1
+                observed = self._percentile(latencies, 0.9)
+                downgraded = True
+        if downgraded:
+            print(f"🔽 {task}: p90 {observed:.2f}s > {target:.2f}s target on {configured} tier, "
+                  f"using {self._faster_tier(configured)} for {self.cooldown_seconds:.0f}s")
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> Dict:
+        """Tier models and latencies, plus each task's configured/current tier and target."""
+        now = time.time()
+        with self._lock:
+            tiers = {}
+            for tier, model in self.models.items():
+                latencies = list(self._tier_latencies.get(tier, ()))
+                tiers[tier] = {
+                    "model": model,
+                    "calls": len(latencies),
+                    "latency_p50": round(self._percentile(latencies, 0.5), 3) if latencies else None,
+                    "latency_p90": round(self._percentile(latencies, 0.9), 3) if latencies else None
+                }
+            tasks = {}
+            for task in sorted(set(self.task_tiers) | set(self._task_latencies)):
+                configured = self.configured_tier(task)
+                until = self._downgraded_until.get(task)
+                downgraded = until is not None and now < until
+                tasks[task] = {
+                    "configured_tier": configured,
+                    "current_tier": self._faster_tier(configured) if downgraded else configured,
+                    "latency_target": self.latency_targets.get(task),
+                    "downgraded_for": round(until - now, 1) if downgraded else 0.0,
+                    "downgrades": self._downgrades.get(task, 0)
+                }
+            return {"tiers": tiers, "tasks": tasks}
@@ -0,0 +1,139 @@
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r'[^\w\s]+')
+_REPEATS = re.compile(r'(.)\1{2,}')
+
+
+def normalize_for_similarity(text: str) -> str:
+    """
+    Lowercase, drop punctuation/emoji and squeeze runs of 3+ characters ("soooo" -> "soo"),
+    so comments that only differ in casing, punctuation or emphasis look alike.
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _NON_WORD.sub(" ", text)
+    text = _REPEATS.sub(r"\1\1", text)  # Double letters ("good", "too") are kept
+    return " ".join(text.split())
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    """Character k-shingles of normalized text (the whole string if it's shorter than k)."""
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash/LSH index of recent LLM results, scoped per (video, language, task).
+
+    A lookup returns a stored value when its estimated Jaccard similarity to the
+    query text is at least `threshold`. Entries expire after `ttl_seconds` and
+    the index keeps at most `max_entries`, dropping the oldest first.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 max_entries: int = 5000, ttl_seconds: float = 6 * 3600):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # Fixed seed so signatures are stable across restarts
+        seed = hashlib.sha256(b"near-duplicate-minhash").digest()
+        rng_values = [int.from_bytes(hashlib.sha256(seed + i.to_bytes(4, "big")).digest()[:8], "big")
+                      for i in range(2 * num_perm)]
+        self._perm_a = [(v % (_MERSENNE_PRIME - 1)) + 1 for v in rng_values[:num_perm]]
+        self._perm_b = [v % _MERSENNE_PRIME for v in rng_values[num_perm:]]
+
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # entry_id -> (scope, signature, value, created_at)
+        self._entries: "OrderedDict[int, Tuple[Hashable, Tuple[int, ...], Any, float]]" = OrderedDict()
+        self._buckets: Dict[Tuple[Hashable, int, Tuple[int, ...]], Set[int]] = defaultdict(set)
+        self._lookups = 0
+        self._hits = 0
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of the text's shingle set."""
+        base_hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big")
+            for s in shingles(normalize_for_similarity(text))
+        ]
+        if not base_hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in base_hashes)
+            for a, b in zip(self._perm_a, self._perm_b)
+        )
+
+    def _band_keys(self, scope: Hashable, signature: Tuple[int, ...]) -> List[Tuple[Hashable, int, Tuple[int, ...]]]:
+        return [(scope, band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def _similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / self.num_perm
+
+    def lookup(self, scope: Hashable, text: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, similarity) of the closest stored near-duplicate, or None."""
+        signature = self.signature(text)
+        now = time.time()
+        with self._lock:
+            self._lookups += 1
+            candidates = set()
+            for key in self._band_keys(scope, signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            best = None
+            for entry_id in candidates:
+                _, entry_sig, value, created_at = self._entries[entry_id]
+                if now - created_at > self.ttl_seconds:
+                    continue
+                similarity = self._similarity(signature, entry_sig)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (value, similarity)
+
+            if best:
+                self._hits += 1
+            return best
+
+    def add(self, scope: Hashable, text: str, value: Any):
+        signature = self.signature(text)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (scope, signature, value, time.time())
+            for key in self._band_keys(scope, signature):
+                self._buckets[key].add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove_oldest()
+
+    def _remove_oldest(self):
+        entry_id, (scope, signature, _, _) = self._entries.popitem(last=False)
+        for key in self._band_keys(scope, signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "lookups": self._lookups,
+                "hits": self._hits,
+                "hit_rate": round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+                "threshold": self.threshold
+            }
@@ -0,0 +1,241 @@
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from slang_dictionary import REACTION_FLAG, SlangDictionary
+
+# Phrases that settle a comment as a violation on their own. Extra entries can be loaded
+# from a file (one "category<TAB>phrase" or bare phrase per line, # for comments).
+DEFAULT_BLOCKLIST = {
+    "harassment": [
+        "kill yourself", "kys", "i know where you live",
+    ],
+    "hate speech": [
+        "heil hitler", "sieg heil", "white power", "gas the jews",
+    ],
+}
+
+# Normalized single tokens that carry no engagement on their own (laughter, bare interjections),
+# including common non-English laughter
+FILLER_PATTERNS = [
+    # One syllable repeated: haha, ahaha, hehe, jaja, xixi, kaka (not "hi", "joke", "hike")
+    r'a?(?P<h>h[aeiou])(?P=h)+h?', r'(?P<j>[jx][aeiou])(?P=j)+', r'(?P<k>k[ae])(?P=k)+',
+    r'l+(?:o+l+)+', r'lm+f?a+o+', r'rofl+', r'x+d+', r'k{2,}', r'w{2,}', r'5{2,}',
+    r'bru+h+', r'omg+', r'hm+', r'u+h+', r'e+h+', r'ya+y+', r'ㅋ+', r'ㅎ+', r'哈+', r'草+',
+]
+
+# Real words that look like laughter or filler; `python prescreen.py` checks none is settled
+NOT_BARE_REACTIONS = ["joke", "hike", "jake", "joke lol", "hi", "ja", "je", "ke", "...", "?", "dead", "vibe"]
+
+_EMOTICON = re.compile(
+    r"^(?:[:;=8xX][-'^o]?[)(\]\[dDpP/\\|*3oO]+|[)(\]\[dD][-'^]?[:;=]|\^[_.\-]*\^|>[_.\-]*<|"
+    r"[tTqQ][_.\-uUwW]*[tTqQ]|;[_.\-]*;|-[_.]+-|[oO0][_.][oO0]|[uUoO]w[uUoO]|<3+|:'\(|xD+)$"
+)
+_LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "@": "a", "$": "s", "7": "t"})
+_REPEATS = re.compile(r'(.)\1{2,}')
+_PUNCT = re.compile(r"[^\w\s']+")
+
+VIOLATION_MESSAGE = "This comment contains {category} which is not acceptable"
+
+# Reply tone buckets, following the score guidelines of the reply style guide, with the
+# score used to condition replies on a bucket before the exact score is known
+SCORE_BUCKETS = [(80, "excited"), (60, "supportive"), (40, "encouraging"), (1, "low"), (0, "violation")]
+BUCKET_SCORES = {"excited": 85, "supportive": 70, "encouraging": 50, "low": 30, "violation": 0}
+
+
+def score_bucket(score: int) -> str:
+    """Reply tone bucket of an evaluation score."""
+    return next(bucket for floor, bucket in SCORE_BUCKETS if score >= floor)
+
+
+def _is_emoji_only(token: str) -> bool:
+    chars = [c for c in token if c not in '‍️']
+    return bool(chars) and all(unicodedata.category(c) in ('So', 'Sk', 'Cn') or ord(c) >= 0x1F000 for c in chars)
+
+
+def _normalize_token(token: str) -> str:
+    token = unicodedata.normalize("NFKC", token).lower()
+    token = _PUNCT.sub("", token).strip("'")
+    return _REPEATS.sub(r"\1\1", token)
+
+
+def _normalize_for_blocklist(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower().translate(_LEET)
+    text = _PUNCT.sub(" ", text.replace("'", ""))
+    text = _REPEATS.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def load_blocklist_file(path: str) -> Dict[str, List[str]]:
+    """Read extra blocklist entries ("category<TAB>phrase" or bare phrase per line)."""
+    entries: Dict[str, List[str]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            category, _, phrase = line.rpartition('\t')
+            entries.setdefault(category.strip() or "hate speech", []).append(phrase.strip())
+    return entries
+
+
+class CommentPrescreener:
+    """
+    Local pre-screen in front of the LLM evaluator.
+
+    Settles two kinds of comment without a model call:
+    - violations: a compiled blocklist of unambiguous phrases (leetspeak/repeat-normalized)
+    - bare reactions: every token is laughter/interjection filler, an emoticon/emoji, or a
+      slang dictionary term flagged as a reaction (e.g. "lol", "oof"), e.g. "hihi", "lol 😂", "bruh"
+    Everything else returns None and goes to the LLM. Counts decisions for the bypass rate.
+    """
+
+    def __init__(self, slang_dictionary: Optional[SlangDictionary] = None,
+                 blocklist: Optional[Dict[str, Iterable[str]]] = None,
+                 blocklist_file: Optional[str] = None, max_filler_tokens: int = 6):
+        self.max_filler_tokens = max_filler_tokens
+        # Tokens are NFKC-normalized, so the patterns must be too (e.g. Hangul jamo)
+        self.filler_pattern = re.compile(unicodedata.normalize("NFKC", r'^(?:' + '|'.join(FILLER_PATTERNS) + r')$'))
+        self.slang_dictionary = slang_dictionary
+
+        entries: Dict[str, List[str]] = {k: list(v) for k, v in (blocklist or DEFAULT_BLOCKLIST).items()}
+        if blocklist_file and os.path.exists(blocklist_file):
+            for category, phrases in load_blocklist_file(blocklist_file).items():
+                entries.setdefault(category, []).extend(phrases)
+
+        self.blocklist_patterns = {}
+        for category, phrases in entries.items():
+            normalized = sorted({_normalize_for_blocklist(p) for p in phrases if p.strip()}, key=len, reverse=True)
+            if normalized:
+                self.blocklist_patterns[category] = re.compile(
+                    r'\b(?:' + '|'.join(re.escape(p) for p in normalized) + r')\b'
+                )
+
+        self._lock = threading.Lock()
+        self._screened = 0
+        self._blocked = 0
+        self._filler = 0
+
+    @staticmethod
+    def _build_filler_slang(entries: Dict[str, Dict]) -> Set[str]:
+        # Only terms flagged as reactions: categories also hold real vocabulary ("dead", "vibe")
+        return {
+            _normalize_token(entry['term'])
+            for entry in entries.values()
+            if entry.get(REACTION_FLAG) and ' ' not in entry['term']
+        }
+
+    @property
+    def filler_slang(self) -> Set[str]:
+        """Reaction slang terms, following dictionary reloads."""
+        if not self.slang_dictionary:
+            return set()
+        return self.slang_dictionary.derive("prescreen_reactions", self._build_filler_slang)
+
+    def check_blocklist(self, text: str) -> Optional[str]:
+        """Category of the first blocklisted phrase found in text, if any."""
+        normalized = _normalize_for_blocklist(text)
+        for category, pattern in self.blocklist_patterns.items():
+            if pattern.search(normalized):
+                return category
+        return None
+
+    def is_bare_reaction(self, text: str) -> bool:
+        """
+        True if the comment is only laughter/interjections, emoticons/emoji or reaction slang.
+        Punctuation is ignored, but at least one token must be a reaction ("..." or "?" is not).
+        """
+        tokens = text.split()
+        if not tokens or len(tokens) > self.max_filler_tokens:
+            return False
+        reacted = False
+        filler_slang = self.filler_slang
+        for token in tokens:
+            if _EMOTICON.match(token) or _is_emoji_only(token):
+                reacted = True
+                continue
+            word = _normalize_token(token)
+            if not word:
+                continue
+            if self.filler_pattern.match(word) or word in filler_slang:
+                reacted = True
+                continue
+            return False
+        return reacted
+
+    def predict_score_bucket(self, user_comment: str) -> str:
+        """
+        Guess the score bucket before the evaluation is back, for speculative replies.
+        Blocklisted and bare-reaction comments are certain; otherwise very short comments
+        usually land in "encouraging" and the rest in "supportive" (reasonable comments score 60+).
+        """
+        if self.check_blocklist(user_comment):
+            return "violation"
+        if self.is_bare_reaction(user_comment):
+            return "low"
+        return "encouraging" if len(user_comment.split()) < 3 else "supportive"
+
+    def screen(self, user_comment: str) -> Optional[Dict]:
+        """
+        A complete evaluation (without likes) for comments the pre-screen is sure about,
+        or None to forward the comment to the LLM.
+        """
+        result = None
+        category = self.check_blocklist(user_comment)
+        if category:
+            result = {
+                "score": 0,
+                "grammarScore": 0,
+                "contextScore": 0,
+                "naturalnessScore": 0,
+                "correction": "",
+                "mistakes": [VIOLATION_MESSAGE.format(category=category)],
+                "goodParts": []
+            }
+        elif self.is_bare_reaction(user_comment):
+            good_parts = ["You reacted to the video"]
+            if any(_EMOTICON.match(t) or _is_emoji_only(t) for t in user_comment.split()):
+                good_parts.append("Nice use of an emoticon to show how you felt")
+            result = {
+                "score": 28,
+                "grammarScore": 35,
+                "contextScore": 20,
+                "naturalnessScore": 35,
+                "correction": f"{user_comment.strip()} - what part got you? Try adding what you thought about the video",
+                "mistakes": [
+                    "Try adding what you thought about the video, not just a reaction",
+                    "Mention a moment you liked, like 'the ending got me'"
+                ],
+                "goodParts": good_parts
+            }
+
+        with self._lock:
+            self._screened += 1
+            if category:
+                self._blocked += 1
+            elif result:
+                self._filler += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            bypassed = self._blocked + self._filler
+            return {
+                "screened": self._screened,
+                "bypassed": bypassed,
+                "blocked": self._blocked,
+                "bare_reactions": self._filler,
+                "bypass_rate": round(bypassed / self._screened, 4) if self._screened else 0.0
+            }
+
+
+if __name__ == "__main__":
+    # Regression check: real words must go to the LLM, bare reactions must not
+    prescreener = CommentPrescreener(SlangDictionary())
+    settled = [text for text in NOT_BARE_REACTIONS if prescreener.screen(text)]
+    missed = [text for text in ["haha", "ahahah", "jajaja", "kkkk", "lol 😂", "bruh", "oof"]
+              if not prescreener.is_bare_reaction(text)]
+    print(f"Wrongly settled: {settled or 'none'}; missed reactions: {missed or 'none'}")
+    raise SystemExit(1 if settled or missed else 0)
@@ -0,0 +1,207 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from audio_cache import TTSAudioCache
+from database import VideoDatabase
+from llm_gateway import LLMGateway
+from llm_usage import estimate_tokens
+from transcripts import TranscriptCache
+from translation import TranscriptTranslator, chunk_segments
+
+BACKGROUND_TASK = "translate_background"
+BACKGROUND_TTS_TASK = "tts_background"
+
+
+class TranslationStore:
+    """
+    Finished video translations in VideoDatabase, with their TTS audio in the TTSAudioCache.
+    A translation is only served while all of its audio is still on disk.
+    """
+
+    def __init__(self, db: VideoDatabase, audio_cache: TTSAudioCache):
+        self.db = db
+        self.audio_cache = audio_cache
+
+    def _audio_present(self, chunks: List[Dict]) -> bool:
+        return all(
+            chunk.get("audio_url") and self.audio_cache.path(chunk["audio_url"].rsplit("/", 1)[-1])
+            for chunk in chunks
+        )
+
+    def record_request(self, video_id: str, target_language: str):
+        self.db.record_translation_request(video_id, target_language)
+
+    def get(self, video_id: str, target_language: str) -> Optional[Dict]:
+        """{"original_transcript", "chunks"} of a stored translation, or None."""
+        stored = self.db.get_translation(video_id, target_language)
+        if stored is None:
+            return None
+        if not self._audio_present(stored["chunks"]):
+            # Audio was cleared from the media store; translate again on the next request
+            self.db.delete_translation(video_id, target_language)
+            return None
+        return stored
+
+    def record_failure(self, video_id: str, target_language: str, cooldown_seconds: float):
+        self.db.record_pretranslation_failure(video_id, target_language, cooldown_seconds)
+
+    def save(self, video_id: str, target_language: str, original_transcript: List[Dict],
+             chunks: List[Dict]) -> bool:
+        """Store a translation if every chunk got its audio; returns whether it was stored."""
+        if not chunks or not self._audio_present(chunks):
+            return False
+        self.db.save_translation(video_id, target_language, original_transcript, chunks)
+        return True
+
+
+class PretranslationWorker:
+    """
+    Background job that translates the most requested (video, language) pairs ahead of time.
+
+    Every `interval_seconds` it takes the `top_k` most requested pairs that have no stored
+    translation and works through them one at a time, only while the LLM gateway has been
+    idle for `idle_seconds`. Its LLM and TTS calls run as tasks "translate_background" and
+    "tts_background" (lowest gateway priority) and are capped at `tokens_per_hour` /
+    `calls_per_hour` (LLM + TTS calls), measured from the evaluator's usage tracker.
+    A pair that fails or comes back incomplete (e.g. a chunk without audio) is put on a
+    cooldown of `failure_cooldown_minutes`, doubling with each further failure.
+    """
+
+    def __init__(self, store: TranslationStore, transcript_cache: TranscriptCache,
+                 translator: TranscriptTranslator, gateway: LLMGateway, top_k: int = 20,
+                 min_requests: int = 2, tokens_per_hour: int = 50000, calls_per_hour: int = 200,
+                 interval_seconds: float = 60.0, idle_seconds: float = 5.0,
+                 failure_cooldown_minutes: float = 30.0):
+        self.store = store
+        self.transcript_cache = transcript_cache
+        self.translator = translator
+        self.gateway = gateway
+        self.top_k = top_k
+        self.min_requests = min_requests
+        self.tokens_per_hour = tokens_per_hour
+        self.calls_per_hour = calls_per_hour
+        self.interval_seconds = interval_seconds
+        self.idle_seconds = idle_seconds
+        self.failure_cooldown_seconds = failure_cooldown_minutes * 60
+
+        self._spend: Deque[Tuple[float, int, int]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._translated = 0
+        self._failed = 0
+        self._skipped_budget = 0
+        self._deferred_busy = 0
+
+    # --- Budget ---
+
+    def _spent_last_hour(self) -> Tuple[int, int]:
+        cutoff = time.time() - 3600
+        while self._spend and self._spend[0][0] < cutoff:
+            self._spend.popleft()
+        return sum(s[1] for s in self._spend), sum(s[2] for s in self._spend)
+
+    def _estimate_cost(self, segments: List[Dict]) -> Tuple[int, int]:
+        """(tokens, calls) a translation will roughly take: prompt + output per chunk, one LLM and one TTS call each."""
+        chunks = chunk_segments(segments, self.translator.chunk_tokens)
+        text_tokens = sum(estimate_tokens(s["text"]) for s in segments)
+        return 3 * text_tokens + 15 * len(segments) + 200 * len(chunks), 2 * len(chunks)
+
+    def _usage_totals(self) -> Tuple[int, int]:
+        """Tokens and LLM calls recorded so far for background translation (incl. repairs)."""
+        tokens = calls = 0
+        for task, stats in self.translator.evaluator.usage.stats().items():
+            if task.startswith(BACKGROUND_TASK):
+                tokens += stats["prompt_tokens"] + stats["completion_tokens"]
+                calls += stats["calls"]
+        return tokens, calls
+
+    # --- Work ---
+
+    async def translate_one(self, video_id: str, target_language: str) -> bool:
+        """Translate and store one pair if it fits the remaining budget; returns whether it was stored."""
+        segments = await asyncio.to_thread(self.transcript_cache.get, video_id)
+        if not segments:
+            return False
+        segments = [{"text": s["text"], "start": s["start"], "duration": s["duration"]} for s in segments]
+
+        tokens, calls = self._estimate_cost(segments)
+        spent_tokens, spent_calls = self._spent_last_hour()
+        if spent_tokens + tokens > self.tokens_per_hour or spent_calls + calls > self.calls_per_hour:
+            self._skipped_budget += 1
+            return False
+
+        tokens_before, calls_before = self._usage_totals()
+        chunks = []
+        try:
+            chunks = await self.translator.translate_chunks(
+                segments, target_language, task=BACKGROUND_TASK, tts_task=BACKGROUND_TTS_TASK
+            )
+        finally:
+            tokens_after, calls_after = self._usage_totals()
+            # TTS calls aren't in the usage tracker; count one per chunk
+            self._spend.append((time.time(), tokens_after - tokens_before, calls_after - calls_before + len(chunks)))
+        if self.store.save(video_id, target_language, segments, chunks):
+            return True
+        self._failed += 1
+        self.store.record_failure(video_id, target_language, self.failure_cooldown_seconds)
+        print(f"⚠️ Pre-translation of {video_id} to {target_language} incomplete, retrying later")
+        return False
+
+    async def run_once(self) -> int:
+        """One pass over the current top-K; returns how many translations were stored."""
+        stored = 0
+        for candidate in self.store.db.get_pretranslation_candidates(self.top_k, self.min_requests):
+            if not self.gateway.is_idle(self.idle_seconds):
+                self._deferred_busy += 1
+                break
+            video_id, language = candidate["video_id"], candidate["target_language"]
+            try:
+                if await self.translate_one(video_id, language):
+                    stored += 1
+                    self._translated += 1
+                    print(f"🌐 Pre-translated {video_id} to {language} ({candidate['request_count']} requests)")
+            except Exception as e:
+                self._failed += 1
+                self.store.record_failure(video_id, language, self.failure_cooldown_seconds)
+                print(f"⚠️ Pre-translation of {video_id} to {language} failed: {str(e)[:100]}")
+        return stored
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"⚠️ Pre-translation pass failed: {e}")
+
+    def start(self):
+        """Start the worker on the running event loop (no-op if top_k is 0 or already running)."""
+        if self.top_k > 0 and self._task is None:
+            self._task = asyncio.create_task(self.run())
+            print(f"🌐 Pre-translation worker started (top {self.top_k}, "
+                  f"{self.tokens_per_hour} tokens / {self.calls_per_hour} calls per hour)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        spent_tokens, spent_calls = self._spent_last_hour()
+        return {
+            "running": self._task is not None,
+            "top_k": self.top_k,
+            "translated": self._translated,
+            "failed": self._failed,
+            "skipped_over_budget": self._skipped_budget,
+            "deferred_busy": self._deferred_busy,
+            "tokens_last_hour": spent_tokens,
+            "calls_last_hour": spent_calls,
+            "tokens_per_hour": self.tokens_per_hour,
+            "calls_per_hour": self.calls_per_hour
+        }
@@ -0,0 +1,217 @@
+import ast
+import bisect
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from slang_matcher import SlangMatcher
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Merged in this order: for each term, the first source that has a field wins
+DEFAULT_SOURCES = [
+    os.path.join(_BACKEND_DIR, 'slang_database.json'),
+    os.path.join(_BACKEND_DIR, '..', 'slang_database.json'),
+    os.path.join(_BACKEND_DIR, '..', 'src', 'slangTerms.py'),
+]
+ENTRY_FIELDS = ("definition", "category", "example")
+# Optional per-term flag: true if the term is only a reaction when used alone ("lol", "oof")
+REACTION_FLAG = "reaction"
+
+_SEPARATORS = re.compile(r'[\s\-_]+')
+_EDGE_PUNCT = re.compile(r"^[^\w']+|[^\w']+$")
+_REPEATS = re.compile(r'(.)\1{2,}')
+
+
+def normalize_key(term: str) -> str:
+    """Lookup key for a term: NFKC, lowercase, hyphens/underscores as spaces, no edge punctuation."""
+    key = unicodedata.normalize("NFKC", term or "").lower()
+    key = _SEPARATORS.sub(" ", key).strip()
+    return _EDGE_PUNCT.sub("", key)
+
+
+def load_source(path: str) -> Dict[str, Dict]:
+    """Read one slang source: a JSON {term: info} file, or a .py file assigning a dict literal."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if not path.endswith('.py'):
+        return json.loads(text)
+    # e.g. src/slangTerms.py: `slangTerms = {...}`; parsed, never executed
+    for node in ast.parse(text).body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict):
+            return ast.literal_eval(node.value)
+    return {}
+
+
+class _SlangIndex:
+    """One immutable, fully built version of the dictionary."""
+
+    def __init__(self, entries: Dict[str, Dict], signature: Tuple):
+        self.entries = entries
+        self.keys = sorted(entries)
+        self.signature = signature
+        canonical = json.dumps(entries, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        self.loaded_at = time.time()
+        self.derived: Dict[str, Any] = {}
+
+
+class SlangDictionary:
+    """
+    The backend's single slang source: backend/slang_database.json, the root
+    slang_database.json and src/slangTerms.py merged into one index keyed by normalize_key().
+
+    Lookups check the source files' mtimes (at most every `check_interval` seconds) and
+    rebuild when one changed; the new index is built aside and swapped in with one
+    assignment, so readers always see a complete version. A source that fails to parse
+    keeps the previous version. Consumers that precompute from the entries (the comment
+    matcher, the pre-screen's reaction terms) use derive(), which rebuilds once per version.
+    """
+
+    def __init__(self, sources: Optional[List[str]] = None, check_interval: float = 2.0):
+        self.sources = [os.path.normpath(p) for p in (sources or DEFAULT_SOURCES)]
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._reloads = 0
+        self._index = self._build(self._signature())
+        self._last_check = time.monotonic()
+
+    def _signature(self) -> Tuple:
+        signature = []
+        for path in self.sources:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _build(self, signature: Tuple) -> _SlangIndex:
+        entries: Dict[str, Dict] = {}
+        for path, mtime, _ in signature:
+            if mtime is None:
+                continue
+            source = os.path.relpath(path, os.path.join(_BACKEND_DIR, '..'))
+            for term, info in load_source(path).items():
+                key = normalize_key(term)
+                if not key or not isinstance(info, dict):
+                    continue
+                entry = entries.setdefault(
+                    key, {"term": term, **{f: "" for f in ENTRY_FIELDS}, REACTION_FLAG: False, "sources": []}
+                )
+                for field in ENTRY_FIELDS:
+                    if not entry[field] and info.get(field):
+                        entry[field] = str(info[field])
+                if info.get(REACTION_FLAG) is True:
+                    entry[REACTION_FLAG] = True
+                entry["sources"].append(source)
+        return _SlangIndex(entries, signature)
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild if a source changed (or force); returns whether a new version was swapped in."""
+        with self._reload_lock:
+            signature = self._signature()
+            if not force and signature == self._index.signature:
+                return False
+            try:
+                index = self._build(signature)
+            except (OSError, ValueError, SyntaxError) as e:
+                print(f"⚠️ Slang dictionary reload failed, keeping version {self._index.version}: {e}")
+                return False
+            changed = index.version != self._index.version
+            self._index = index
+            self._reloads += 1
+        if changed:
+            print(f"📖 Slang dictionary reloaded: {len(index.entries)} terms (version {index.version})")
+        return changed
+
+    def _current(self) -> _SlangIndex:
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self.reload()
+        return self._index
+
+    # --- Lookups ---
+
+    @property
+    def version(self) -> str:
+        return self._current().version
+
+    def __len__(self) -> int:
+        return len(self._current().entries)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_key(term) in self._current().entries
+
+    def get(self, term: str) -> Optional[Dict]:
+        """Entry ({term, definition, category, example, reaction, sources}) for an exact (normalized) term."""
+        return self._current().entries.get(normalize_key(term))
+
+    def entries(self) -> Dict[str, Dict]:
+        """All entries by normalized key (one version; don't mutate)."""
+        return self._current().entries
+
+    def terms(self) -> List[str]:
+        return [entry["term"] for entry in self._current().entries.values()]
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Entries whose key starts with prefix, alphabetically."""
+        index = self._current()
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        results = []
+        for i in range(bisect.bisect_left(index.keys, key), len(index.keys)):
+            if not index.keys[i].startswith(key) or len(results) >= limit:
+                break
+            results.append(index.entries[index.keys[i]])
+        return results
+
+    def fuzzy(self, term: str, limit: int = 5, cutoff: float = 0.75) -> List[Dict]:
+        """Closest entries to a misspelled or stretched term ("bussinnn", "no capp"), best first."""
+        index = self._current()
+        key = _REPEATS.sub(r"\1\1", normalize_key(term))
+        if not key:
+            return []
+        matches = difflib.get_close_matches(key, index.keys, n=limit, cutoff=cutoff)
+        return [index.entries[match] for match in matches]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Exact match first, then prefix matches, then fuzzy matches."""
+        results: Dict[str, Dict] = {}
+        exact = self.get(query)
+        if exact:
+            results[normalize_key(query)] = exact
+        for entry in self.prefix(query, limit) + self.fuzzy(query, limit):
+            results.setdefault(normalize_key(entry["term"]), entry)
+        return list(results.values())[:limit]
+
+    # --- Derived structures ---
+
+    def derive(self, name: str, build: Callable[[Dict[str, Dict]], Any]) -> Any:
+        """build(entries) computed once per dictionary version and cached under name."""
+        index = self._current()
+        if name not in index.derived:
+            index.derived[name] = build(index.entries)
+        return index.derived[name]
+
+    def matcher(self) -> SlangMatcher:
+        """Comment slang detector for the current version."""
+        return self.derive("matcher", lambda entries: SlangMatcher(e["term"] for e in entries.values()))
+
+    def stats(self) -> Dict:
+        index = self._current()
+        return {
+            "version": index.version,
+            "total_terms": len(index.entries),
+            "loaded_at": index.loaded_at,
+            "reloads": self._reloads,
+            "sources": [path for path, mtime, _ in index.signature if mtime is not None]
+        }
@@ -0,0 +1,117 @@
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_SLANG_DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slang_database.json')
+
+# Ambiguous terms are dropped when the comment also matches one of these contexts
+CONTEXT_FILTERS = {
+    'l': re.compile(r'welcome|jelly'),
+    'w': re.compile(r'what|why|ow|sw'),
+    'fire': re.compile(r'fire alarm|on fire|building fire'),
+}
+
+
+def load_slang_database(path: str = DEFAULT_SLANG_DATABASE) -> Dict[str, Dict]:
+    """Load the slang dictionary JSON ({term: {definition, category, example}})."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a prefix-factored regex alternation from a set of literal terms,
+    e.g. {'bro', 'bruh', 'bet'} -> 'b(?:et|r(?:o|uh))'.
+    Longer continuations are tried first so the longest term at a position wins.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if is_end else body
+
+    return build(trie)
+
+
+class SlangMatcher:
+    """
+    Single-pass slang detector.
+
+    All terms are compiled once into one trie-shaped regex that is tried at each
+    position of the (lowercased) text, with the same \\b...\\b word-boundary
+    semantics as the old per-term regex loop. Shorter terms hidden by a longer match
+    at the same position (e.g. 'rolling' in 'rolling on the floor') come from a
+    table built at construction time.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = list(dict.fromkeys(terms))
+        self.canonical: Dict[str, str] = {}
+        for term in self.terms:
+            self.canonical.setdefault(term.lower(), term)
+
+        lowered = list(self.canonical.keys())
+        self.order = {term: i for i, term in enumerate(lowered)}
+        self.pattern: Optional[re.Pattern] = None
+        if lowered:
+            self.pattern = re.compile(r'(?=\b(' + _trie_pattern(lowered) + r')\b)')
+
+        # Shorter terms that also match inside each term (they share its boundaries)
+        self.nested: Dict[str, List[str]] = {}
+        for term in lowered:
+            inner = [other for other in lowered
+                     if other != term and other in term
+                     and re.search(r'\b' + re.escape(other) + r'\b', term)]
+            if inner:
+                self.nested[term] = inner
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_SLANG_DATABASE) -> 'SlangMatcher':
+        return cls(load_slang_database(path).keys())
+
+    def find(self, text: str) -> List[str]:
+        """Return the slang terms used in text, in dictionary order."""
+        if not text or self.pattern is None:
+            return []
+
+        text_lower = text.lower()
+        found = set()
+        for match in self.pattern.finditer(text_lower):
+            term = match.group(1)
+            found.add(term)
+            found.update(self.nested.get(term, ()))
+
+        result = []
+        for term in sorted(found, key=self.order.__getitem__):
+            context = CONTEXT_FILTERS.get(term)
+            if context and context.search(text_lower):
+                continue
+            result.append(self.canonical[term])
+        return result
+
+    def annotate_comments(self, comments: List[Dict]) -> List[Dict]:
+        """Set 'detected_slang' on each comment dict in place."""
+        for comment in comments:
+            comment['detected_slang'] = self.find(comment.get('text', ''))
+        return comments
+
+    def annotate_videos(self, videos: List[Dict]) -> List[Dict]:
+        """Detect slang across each video's top_comments and fill the per-video summary fields."""
+        for video in videos:
+            comments = self.annotate_comments(video.get('top_comments', []))
+            slang_comments = [c for c in comments if c['detected_slang']]
+            video['slang_comment_count'] = len(slang_comments)
+            video['unique_slang_terms'] = sorted({term for c in slang_comments for term in c['detected_slang']})
+        return videos
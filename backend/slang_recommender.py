@@ -0,0 +1,152 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from database import VideoDatabase
+from llm_cache import LLMResponseCache
+from slang_dictionary import SlangDictionary, normalize_key
+
+REASON_NAMESPACE = "suggest_reason"
+
+# Score = co-occurrence (cosine over comments, summed over learned terms)
+#       + CATEGORY_WEIGHT * share of learned terms in the candidate's category
+#       + POPULARITY_WEIGHT * relative comment frequency (log scale, breaks ties)
+CATEGORY_WEIGHT = 0.3
+POPULARITY_WEIGHT = 0.1
+
+
+class SlangRecommender:
+    """
+    Local "learn next" recommender for slang terms.
+
+    Ranks slang dictionary terms by how often they appear in the same cached comments as the
+    learner's terms (the slang_cooccurrence table, kept up to date by triggers as comments
+    are cached or ingested), by shared category, and by overall popularity. Each suggestion
+    gets a template reason right away; friendlier LLM-written reasons are generated in the
+    background and cached per (term, basis), so repeat suggestions get them for free.
+    """
+
+    def __init__(self, db: VideoDatabase, slang_dictionary: SlangDictionary,
+                 evaluator=None, response_cache: Optional[LLMResponseCache] = None):
+        self.db = db
+        self.slang_dictionary = slang_dictionary
+        self.evaluator = evaluator
+        self.response_cache = response_cache
+        self._reasons_in_progress: Set[str] = set()
+
+    @staticmethod
+    def _basis(kind: str, anchor: Optional[str], category: str) -> str:
+        if kind == "cooccurrence":
+            return f"often used with '{anchor}'"
+        if kind == "category":
+            return f"another {category} term like '{anchor}'"
+        if kind == "popular":
+            return "popular in comments right now"
+        return "a common slang term"
+
+    @staticmethod
+    def _template_reason(kind: str, anchor: Optional[str], category: str) -> str:
+        if kind == "cooccurrence":
+            return f"People often use it together with \"{anchor}\" in comments"
+        if kind == "category":
+            return f"Another {category} term, just like \"{anchor}\""
+        if kind == "popular":
+            return "It's popular in comments right now"
+        return "A common slang term worth knowing"
+
+    def _reason_key(self, term: str, basis: str) -> str:
+        return LLMResponseCache.make_key(term, basis)
+
+    def recommend(self, learned_terms: List[str], limit: int = 6) -> List[Dict]:
+        """
+        Up to `limit` suggestions ({term, definition, reason, category, basis, reason_source}),
+        best first. Learned terms and their case variants are never suggested.
+        """
+        learned = list(dict.fromkeys(normalize_key(t) for t in learned_terms if t and t.strip()))
+        if not learned:
+            return []
+        entries = self.slang_dictionary.entries()
+        pairs = self.db.get_slang_cooccurrences(learned)
+        counts = self.db.get_slang_term_counts()
+        max_count = max(counts.values(), default=0)
+
+        learned_by_category: Dict[str, List[str]] = defaultdict(list)
+        for term in learned:
+            category = entries.get(term, {}).get("category", "").lower()
+            if category:
+                learned_by_category[category].append(term)
+
+        scored = []
+        for term, info in entries.items():
+            if term in learned:
+                continue
+            category = info["category"].lower()
+
+            cooccurrence, anchor, best = 0.0, None, 0.0
+            for learned_term in learned:
+                together = pairs.get(learned_term, {}).get(term, 0)
+                if not together:
+                    continue
+                similarity = together / math.sqrt(counts[learned_term] * counts[term])
+                cooccurrence += similarity
+                if similarity > best:
+                    anchor, best = learned_term, similarity
+
+            same_category = learned_by_category.get(category, [])
+            category_score = CATEGORY_WEIGHT * len(same_category) / len(learned)
+            popularity = (POPULARITY_WEIGHT * math.log1p(counts.get(term, 0)) / math.log1p(max_count)
+                          if max_count else 0.0)
+
+            parts = {"cooccurrence": cooccurrence, "category": category_score, "popular": popularity}
+            kind = max(parts, key=parts.get)
+            if not parts[kind]:
+                kind = "common"
+            if kind == "category":
+                anchor = same_category[0]
+            scored.append((-sum(parts.values()), term, kind, anchor))
+
+        suggestions = []
+        for _, term, kind, anchor in sorted(scored)[:limit]:
+            info = entries[term]
+            category = info["category"]
+            basis = self._basis(kind, anchor, category)
+            reason = None
+            if self.response_cache:
+                reason = self.response_cache.get(REASON_NAMESPACE, self._reason_key(term, basis))
+            suggestions.append({
+                "term": info["term"],
+                "definition": info["definition"],
+                "reason": reason or self._template_reason(kind, anchor, category),
+                "category": category,
+                "basis": basis,
+                "reason_source": "llm" if reason else "template"
+            })
+        return suggestions
+
+    async def write_reasons(self, suggestions: List[Dict]):
+        """
+        Background job: have the LLM write friendly reasons for suggestions that only have a
+        template reason, and cache them for next time.
+        """
+        if not (self.evaluator and self.response_cache):
+            return
+        pending = []
+        for suggestion in suggestions:
+            key = self._reason_key(normalize_key(suggestion["term"]), suggestion["basis"])
+            if suggestion["reason_source"] == "template" and key not in self._reasons_in_progress:
+                self._reasons_in_progress.add(key)
+                pending.append((key, suggestion))
+        if not pending:
+            return
+
+        try:
+            reasons = await self.evaluator.write_suggestion_reasons([s for _, s in pending])
+            for key, suggestion in pending:
+                reason = reasons.get(normalize_key(suggestion["term"]))
+                if reason:
+                    self.response_cache.set(REASON_NAMESPACE, key, reason)
+            print(f"💡 Wrote {len(reasons)}/{len(pending)} suggestion reasons")
+        except Exception as e:
+            print(f"⚠️ Writing suggestion reasons failed: {str(e)[:100]}")
+        finally:
+            self._reasons_in_progress.difference_update(key for key, _ in pending)
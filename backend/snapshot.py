@@ -0,0 +1,37 @@
+"""
+Export or import video cache snapshots, e.g. to pre-bake a warm cache into a new node.
+
+Usage:
+    python snapshot.py export warm_cache.ndjson.zst
+    python snapshot.py import warm_cache.ndjson.zst
+    python snapshot.py export warm_cache.db        # SQLite backup file
+"""
+
+import argparse
+import sys
+import time
+
+from database import VideoDatabase
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Video cache snapshot tool")
+    parser.add_argument('action', choices=['export', 'import'])
+    parser.add_argument('path', help="Snapshot file (.ndjson[.gz|.zst] or .db)")
+    parser.add_argument('--db', default="videos_cache.db")
+    args = parser.parse_args(argv)
+
+    db = VideoDatabase(args.db)
+    start_time = time.time()
+
+    if args.action == 'export':
+        count = db.export_snapshot(args.path)
+        print(f"📦 Exported {count} videos to {args.path} in {time.time() - start_time:.1f}s")
+    else:
+        count = db.import_snapshot(args.path)
+        print(f"📥 Imported {count} videos from {args.path} in {time.time() - start_time:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import re
+import requests
+from typing import List, Mapping, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from content_store import ContentStore
+from database import VideoDatabase
+
+# Size variants served by /api/thumbnail, smallest first.
+# Each maps to the i.ytimg.com file name and its nominal width in pixels.
+THUMBNAIL_SIZES = {
+    "small": ("mqdefault", 320),
+    "medium": ("hqdefault", 480),
+    "large": ("sddefault", 640),
+    "max": ("maxresdefault", 1280),
+}
+DEFAULT_THUMBNAIL_SIZE = "medium"
+
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+
+class ThumbnailCache:
+    """
+    Disk-backed proxy for YouTube thumbnails.
+    Images live in a ContentStore; the (video_id, size) -> hash index lives in VideoDatabase.
+    """
+
+    def __init__(self, db: VideoDatabase, store: ContentStore, prefetch_workers: int = 8):
+        self.db = db
+        self.store = store
+        self.prefetch_workers = prefetch_workers
+
+    @staticmethod
+    def is_valid_video_id(video_id: str) -> bool:
+        return bool(VIDEO_ID_PATTERN.match(video_id or ''))
+
+    @staticmethod
+    def choose_size(requested: Optional[str], headers: Mapping[str, str]) -> str:
+        """
+        Pick a size variant from an explicit ?size= or from client hints.
+        Width hints (Sec-CH-Width / Width / Viewport-Width) are in physical pixels,
+        so the smallest variant at least that wide wins.
+        """
+        if requested in THUMBNAIL_SIZES:
+            return requested
+
+        for header in ('sec-ch-width', 'width', 'sec-ch-viewport-width', 'viewport-width'):
+            value = headers.get(header)
+            if not value:
+                continue
+            try:
+                width = float(value)
+            except ValueError:
+                continue
+            for size, (_, size_width) in THUMBNAIL_SIZES.items():
+                if size_width >= width:
+                    return size
+            return "max"
+
+        return DEFAULT_THUMBNAIL_SIZE
+
+    def _candidates(self, video_id: str, size: str) -> List[Tuple[Optional[str], str]]:
+        """
+        (size, url) pairs to try: the requested variant first, then smaller ones (maxres is
+        missing on many Shorts), then the API's thumbnail URL (size None).
+        """
+        names = list(THUMBNAIL_SIZES.keys())
+        candidates = []
+        for fallback in reversed(names[:names.index(size) + 1]):
+            file_name = THUMBNAIL_SIZES[fallback][0]
+            candidates.append((fallback, f"https://i.ytimg.com/vi/{video_id}/{file_name}.jpg"))
+
+        api_url = self.db.get_video_thumbnail_url(video_id)
+        if api_url and api_url not in [url for _, url in candidates]:
+            candidates.append((None, api_url))
+        return candidates
+
+    def _cached(self, video_id: str, size: str) -> Optional[Tuple[str, str]]:
+        content_hash = self.db.get_thumbnail_hash(video_id, size)
+        if content_hash and self.store.exists(content_hash):
+            return content_hash, self.store.path_for(content_hash)
+        return None
+
+    def get(self, video_id: str, size: str = DEFAULT_THUMBNAIL_SIZE) -> Optional[Tuple[str, str]]:
+        """
+        Return (content_hash, file_path) for a thumbnail variant, downloading it on a miss.
+        A smaller variant may be served when the requested one doesn't exist; it is indexed
+        under its own size, so the requested size is tried again next time.
+        Returns None if no variant could be fetched.
+        """
+        cached = self._cached(video_id, size)
+        if cached:
+            return cached
+
+        for candidate_size, url in self._candidates(video_id, size):
+            if candidate_size and candidate_size != size:
+                cached = self._cached(video_id, candidate_size)
+                if cached:
+                    return cached
+            try:
+                response = requests.get(url, timeout=8)
+            except requests.exceptions.RequestException as e:
+                print(f"   ⚠️ Thumbnail download failed for {video_id} ({url}): {str(e)[:100]}")
+                continue
+            if response.status_code != 200 or not response.content:
+                continue
+
+            content_hash = self.store.put(response.content)
+            if candidate_size:
+                self.db.save_thumbnail_hash(video_id, candidate_size, content_hash, url)
+            return content_hash, self.store.path_for(content_hash)
+
+        return None
+
+    def prefetch(self, video_ids: List[str], sizes: Optional[List[str]] = None):
+        """Warm the cache for freshly fetched videos (runs as a background task)."""
+        sizes = sizes or [DEFAULT_THUMBNAIL_SIZE]
+        jobs = [(vid, size) for vid in video_ids if self.is_valid_video_id(vid) for size in sizes]
+        if not jobs:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.prefetch_workers, len(jobs))) as executor:
+            results = list(executor.map(lambda job: self.get(*job), jobs))
+
+        cached = sum(1 for r in results if r)
+        print(f"🖼️ Prefetched {cached}/{len(jobs)} thumbnails")
@@ -0,0 +1,157 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from youtube_transcript_api import (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    RequestBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+    YouTubeTranscriptApi,
+)
+
+from database import VideoDatabase
+
+TRANSCRIPT_LANGUAGES = ['en', 'en-US', 'en-GB']
+
+# The video definitely has no usable transcript; anything else (blocked IP, YouTube
+# hiccups, network errors) is transient and must not be cached as "no transcript"
+NO_TRANSCRIPT_ERRORS = (
+    TranscriptsDisabled, NoTranscriptFound, VideoUnavailable, VideoUnplayable, AgeRestricted, InvalidVideoId,
+)
+
+_local = threading.local()
+
+
+def _transcript_api() -> YouTubeTranscriptApi:
+    """One API client (and HTTP session) per thread."""
+    if not hasattr(_local, "api"):
+        _local.api = YouTubeTranscriptApi()
+    return _local.api
+
+
+def fetch_transcript_data(video_id: str) -> Optional[Dict]:
+    """
+    Fetch an English transcript (manual preferred, else auto-generated) for a video.
+    Blocking - call from a worker thread. Returns {"segments", "is_generated"}, or None if
+    the video has no English transcript. Transient failures raise.
+    """
+    print(f"Fetching transcript for video: {video_id}")
+    try:
+        # One listing request; find_transcript prefers manually created over generated
+        transcript = _transcript_api().list(video_id).find_transcript(TRANSCRIPT_LANGUAGES)
+        fetched = transcript.fetch()
+    except NO_TRANSCRIPT_ERRORS as e:
+        print(f"No transcript for {video_id}: {type(e).__name__}")
+        return None
+
+    print(f"✓ Transcript fetched: {len(fetched)} segments "
+          f"({transcript.language_code}, is_generated: {fetched.is_generated})")
+    return {"segments": fetched.to_raw_data(), "is_generated": fetched.is_generated}
+
+
+class TranscriptCache:
+    """
+    Transcripts persisted in VideoDatabase.
+    Found transcripts are kept indefinitely; "no transcript" is cached as a negative entry
+    for `negative_ttl_hours`, since captions are sometimes added after upload.
+    Background probing stops as soon as YouTube blocks a request (RequestBlocked/IpBlocked)
+    and pauses for `blocked_backoff_minutes`, so scraping doesn't get user requests blocked too.
+    """
+
+    def __init__(self, db: VideoDatabase, negative_ttl_hours: float = 24, probe_workers: int = 4,
+                 blocked_backoff_minutes: float = 60):
+        self.db = db
+        self.negative_ttl_seconds = negative_ttl_hours * 3600
+        self.probe_workers = probe_workers
+        self.blocked_backoff_seconds = blocked_backoff_minutes * 60
+        self._probe_paused_until = 0.0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    def _fetch_and_store(self, video_id: str) -> Optional[List[Dict]]:
+        result = fetch_transcript_data(video_id)
+        if result is None:
+            self.db.save_transcript(video_id, None, expires_at=time.time() + self.negative_ttl_seconds)
+            return None
+        self.db.save_transcript(video_id, result["segments"], is_generated=result["is_generated"])
+        return result["segments"]
+
+    def get(self, video_id: str) -> Optional[List[Dict]]:
+        """
+        Raw transcript segments, or None if the video has none. Blocking; fetches from
+        YouTube only on a miss or an expired negative entry. Transient fetch errors raise.
+        """
+        entry = self.db.get_transcript_entry(video_id)
+        if entry is not None:
+            with self._lock:
+                if entry["segments"] is None:
+                    self._negative_hits += 1
+                else:
+                    self._hits += 1
+            return entry["segments"]
+
+        with self._lock:
+            self._misses += 1
+        return self._fetch_and_store(video_id)
+
+    def availability(self, video_ids: List[str]) -> Dict[str, bool]:
+        """Known transcript availability per video; videos not probed yet are left out."""
+        return self.db.get_transcript_availability(video_ids)
+
+    def probe(self, video_ids: List[str]):
+        """
+        Fetch and cache transcripts for videos without a fresh entry (runs as a background
+        task after caching fresh videos, and from the ingest CLI). Transient errors are
+        skipped; a blocked request ends the pass and pauses probing.
+        """
+        if time.time() < self._probe_paused_until:
+            return
+        known = self.availability(video_ids)
+        pending = [v for v in dict.fromkeys(video_ids) if v and v not in known]
+        if not pending:
+            return
+
+        blocked = threading.Event()
+
+        def probe_one(video_id: str) -> Optional[bool]:
+            if blocked.is_set():
+                return None
+            try:
+                return self._fetch_and_store(video_id) is not None
+            except RequestBlocked:
+                if not blocked.is_set():
+                    blocked.set()
+                    self._probe_paused_until = time.time() + self.blocked_backoff_seconds
+                    print(f"   🛑 YouTube blocked transcript requests; probing paused for "
+                          f"{self.blocked_backoff_seconds / 60:.0f} min")
+                return None
+            except Exception as e:
+                print(f"   ⚠️ Transcript probe failed for {video_id}: {str(e).strip()[:100]}")
+                return None
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=min(self.probe_workers, len(pending))) as executor:
+            results = list(executor.map(probe_one, pending))
+
+        if blocked.is_set():
+            return
+        found = sum(1 for r in results if r)
+        missing = sum(1 for r in results if r is False)
+        print(f"📝 Probed {len(pending)} transcripts in {time.time() - start_time:.1f}s: "
+              f"{found} available, {missing} without captions")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "probing_paused": time.time() < self._probe_paused_until
+            }
@@ -0,0 +1,117 @@
+import asyncio
+from typing import AsyncIterator, Dict, List
+
+from audio_cache import TTSAudioCache, DEFAULT_VOICE
+from llm_usage import estimate_tokens
+
+# Source tokens per translation chunk; the first chunk gets half so its audio is ready sooner
+DEFAULT_CHUNK_TOKENS = 250
+
+
+def chunk_segments(segments: List[Dict], max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[List[int]]:
+    """
+    Group consecutive transcript segments into chunks of at most max_tokens (estimated),
+    never splitting a segment. Returns the segment indices of each chunk.
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    budget = max(1, max_tokens // 2)
+    for index, segment in enumerate(segments):
+        tokens = estimate_tokens(segment.get("text", ""))
+        if current and current_tokens + tokens > budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+            budget = max_tokens
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TranscriptTranslator:
+    """
+    Translates a transcript chunk by chunk, all chunks concurrently, keeping every segment's
+    timing. Each chunk gets its own TTS audio as soon as its translation is back, so the
+    first chunk can play after one short LLM call.
+    """
+
+    def __init__(self, evaluator, audio_cache: TTSAudioCache, chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                 voice: str = DEFAULT_VOICE, audio_format: str = "mp3"):
+        self.evaluator = evaluator
+        self.audio_cache = audio_cache
+        self.chunk_tokens = chunk_tokens
+        self.voice = voice
+        self.audio_format = audio_format
+
+    async def _translate_chunk(self, index: int, segments: List[Dict], target_language: str,
+                               task: str = "translate", tts_task: str = "tts") -> Dict:
+        """Translate one chunk, then synthesize its audio (audio_url is None if TTS fails)."""
+        texts = [segment["text"] for segment in segments]
+        translations = await self.evaluator.translate_segments(texts, target_language, task=task)
+        translated_segments = [
+            {
+                "text": translation,
+                "original": segment["text"],
+                "start": segment["start"],
+                "duration": segment["duration"]
+            }
+            for segment, translation in zip(segments, translations)
+        ]
+        text = " ".join(s["text"] for s in translated_segments)
+
+        audio_url = None
+        try:
+            key = await self.audio_cache.get_or_create(
+                text, voice=self.voice, audio_format=self.audio_format, task=tts_task
+            )
+            audio_url = self.audio_cache.url_for(key)
+        except Exception as e:
+            print(f"⚠️ TTS failed for chunk {index}: {e}")
+
+        last = segments[-1]
+        return {
+            "index": index,
+            "start": segments[0]["start"],
+            "end": last["start"] + last["duration"],
+            "text": text,
+            "segments": translated_segments,
+            "audio_url": audio_url
+        }
+
+    async def stream(self, segments: List[Dict], target_language: str,
+                     task: str = "translate", tts_task: str = "tts") -> AsyncIterator[Dict]:
+        """
+        Yield translated chunks in transcript order; all chunks are worked on concurrently.
+        LLM calls run as gateway task `task` and speech synthesis as `tts_task`.
+        """
+        chunks = chunk_segments(segments, self.chunk_tokens)
+        print(f"Translating {len(segments)} segments to {target_language} in {len(chunks)} chunks...")
+        jobs = [
+            asyncio.create_task(self._translate_chunk(i, [segments[j] for j in chunk], target_language, task, tts_task))
+            for i, chunk in enumerate(chunks)
+        ]
+        try:
+            for job in jobs:
+                yield await job
+        finally:
+            for job in jobs:
+                job.cancel()
+
+    async def translate_chunks(self, segments: List[Dict], target_language: str,
+                               task: str = "translate", tts_task: str = "tts") -> List[Dict]:
+        """All translated chunks, in order."""
+        return [chunk async for chunk in self.stream(segments, target_language, task, tts_task)]
+
+    @staticmethod
+    def assemble(chunks: List[Dict]) -> Dict:
+        """Whole translation from its chunks: joined text, per-segment translations and per-chunk audio."""
+        return {
+            "translated_text": " ".join(chunk["text"] for chunk in chunks),
+            "translated_segments": [segment for chunk in chunks for segment in chunk["segments"]],
+            "audio_chunks": [
+                {key: chunk[key] for key in ("index", "start", "end", "text", "audio_url")}
+                for chunk in chunks
+            ]
+        }
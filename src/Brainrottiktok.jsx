@@ -109,7 +109,9 @@ export default function BrainrotTikTok({ shortsData }) {
   const [showSubtitles, setShowSubtitles] = useState(false);
   const [subtitleText, setSubtitleText] = useState('');
   const audioRef = useRef(null);
+  const translationPlaybackRef = useRef(null); // { data, index, waiting, started, playNext }
   const youtubePlayerRef = useRef(null);
+  const pendingDefinitionsRef = useRef({});
   const isDestroyingPlayerRef = useRef(false);
   const [youtubeAPIReady, setYoutubeAPIReady] = useState(false);
 
@@ -211,73 +213,88 @@ export default function BrainrotTikTok({ shortsData }) {
     setComment(prev => prev + (prev ? ' ' : '') + slang + ' ');
   };
 
-  const evaluateCommentWithAI = async (commentText) => {
-    try {
-      const response = await fetch('http://localhost:3001/api/evaluate', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          videoTitle: currentVideo.title || 'Untitled Video',
-          videoDescription: currentVideo.description || '',
-          userComment: commentText,
-          targetLanguage: 'English',
-          videoLikeCount: currentVideo.like_count || 0,
-          availableSlang: currentVideo.unique_slang_terms || [],
-        }),
-      });
-
-      if (!response.ok) {
-        throw new Error('Failed to evaluate comment');
+  // Read a text/event-stream response, calling onEvent(event, data) as each event arrives
+  const readEventStream = async (response, onEvent) => {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = 'message';
+        let data = '';
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        onEvent(event, data ? JSON.parse(data) : null);
       }
-
-      const data = await response.json();
-      return data;
-    } catch (error) {
-      console.error('Error evaluating comment:', error);
-      throw error;
     }
   };
 
-  const generateAIResponse = async (commentText, evaluation) => {
-    try {
-      const response = await fetch('http://localhost:3001/api/respond', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          userComment: commentText,
-          score: evaluation.score,
-          mistakes: evaluation.mistakes || [],
-          correction: evaluation.correction || '',
-          videoTitle: currentVideo.title || 'Untitled Video',
-          targetLanguage: 'English',
-          availableSlang: currentVideo.unique_slang_terms || [],
-        }),
-      });
+  // Evaluates the comment and streams its replies in one request: onEvaluation is called
+  // first, then onReply as soon as each reply is ready
+  const submitCommentWithAI = async (commentText, onEvaluation, onReply = () => {}) => {
+    const response = await fetch('http://localhost:3001/api/comment', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        videoTitle: currentVideo.title || 'Untitled Video',
+        videoDescription: currentVideo.description || '',
+        userComment: commentText,
+        targetLanguage: 'English',
+        videoLikeCount: currentVideo.like_count || 0,
+        availableSlang: currentVideo.unique_slang_terms || [],
+      }),
+    });
 
-      if (!response.ok) {
-        throw new Error('Failed to generate AI response');
-      }
+    if (!response.ok) {
+      throw new Error('Failed to evaluate comment');
+    }
 
-      const data = await response.json();
-      return data.responses;
+    let evaluated = false;
+    let streamError = null;
+    try {
+      await readEventStream(response, (event, data) => {
+        if (event === 'evaluation') {
+          evaluated = true;
+          onEvaluation(data);
+        } else if (event === 'reply') {
+          onReply(data);
+        } else if (event === 'error') {
+          streamError = new Error(data.detail);
+        }
+      });
     } catch (error) {
-      console.error('Error generating AI response:', error);
-      throw error;
+      // Once the evaluation is shown, a broken reply stream only costs replies
+      if (!evaluated) throw error;
+      console.error('Error streaming AI replies:', error);
+    }
+    if (!evaluated) {
+      throw streamError || new Error('Failed to evaluate comment');
     }
   };
 
-  const fetchCommentExplanation = async (commentId, commentText, detectedSlang) => {
+  // Streams the explanation: onDelta receives the translation text written so far
+  const fetchCommentExplanation = async (commentId, commentText, detectedSlang, onDelta = () => {}) => {
     try {
-      const response = await fetch('http://localhost:3001/api/explain-comment', {
+      const response = await fetch('http://localhost:3001/api/explain-comment/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
+          commentId: commentId,
           commentText: commentText,
           videoTitle: currentVideo.title || 'Untitled Video',
           videoDescription: currentVideo.description || '',
@@ -289,8 +306,24 @@ export default function BrainrotTikTok({ shortsData }) {
         throw new Error('Failed to fetch explanation');
       }
 
-      const data = await response.json();
-      return data;
+      let translation = '';
+      let explanation = null;
+      let streamError = null;
+      await readEventStream(response, (event, data) => {
+        if (event === 'delta') {
+          translation += data.text;
+          onDelta(translation);
+        } else if (event === 'explanation') {
+          explanation = data;
+        } else if (event === 'error') {
+          streamError = new Error(data.detail);
+        }
+      });
+
+      if (streamError || !explanation) {
+        throw streamError || new Error('Failed to fetch explanation');
+      }
+      return explanation;
     } catch (error) {
       console.error('Error fetching explanation:', error);
       throw error;
@@ -310,7 +343,15 @@ export default function BrainrotTikTok({ shortsData }) {
 
     setLoadingExplanation(commentId);
     try {
-      const explanation = await fetchCommentExplanation(commentId, commentText, detectedSlang);
+      const explanation = await fetchCommentExplanation(commentId, commentText, detectedSlang, (translation) => {
+        // Show the explanation while it is still being written
+        setExplanations(prev => ({
+          ...prev,
+          [commentId]: { translation, slangBreakdown: [] }
+        }));
+        setActiveExplanation(commentId);
+        setLoadingExplanation(null);
+      });
 
       setExplanations(prev => ({
         ...prev,
@@ -446,7 +487,7 @@ export default function BrainrotTikTok({ shortsData }) {
 
   // Update handleWordHover function
 // Update handleWordHover to be more reliable
-const handleWordHover = async (cleanWord, event) => {
+const handleWordHover = async (cleanWord, event, commentWords = []) => {
   event.stopPropagation();
   
   // Clear any existing timeout
@@ -478,7 +519,15 @@ const handleWordHover = async (cleanWord, event) => {
   setHoveredWord({ word: cleanWord, definition: 'Loading...', example: '' });
 
   try {
-    const definition = await fetchWordDefinition(cleanWord);
+    let definition = null;
+    if (commentWords.length > 1) {
+      // Define every word of the comment in one round trip
+      const definitions = await fetchCommentDefinitions([cleanWord, ...commentWords]);
+      definition = definitions[cleanWord];
+    }
+    if (!definition) {
+      definition = await fetchWordDefinition(cleanWord);
+    }
     setHoveredWord(definition);
   } catch (error) {
     console.error('Error in handleWordHover:', error);
@@ -516,6 +565,52 @@ const handleWordLeave = () => {
   setHoverTimeoutId(timeoutId);
 };
 
+// Fetch definitions for all uncached words of a comment with a single request
+const fetchCommentDefinitions = async (words) => {
+  const pending = pendingDefinitionsRef.current;
+  const missing = [...new Set(words)].filter(w => !definitionCache[w] && !pending[w]);
+
+  if (missing.length > 0) {
+    const request = fetch('http://localhost:3001/api/define-words', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        words: missing,
+        context: currentVideo.title || ''
+      })
+    })
+      .then(response => {
+        if (!response.ok) {
+          throw new Error('Failed to fetch definitions');
+        }
+        return response.json();
+      })
+      .then(data => {
+        setDefinitionCache(prev => ({
+          ...prev,
+          ...data.definitions
+        }));
+        return data.definitions;
+      })
+      .catch(error => {
+        console.error('Error fetching definitions:', error);
+        return {};
+      })
+      .finally(() => {
+        missing.forEach(w => delete pending[w]);
+      });
+    missing.forEach(w => { pending[w] = request; });
+  }
+
+  const results = { ...definitionCache };
+  for (const request of new Set(words.map(w => pending[w]).filter(Boolean))) {
+    Object.assign(results, await request);
+  }
+  return results;
+};
+
 // Update fetchWordDefinition to not change loading state (we handle it in handleWordHover)
 const fetchWordDefinition = async (word) => {
   // Check cache first
@@ -633,40 +728,48 @@ const handleNavigateToVideo = (videoId) => {
 
     setIsEvaluating(true);
 
+    const commentId = Date.now();
+    const submittedText = comment;
     try {
-      const evaluation = await evaluateCommentWithAI(comment);
-      const aiResponses = await generateAIResponse(comment, evaluation);
-
-      const newComment = {
-        id: Date.now(),
-        text: comment,
-        user: 'You',
-        likes: evaluation.likes,
-        evaluation,
-        aiResponses: aiResponses
-      };
-
-      setUserComments(prev => [...prev,newComment]);
-
-      // Find this section in handleSubmitComment:
-      setFeedback({
-        score: evaluation.score,
-        grammarScore: evaluation.grammarScore,
-        contextScore: evaluation.contextScore,
-        naturalnessScore: evaluation.naturalnessScore,
-        correction: evaluation.correction,
-        mistakes: evaluation.mistakes,
-        goodParts: evaluation.goodParts,
-        message: evaluation.score >= 80
-          ? "Excellent work!"
-          : evaluation.score >= 50
-          ? "Not bad, keep practicing!"
-          : "Keep learning!"
-      });
-
-      setShowFeedback(true);
-      setComment('');
-      // REMOVE THIS LINE: setTimeout(() => setShowFeedback(false), 8000);
+      await submitCommentWithAI(
+        submittedText,
+        (evaluation) => {
+          const newComment = {
+            id: commentId,
+            text: submittedText,
+            user: 'You',
+            likes: evaluation.likes,
+            evaluation,
+            aiResponses: []
+          };
+
+          setUserComments(prev => [...prev,newComment]);
+
+          setFeedback({
+            score: evaluation.score,
+            grammarScore: evaluation.grammarScore,
+            contextScore: evaluation.contextScore,
+            naturalnessScore: evaluation.naturalnessScore,
+            correction: evaluation.correction,
+            mistakes: evaluation.mistakes,
+            goodParts: evaluation.goodParts,
+            message: evaluation.score >= 80
+              ? "Excellent work!"
+              : evaluation.score >= 50
+              ? "Not bad, keep practicing!"
+              : "Keep learning!"
+          });
+
+          setShowFeedback(true);
+          setComment('');
+        },
+        (reply) => {
+          // Replies appear one by one as they stream in
+          setUserComments(prev => prev.map(c =>
+            c.id === commentId ? { ...c, aiResponses: [...c.aiResponses, reply] } : c
+          ));
+        }
+      );
     } catch (error) {
       console.error('Error submitting comment:', error);
 
@@ -710,7 +813,7 @@ const handleNavigateToVideo = (videoId) => {
     setTranslationError('');
 
     try {
-      const response = await fetch('http://localhost:3001/api/translate-video', {
+      const response = await fetch('http://localhost:3001/api/translate-video/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -725,26 +828,49 @@ const handleNavigateToVideo = (videoId) => {
         throw new Error('Translation failed');
       }
 
-      const data = await response.json();
-
-      // Convert base64 audio to blob URL
-      const audioBlob = base64ToBlob(data.audio_base64, 'audio/mp3');
-      const audioBlobUrl = URL.createObjectURL(audioBlob);
-
+      // Chunks are appended as they stream in; playback starts with the first one
       const translationData = {
-        audioUrl: audioBlobUrl,
-        translatedText: data.translated_text,
-        originalTranscript: data.original_transcript
+        audioChunks: [],
+        translatedText: '',
+        originalTranscript: [],
+        complete: false
       };
+      let streamError = null;
+
+      await readEventStream(response, (event, data) => {
+        if (event === 'transcript') {
+          translationData.originalTranscript = data.segments;
+        } else if (event === 'chunk') {
+          translationData.audioChunks.push({
+            start: data.start,
+            end: data.end,
+            text: data.text,
+            audioUrl: data.audio_url ? `http://localhost:3001${data.audio_url}` : null
+          });
+          translationData.translatedText = translationData.audioChunks.map(chunk => chunk.text).join(' ');
+          if (translationData.audioChunks.length === 1) {
+            playTranslation(translationData);
+          } else {
+            resumeTranslation(translationData);
+          }
+        } else if (event === 'error') {
+          streamError = new Error(data.detail);
+        }
+      });
 
-      // Cache the translation
-      setTranslationCache(prev => ({
-        ...prev,
-        [videoId]: translationData
-      }));
+      translationData.complete = true;
+      if (streamError && translationData.audioChunks.length === 0) {
+        throw streamError;
+      }
+      resumeTranslation(translationData);
 
-      // Play the translation
-      playTranslation(translationData);
+      // Cache the translation (only if it's complete)
+      if (!streamError) {
+        setTranslationCache(prev => ({
+          ...prev,
+          [videoId]: translationData
+        }));
+      }
 
     } catch (error) {
       console.error('Error translating video:', error);
@@ -757,51 +883,61 @@ const handleNavigateToVideo = (videoId) => {
     }
   };
 
-  const base64ToBlob = (base64, mimeType) => {
-    const byteCharacters = atob(base64);
-    const byteNumbers = new Array(byteCharacters.length);
-    for (let i = 0; i < byteCharacters.length; i++) {
-      byteNumbers[i] = byteCharacters.charCodeAt(i);
-    }
-    const byteArray = new Uint8Array(byteNumbers);
-    return new Blob([byteArray], { type: mimeType });
-  };
-
+  // Plays the translated audio chunk by chunk; chunks may still be arriving from the stream
   const playTranslation = (translationData) => {
     if (!audioRef.current) {
       audioRef.current = new Audio();
     }
 
     const audio = audioRef.current;
-    audio.src = translationData.audioUrl;
-
-    // Set subtitle text
-    setSubtitleText(translationData.translatedText);
+    const playback = { data: translationData, index: 0, waiting: false, started: false };
+    translationPlaybackRef.current = playback;
     setShowSubtitles(true);
 
+    const playChunk = () => {
+      const chunks = playback.data.audioChunks;
+      // Skip chunks whose audio couldn't be generated
+      while (playback.index < chunks.length && !chunks[playback.index].audioUrl) {
+        playback.index += 1;
+      }
+      if (playback.index >= chunks.length) {
+        if (playback.data.complete) {
+          handleStopTranslation();
+        } else {
+          playback.waiting = true; // resumeTranslation continues when the next chunk arrives
+        }
+        return;
+      }
+
+      playback.waiting = false;
+      const chunk = chunks[playback.index];
+      audio.src = chunk.audioUrl;
+      // Subtitles follow the chunk being played
+      setSubtitleText(chunk.text);
+    };
+    playback.playNext = playChunk;
+
     // When audio metadata is loaded, adjust playback speed if needed
     audio.onloadedmetadata = () => {
       const audioDuration = audio.duration;
+      const chunk = playback.data.audioChunks[playback.index];
+      const chunkDuration = chunk.end - chunk.start;
 
-      // Try to get actual video duration from YouTube Player API
-      let videoDuration = 60; // Default fallback
-      if (youtubePlayerRef.current && youtubePlayerRef.current.getDuration) {
-        try {
-          videoDuration = youtubePlayerRef.current.getDuration();
-          console.log(`Video duration: ${videoDuration.toFixed(2)}s`);
-        } catch (e) {
-          console.warn('Could not get video duration, using default:', e);
-        }
-      }
-
-      // If audio is longer than video, speed it up (max 2x)
-      if (audioDuration > videoDuration) {
-        const speedAdjustment = Math.min(audioDuration / videoDuration, 2.0);
+      // If the chunk's audio is longer than the part of the video it covers, speed it up (max 2x)
+      if (chunkDuration > 0 && audioDuration > chunkDuration) {
+        const speedAdjustment = Math.min(audioDuration / chunkDuration, 2.0);
         audio.playbackRate = speedAdjustment;
-        console.log(`Audio speed adjusted to ${speedAdjustment.toFixed(2)}x (audio: ${audioDuration.toFixed(2)}s, video: ${videoDuration.toFixed(2)}s)`);
+        console.log(`Audio speed adjusted to ${speedAdjustment.toFixed(2)}x (audio: ${audioDuration.toFixed(2)}s, video: ${chunkDuration.toFixed(2)}s)`);
       } else {
-        console.log(`Audio duration (${audioDuration.toFixed(2)}s) fits within video (${videoDuration.toFixed(2)}s)`);
+        audio.playbackRate = 1.0;
+      }
+
+      // Later chunks just continue; the video is already muted and playing
+      if (playback.started) {
+        audio.play();
+        return;
       }
+      playback.started = true;
 
       // Mute and restart video using YouTube Player API
       if (youtubePlayerRef.current) {
@@ -811,6 +947,11 @@ const handleNavigateToVideo = (videoId) => {
 
           // Wait for video to start playing before starting audio
           const checkVideoPlaying = setInterval(() => {
+            // Translation was stopped meanwhile
+            if (translationPlaybackRef.current !== playback) {
+              clearInterval(checkVideoPlaying);
+              return;
+            }
             if (youtubePlayerRef.current && youtubePlayerRef.current.getPlayerState) {
               const state = youtubePlayerRef.current.getPlayerState();
               // YT.PlayerState.PLAYING = 1
@@ -825,7 +966,7 @@ const handleNavigateToVideo = (videoId) => {
           // Safety timeout to prevent infinite loop
           setTimeout(() => {
             clearInterval(checkVideoPlaying);
-            if (translationState !== 'playing') {
+            if (translationPlaybackRef.current === playback && audio.paused && !playback.waiting) {
               // If video hasn't started playing, just start audio anyway
               audio.play();
               setTranslationState('playing');
@@ -845,9 +986,10 @@ const handleNavigateToVideo = (videoId) => {
       }
     };
 
-    // When audio ends, reset state
+    // When a chunk ends, move on to the next one (or stop after the last)
     audio.onended = () => {
-      handleStopTranslation();
+      playback.index += 1;
+      playChunk();
     };
 
     audio.onerror = () => {
@@ -862,7 +1004,16 @@ const handleNavigateToVideo = (videoId) => {
     };
   };
 
+  // Continue playback that was waiting for the next streamed chunk
+  const resumeTranslation = (translationData) => {
+    const playback = translationPlaybackRef.current;
+    if (playback && playback.waiting && playback.data === translationData) {
+      playback.playNext();
+    }
+  };
+
   const handleStopTranslation = () => {
+    translationPlaybackRef.current = null;
     if (audioRef.current) {
       audioRef.current.pause();
       audioRef.current.currentTime = 0;
@@ -1082,7 +1233,7 @@ const handleNavigateToVideo = (videoId) => {
                     ) : (
                       <div className="text-center text-white p-8">
                         <img
-                          src={video.thumbnail}
+                          src={`http://localhost:3001/api/thumbnail/${video.video_id}`}
                           alt={video.title}
                           className="max-w-full max-h-full rounded-lg mb-4"
                         />
@@ -1160,7 +1311,8 @@ const handleNavigateToVideo = (videoId) => {
                     <Share2 className="w-7 h-7 text-white" />
                   </div>
 
-                  {/* Translation Button */}
+                  {/* Translation Button (hidden once the backend knows the video has no captions) */}
+                  {currentVideo.has_transcript !== false && (
                   <div className="flex flex-col items-center gap-1 relative">
                     <button
                       onClick={handleTranslate}
@@ -1189,6 +1341,7 @@ const handleNavigateToVideo = (videoId) => {
                       </div>
                     )}
                   </div>
+                  )}
 
                   <div className="p-3 bg-white/20 backdrop-blur-sm rounded-full">
                     <Bookmark className="w-7 h-7 text-white" />
@@ -1419,7 +1572,11 @@ const handleNavigateToVideo = (videoId) => {
                                     <span
                                       key={i}
                                       className={className}
-                                      onMouseEnter={(e) => handleWordHover(token.cleanWord, e)}
+                                      onMouseEnter={(e) => handleWordHover(
+                                        token.cleanWord,
+                                        e,
+                                        tokens.filter(t => t.isWord && !t.isKnown).map(t => t.cleanWord)
+                                      )}
                                       onMouseLeave={handleWordLeave}
                                     >
                                       {token.text}
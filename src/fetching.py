@@ -178,26 +178,52 @@ class YouTubeShortsSlangFetcher:
         return ascii_ratio > 0.8
     
 
+    def _compiled_slang_pattern(self):
+        """
+        One alternation regex over all slang terms, plus the table of shorter terms nested
+        inside each term. Rebuilt only when the set or order of terms changes.
+        Terms are matched lowercased (so keys like "L" and "W" match "l" and "w").
+        Tried at every word boundary via a lookahead, so overlapping terms are all found.
+        """
+        source = tuple(self.slang_terms)
+        if getattr(self, '_slang_pattern_source', None) != source:
+            lowered = list(dict.fromkeys(t.lower() for t in self.slang_terms.keys()))
+            alternation = '|'.join(re.escape(t) for t in sorted(lowered, key=len, reverse=True))
+            self._slang_pattern = re.compile(r'(?=\b(' + alternation + r')\b)')
+            self._slang_order = {term: i for i, term in enumerate(lowered)}
+            # A longer term hides shorter ones starting at the same position ('rolling on the floor' vs 'rolling')
+            self._slang_nested = {}
+            for term in lowered:
+                inner = [t for t in lowered
+                         if t != term and t in term and re.search(r'\b' + re.escape(t) + r'\b', term)]
+                if inner:
+                    self._slang_nested[term] = inner
+            self._slang_pattern_source = source
+        return self._slang_pattern
+
     def detect_slang_in_text(self, text: str) -> List[str]:
         """
         Detect slang terms accurately with context filtering.
+        Returns lowercased terms in slang_terms order.
         """
         text_lower = text.lower()
-        found = []
+        pattern = self._compiled_slang_pattern()
+        matched = set()
+        for m in pattern.finditer(text_lower):
+            matched.add(m.group(1))
+            matched.update(self._slang_nested.get(m.group(1), ()))
 
-        for slang in self.slang_terms.keys():
-            # Exact word match (avoid matching inside words)
-            pattern = r'\b' + re.escape(slang) + r'\b'
-            if re.search(pattern, text_lower):
-                # Context filters for ambiguous slang
-                if slang == 'l' and re.search(r'welcome|jelly', text_lower):
-                    continue
-                if slang == 'w' and re.search(r'what|why|ow|sw', text_lower):
-                    continue
-                if slang == 'fire' and re.search(r'fire alarm|on fire|building fire', text_lower):
-                    continue
+        found = []
+        for slang in sorted(matched, key=self._slang_order.__getitem__):
+            # Context filters for ambiguous slang
+            if slang == 'l' and re.search(r'welcome|jelly', text_lower):
+                continue
+            if slang == 'w' and re.search(r'what|why|ow|sw', text_lower):
+                continue
+            if slang == 'fire' and re.search(r'fire alarm|on fire|building fire', text_lower):
+                continue
 
-                found.append(slang)
+            found.append(slang)
 
         return found
     